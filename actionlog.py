@@ -0,0 +1,177 @@
+import struct
+import sys
+from array import array
+
+from elevatoraction import Action, ElevatorAction
+
+# looking up actions by their value when turning stored codes back into ElevatorAction objects
+ACTIONS_BY_CODE = {action.value: action for action in Action}
+
+# each chunk in an action file is a row count followed by the time, elevator, action and floor columns
+CHUNK_HEADER = struct.Struct("<I")
+COLUMN_TYPES = ("q", "i", "b", "i")
+
+
+# Stores actions in memory as parallel arrays of time, elevator number, action code and floor
+# Uses a small fraction of the memory of a list of ElevatorAction objects, which are only created when accessed
+class ActionLog:
+    def __init__(self):
+        self.times = array("q")
+        self.elevator_numbers = array("i")
+        self.action_codes = array("b")
+        self.floors = array("i")
+
+    def record(self, time, elevator_number, action, floor):
+        self.times.append(time)
+        self.elevator_numbers.append(elevator_number)
+        self.action_codes.append(action.value)
+        self.floors.append(floor)
+
+    def append(self, elevator_action):
+        self.record(elevator_action.time, elevator_action.elevator_number, elevator_action.action, elevator_action.floor)
+
+    # records many actions at once from columns of times, elevator numbers, action codes and floors
+    def extend(self, times, elevator_numbers, action_codes, floors):
+        self.times.extend(times)
+        self.elevator_numbers.extend(elevator_numbers)
+        self.action_codes.extend(action_codes)
+        self.floors.extend(floors)
+
+    def clear(self):
+        self.__init__()
+
+    def __len__(self):
+        return len(self.times)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return ElevatorAction(self.times[index], self.elevator_numbers[index],
+                              ACTIONS_BY_CODE[self.action_codes[index]], self.floors[index])
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __eq__(self, other):
+        if isinstance(other, ActionLog):
+            return self.times == other.times and \
+                   self.elevator_numbers == other.elevator_numbers and \
+                   self.action_codes == other.action_codes and \
+                   self.floors == other.floors
+        if isinstance(other, list):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return False
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+
+# Writes actions to a binary file in chunks as they happen instead of keeping them in memory
+# The file can be read back with read_action_file
+class StreamingActionLog:
+    def __init__(self, path, chunk_size=65536):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.file = open(path, "wb")
+        self.buffer = ActionLog()
+        self.count = 0
+
+    def record(self, time, elevator_number, action, floor):
+        self.buffer.record(time, elevator_number, action, floor)
+        self.count += 1
+        if len(self.buffer) >= self.chunk_size:
+            self.flush()
+
+    def append(self, elevator_action):
+        self.record(elevator_action.time, elevator_action.elevator_number, elevator_action.action, elevator_action.floor)
+
+    def extend(self, times, elevator_numbers, action_codes, floors):
+        before = len(self.buffer)
+        self.buffer.extend(times, elevator_numbers, action_codes, floors)
+        self.count += len(self.buffer) - before
+        if len(self.buffer) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if len(self.buffer) > 0:
+            self.file.write(CHUNK_HEADER.pack(len(self.buffer)))
+            for column in (self.buffer.times, self.buffer.elevator_numbers, self.buffer.action_codes, self.buffer.floors):
+                if sys.byteorder == "big":
+                    column.byteswap()
+                self.file.write(column.tobytes())
+            self.buffer.clear()
+        self.file.flush()
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+    def clear(self):
+        self.buffer.clear()
+        self.file.seek(0)
+        self.file.truncate()
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    # actions are not kept in memory
+    def __iter__(self):
+        return iter(())
+
+    # copies of a simulation would all be writing to the same file
+    def __getstate__(self):
+        raise ValueError("Cannot copy an action log streaming to " + str(self.path))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+# Counts actions without storing them, for when only the statistics of a simulation are needed
+class DiscardingActionLog:
+    def __init__(self):
+        self.count = 0
+
+    def record(self, time, elevator_number, action, floor):
+        self.count += 1
+
+    def append(self, elevator_action):
+        self.count += 1
+
+    def extend(self, times, elevator_numbers, action_codes, floors):
+        self.count += len(times)
+
+    def clear(self):
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    # actions are not kept in memory
+    def __iter__(self):
+        return iter(())
+
+
+# reads a file written by a StreamingActionLog back into memory
+def read_action_file(path):
+    log = ActionLog()
+    columns = (log.times, log.elevator_numbers, log.action_codes, log.floors)
+    with open(path, "rb") as file:
+        while True:
+            header = file.read(CHUNK_HEADER.size)
+            if not header:
+                break
+            (rows,) = CHUNK_HEADER.unpack(header)
+            for column, type_code in zip(columns, COLUMN_TYPES):
+                chunk = array(type_code)
+                chunk.frombytes(file.read(rows * chunk.itemsize))
+                if sys.byteorder == "big":
+                    chunk.byteswap()
+                column.extend(chunk)
+    return log
@@ -0,0 +1,82 @@
+from elevatoraction import Action, ActionTimings
+from sweeproute import COMPACT_AFTER
+
+
+# number of time steps an elevator spends stopped with its doors open at a floor
+def stop_time(floor):
+    if floor == 0:
+        return ActionTimings[Action.OPEN_DOORS_LOBBY]
+    return ActionTimings[Action.OPEN_DOORS]
+
+
+# number of time steps an elevator takes to move between two floors
+def travel_time(from_floor, to_floor):
+    if to_floor > from_floor:
+        return (to_floor - from_floor) * ActionTimings[Action.MOVE_UP]
+    return (from_floor - to_floor) * ActionTimings[Action.MOVE_DOWN]
+
+
+# Estimates of when an elevator will open its doors at each of its destinations, for EarliestArrival
+#
+# Times are kept relative to the elevator opening its doors at the first destination it had when the table was built,
+# so they stay correct as the elevator moves along its route and only need updating when floors are added to it.
+# Floors the elevator has visited since the table last looked are dropped from the start.
+class ArrivalTimes:
+    def __init__(self, destinations):
+        self.destinations = destinations
+        self.rebuild()
+
+    # recreates the table from the destination queue
+    def rebuild(self):
+        self.floors = []
+        self.times = []
+        self.start = 0
+        for floor in self.destinations:
+            self.add(floor)
+
+    def __len__(self):
+        return len(self.floors) - self.start
+
+    def add(self, floor):
+        if len(self) == 0:
+            self.times.append(0)
+        else:
+            self.times.append(self.times[-1] + stop_time(self.floors[-1]) + travel_time(self.floors[-1], floor))
+        self.floors.append(floor)
+
+    # adds a floor to the end of the elevator's destinations
+    def append(self, floor):
+        self.destinations.append(floor)
+        self.add(floor)
+
+    # drops destinations the elevator has visited from the start of the table, or rebuilds the table if the
+    # destination queue has been changed in some other way
+    def sync(self):
+        visited = len(self) - len(self.destinations)
+        if visited < 0:
+            self.rebuild()
+            return
+        self.start += visited
+        if self.start > COMPACT_AFTER and self.start * 2 > len(self.floors):
+            del self.floors[:self.start]
+            del self.times[:self.start]
+            self.start = 0
+        if len(self) > 0 and (self.floors[self.start] != self.destinations[0] or
+                              self.floors[-1] != self.destinations[-1]):
+            self.rebuild()
+
+    # number of time steps until the elevator opens its doors at the destination at the given index
+    def time_until(self, elevator, index):
+        first = elevator.blocked_for + travel_time(elevator.current_floor, self.floors[self.start])
+        return first + self.times[self.start + index] - self.times[self.start]
+
+    # number of time steps until the elevator would open its doors at a floor added to the end of its destinations
+    def time_until_added(self, elevator, floor):
+        if len(self) == 0:
+            return elevator.blocked_for + travel_time(elevator.current_floor, floor)
+        last_floor = self.floors[-1]
+        arrival = self.time_until(elevator, len(self) - 1)
+        if last_floor == floor:
+            # already stopping there last
+            return arrival
+        return arrival + stop_time(last_floor) + travel_time(last_floor, floor)
@@ -0,0 +1,67 @@
+INFINITY = float("inf")
+
+
+# Solves the assignment problem for a cost matrix with no more rows than columns, using the Hungarian method with
+# potentials (shortest augmenting paths), in O(rows^2 * columns) time
+# Returns the column assigned to each row, such that no two rows share a column and the total cost is as small as
+# possible. Ties are broken towards lower column numbers, so the same costs always give the same assignment.
+def min_cost_assignment(costs):
+    rows = len(costs)
+    if rows == 0:
+        return []
+    columns = len(costs[0])
+    if rows > columns:
+        raise ValueError("Cannot assign " + str(rows) + " rows to only " + str(columns) + " columns")
+
+    # row_potentials and row_of_column are indexed from 1, with row 0 and column 0 used as the start of each path
+    row_potentials = [0] * (rows + 1)
+    column_potentials = [0] * (columns + 1)
+    row_of_column = [0] * (columns + 1)
+    previous_column = [0] * (columns + 1)
+    for row in range(1, rows + 1):
+        row_of_column[0] = row
+        column = 0
+        min_slack = [INFINITY] * (columns + 1)
+        # columns in the tree, and the columns still outside it in increasing order
+        used = [0]
+        unused = list(range(1, columns + 1))
+        # growing a tree of tight edges from the new row until it reaches a free column
+        while True:
+            current_row = row_of_column[column]
+            row_costs = costs[current_row - 1]
+            potential = row_potentials[current_row]
+            delta = INFINITY
+            next_column = 0
+            for other in unused:
+                slack = row_costs[other - 1] - potential - column_potentials[other]
+                if slack < min_slack[other]:
+                    min_slack[other] = slack
+                    previous_column[other] = column
+                    if slack < delta:
+                        delta = slack
+                        next_column = other
+                elif min_slack[other] < delta:
+                    delta = min_slack[other]
+                    next_column = other
+            if delta:
+                for other in used:
+                    row_potentials[row_of_column[other]] += delta
+                    column_potentials[other] -= delta
+                for other in unused:
+                    min_slack[other] -= delta
+            column = next_column
+            unused.remove(column)
+            used.append(column)
+            if row_of_column[column] == 0:
+                break
+        # flipping the edges along the path back to the start
+        while column:
+            previous = previous_column[column]
+            row_of_column[column] = row_of_column[previous]
+            column = previous
+
+    assignment = [0] * rows
+    for column in range(1, columns + 1):
+        if row_of_column[column]:
+            assignment[row_of_column[column] - 1] = column - 1
+    return assignment
@@ -0,0 +1,86 @@
+import numpy as np
+
+from actionlog import ActionLog
+from elevatoraction import Action
+from elevatorsimulation import ElevatorSimulation
+from elevatorsystem import ElevatorSystem
+from fleetarrays import FleetArrays, NO_ACTION
+
+NO_MORE_CALLS = np.iinfo(np.int64).max
+
+
+# Runs many independent replications of the same elevator system configuration in lockstep
+# The elevators of every replication are stored together in a FleetArrays of shape (replications, elevators) and
+# moved forward a time step at once. Each replication keeps its own behaviour, people and statistics in an
+# ElevatorSimulation, and gives the same actions and statistics as simulating its calls on its own.
+class BatchedSimulation:
+    # 'behaviour' is a class or function that returns a new behaviour for each replication
+    # 'actions' is a function that returns a new action log for each replication, by default actions are kept in memory
+    def __init__(self, replications, elevators, behaviour, total_floors, capacity=10, current_floor=0, actions=ActionLog):
+        self.fleet = FleetArrays((replications, elevators), capacity, current_floor)
+        self.simulations = [
+            ElevatorSimulation(ElevatorSystem(list(self.fleet.elevators[replication]), behaviour(), total_floors),
+                               actions=actions())
+            for replication in range(replications)]
+        self.time = 0
+
+    # simulates one list of calls per replication, each in time order, until every replication has finished
+    # returns the statistics of each replication
+    def simulate_calls(self, calls_per_replication):
+        if len(calls_per_replication) != len(self.simulations):
+            raise ValueError("Expected calls for " + str(len(self.simulations)) + " replications, got " +
+                             str(len(calls_per_replication)))
+        replications = len(self.simulations)
+        calls = [iter(replication_calls) for replication_calls in calls_per_replication]
+        next_calls = [next(replication_calls, None) for replication_calls in calls]
+        next_call_times = np.array([NO_MORE_CALLS if call is None else call.time for call in next_calls], dtype=np.int64)
+        finished = np.zeros(replications, dtype=bool)
+        # elevators that had people added at their floor, or left inside at their floor, since they last opened
+        people_to_exchange = np.zeros(self.fleet.shape, dtype=bool)
+
+        while not finished.all():
+            for replication in np.nonzero(next_call_times <= self.time)[0]:
+                simulation = self.simulations[replication]
+                simulation.time = self.time
+                # calls made at the same time are sent to the elevator system together, as in simulate_calls
+                calls_at_time = []
+                while next_calls[replication] is not None and next_calls[replication].time <= self.time:
+                    call = next_calls[replication]
+                    if call.time < self.time:
+                        raise ValueError("Cannot process call at time " + str(call.time) + " - it is further in the past than the current simulation time " + str(self.time))
+                    if simulation.keep_calls:
+                        simulation.calls.append(call)
+                    calls_at_time.append(call)
+                    next_calls[replication] = next(calls[replication], None)
+                for elevator in simulation.add_calls(calls_at_time):
+                    people_to_exchange[replication, elevator] = True
+                next_call_times[replication] = NO_MORE_CALLS if next_calls[replication] is None else next_calls[replication].time
+
+            actions = self.fleet.step()
+
+            for replication, elevator in zip(*np.nonzero(actions > Action.BLOCKED.value)):
+                self.simulations[replication].actions.record(
+                    self.time, int(elevator), Action(actions[replication, elevator]),
+                    int(self.fleet.current_floor[replication, elevator]))
+
+            opened = actions >= Action.OPEN_DOORS.value
+            exchanging = self.fleet.door_open & (opened | people_to_exchange)
+            people_to_exchange[:] = False
+            for replication, elevator in zip(*np.nonzero(exchanging)):
+                simulation = self.simulations[replication]
+                simulation.time = self.time
+                elevator_to_use = self.fleet.elevators[replication, elevator]
+                simulation.exchange_people(elevator, elevator_to_use)
+                # anyone who got on at the floor they are going to gets off on the next time step
+                if elevator_to_use.current_floor in simulation.people_in_elevators[elevator]:
+                    people_to_exchange[replication, elevator] = True
+
+            # a replication is finished once all of its calls are processed and none of its elevators did anything
+            idle = (actions == NO_ACTION).all(axis=1)
+            for replication in np.nonzero(idle & ~finished & (next_call_times == NO_MORE_CALLS))[0]:
+                finished[replication] = True
+                self.simulations[replication].time = self.time + 1
+
+            self.time += 1
+
+        return [simulation.statistics() for simulation in self.simulations]
@@ -0,0 +1,72 @@
+import random
+import time
+
+from elevator import Elevator
+from elevatorbehaviour import BatchAssignment, EarliestArrival
+from elevatorcall import ElevatorCall
+from elevatorsimulation import ElevatorSimulation
+from elevatorsystem import ElevatorSystem
+
+# Compares the time per call of BatchAssignment planning each burst of lobby calls together against EarliestArrival,
+# which takes the same calls one at a time, both on their own and inside a simulation
+# Run from the project root with `python -m benchmarks.batchdispatch`
+
+FLOORS = 50
+ELEVATORS = 6
+BURST_SIZE = 12
+BURSTS = 2000
+# seconds between bursts in the simulation
+BURST_GAP = 60
+
+
+def lobby_bursts(bursts=BURSTS, burst_size=BURST_SIZE, floors=FLOORS, seed=1):
+    rng = random.Random(seed)
+    return [[(0, rng.randrange(1, floors)) for _ in range(burst_size)] for _ in range(bursts)]
+
+
+def build_system(behaviour, elevators=ELEVATORS, floors=FLOORS):
+    return ElevatorSystem([Elevator(capacity=10, current_floor=0) for _ in range(elevators)], behaviour(), floors)
+
+
+# seconds per call for each burst given to a fresh system, so every burst starts from empty elevators
+def time_per_call(behaviour, bursts, elevators=ELEVATORS, floors=FLOORS):
+    total = 0
+    for calls in bursts:
+        system = build_system(behaviour, elevators, floors)
+        start = time.perf_counter()
+        system.ingest_calls(calls)
+        total += time.perf_counter() - start
+    return total / sum(len(calls) for calls in bursts)
+
+
+# seconds per call spent dispatching a simulation of the bursts, one every BURST_GAP seconds, so the elevators still
+# have routes left over from earlier bursts
+def time_per_call_simulated(behaviour, bursts, elevators=ELEVATORS, floors=FLOORS):
+    system = build_system(behaviour, elevators, floors)
+    ingest_calls = system.ingest_calls
+    spent = [0]
+
+    def timed_ingest_calls(calls):
+        start = time.perf_counter()
+        assigned = ingest_calls(calls)
+        spent[0] += time.perf_counter() - start
+        return assigned
+
+    system.ingest_calls = timed_ingest_calls
+    calls = [ElevatorCall(index * BURST_GAP, call_floor, destination_floor, 1)
+             for index, burst in enumerate(bursts) for call_floor, destination_floor in burst]
+    ElevatorSimulation(system, event_driven=True).simulate_calls(calls, verbose=False)
+    return spent[0] / len(calls)
+
+
+def run(bursts=BURSTS):
+    calls = lobby_bursts(bursts)
+    print("calls".rjust(14) + "one at a time".rjust(16) + "together".rjust(12))
+    for name, timer in [("on their own", time_per_call), ("simulated", time_per_call_simulated)]:
+        print(name.rjust(14) +
+              (format(timer(EarliestArrival, calls) * 1e6, ".1f") + " us").rjust(16) +
+              (format(timer(BatchAssignment, calls) * 1e6, ".1f") + " us").rjust(12))
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,54 @@
+import timeit
+
+from destinationqueue import DestinationQueue
+
+# Compares a plain list against a DestinationQueue for the operations elevators and behaviours make on the front of
+# their destination lists, as the number of queued stops grows
+# Run from the project root with `python -m benchmarks.destinationqueue`
+
+SIZES = [10, 100, 1000, 5000, 20000]
+OPERATIONS = 1000
+
+
+def pop_front_list(destinations):
+    for _ in range(OPERATIONS):
+        destinations.pop(0)
+
+
+def pop_front_queue(destinations):
+    for _ in range(OPERATIONS):
+        destinations.popleft()
+
+
+def push_front_list(destinations):
+    for i in range(OPERATIONS):
+        destinations.insert(0, i)
+
+
+def push_front_queue(destinations):
+    for i in range(OPERATIONS):
+        destinations.appendleft(i)
+
+
+# times an operation on a container of 'size' stops, which is built in timeit's setup so only the operation is timed
+# pops start from OPERATIONS extra stops so the container still has 'size' stops at the end
+def time_per_operation(operation, container, size, repeat=5):
+    stops = size + OPERATIONS if operation in (pop_front_list, pop_front_queue) else size
+    times = timeit.repeat("operation(destinations)", setup="destinations = container(range(stops))", number=1,
+                          repeat=repeat, globals={"operation": operation, "container": container, "stops": stops})
+    return min(times) / OPERATIONS
+
+
+def run():
+    print("stops".rjust(8) + "list pop(0)".rjust(16) + "queue popleft".rjust(16) +
+          "list insert(0)".rjust(16) + "queue appendleft".rjust(18))
+    for size in SIZES:
+        print(str(size).rjust(8) +
+              (format(time_per_operation(pop_front_list, list, size) * 1e9, ".0f") + " ns").rjust(16) +
+              (format(time_per_operation(pop_front_queue, DestinationQueue, size) * 1e9, ".0f") + " ns").rjust(16) +
+              (format(time_per_operation(push_front_list, list, size) * 1e9, ".0f") + " ns").rjust(16) +
+              (format(time_per_operation(push_front_queue, DestinationQueue, size) * 1e9, ".0f") + " ns").rjust(18))
+
+
+if __name__ == "__main__":
+    run()
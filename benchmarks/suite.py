@@ -0,0 +1,189 @@
+import argparse
+import heapq
+import json
+import platform
+import random
+import time
+import tracemalloc
+from itertools import groupby
+from operator import attrgetter
+
+import elevatorbehaviour
+from actionlog import ActionLog
+from elevator import Elevator
+from elevatorcall import generate_calls
+from elevatorsimulation import ElevatorSimulation
+from elevatorsystem import ElevatorSystem
+
+# Reproducible benchmarks of simulation throughput and dispatcher latency for every behaviour
+# Run from the project root with `python -m benchmarks.suite`, see --help for saving and comparing results
+
+BEHAVIOURS = [
+    elevatorbehaviour.RoundRobinAppend,
+    elevatorbehaviour.ClosestCallPrepend,
+    elevatorbehaviour.LeastBusyAppend,
+    elevatorbehaviour.StandardElevator,
+    elevatorbehaviour.EarliestArrival,
+    elevatorbehaviour.BatchAssignment
+]
+
+# name -> (floors, elevators, capacity)
+BUILDINGS = {
+    "small": (10, 2, 8),
+    "medium": (50, 6, 12),
+    "very_large": (150, 24, 20)
+}
+
+# name -> number of independent call streams merged together, each stream being the default generate_calls traffic
+TRAFFIC = {
+    "light": 1,
+    "peak": 8
+}
+
+SEED = 20240101
+
+# metrics where a lower value is worse, the rest are worse when higher
+HIGHER_IS_BETTER = {"simulated_seconds_per_second", "calls_ingested_per_second"}
+
+
+# generates the calls for a scenario, the same every time for the same arguments
+def scenario_calls(floors, streams, duration, seed=SEED):
+    rng = random.Random(seed)
+    merged = heapq.merge(*[generate_calls(0, duration, floors, rng) for _ in range(streams)], key=lambda call: call.time)
+    return list(merged)
+
+
+def build_simulation(behaviour, floors, elevators, capacity, event_driven):
+    system = ElevatorSystem(
+        elevators=[Elevator(capacity=capacity, current_floor=0) for _ in range(elevators)],
+        behaviour=behaviour(),
+        total_floors=floors)
+    return ElevatorSimulation(system, event_driven=event_driven, actions=ActionLog())
+
+
+def run_simulation(simulation, calls):
+    simulation.simulate_calls(calls, verbose=False)
+
+
+# measures one behaviour on one building and traffic level
+def run_scenario(behaviour, building, traffic, duration, event_driven=False, repeat=3):
+    floors, elevators, capacity = BUILDINGS[building]
+    calls = scenario_calls(floors, TRAFFIC[traffic], duration)
+
+    # best of several runs, as the slower runs are measuring interference from the rest of the machine
+    simulation_time = None
+    for _ in range(repeat):
+        simulation = build_simulation(behaviour, floors, elevators, capacity, event_driven)
+        start = time.perf_counter()
+        run_simulation(simulation, calls)
+        elapsed = time.perf_counter() - start
+        simulation_time = elapsed if simulation_time is None else min(simulation_time, elapsed)
+    simulated_seconds = simulation.time
+
+    # dispatcher latency on its own, without the elevators moving between calls
+    # calls made at the same time are dispatched together, the same as in a simulation
+    batches = [[(call.call_floor, call.destination_floor) for call in calls_at_time]
+               for _, calls_at_time in groupby(calls, key=attrgetter("time"))]
+    ingest_time = None
+    for _ in range(repeat):
+        system = build_simulation(behaviour, floors, elevators, capacity, event_driven).elevator_system
+        start = time.perf_counter()
+        for batch in batches:
+            system.ingest_calls(batch)
+        elapsed = time.perf_counter() - start
+        ingest_time = elapsed if ingest_time is None else min(ingest_time, elapsed)
+
+    # peak memory in a separate run as tracing allocations slows everything down
+    simulation = build_simulation(behaviour, floors, elevators, capacity, event_driven)
+    tracemalloc.start()
+    run_simulation(simulation, calls)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "calls": len(calls),
+        "simulated_seconds": simulated_seconds,
+        "simulated_seconds_per_second": simulated_seconds / simulation_time if simulation_time > 0 else None,
+        "calls_ingested_per_second": len(calls) / ingest_time if ingest_time > 0 else None,
+        "peak_memory_bytes": peak_memory
+    }
+
+
+def run_suite(duration=3600, behaviours=None, buildings=None, traffic=None, event_driven=False, repeat=3):
+    results = {}
+    for behaviour in behaviours or BEHAVIOURS:
+        for building in buildings or BUILDINGS:
+            for traffic_level in traffic or TRAFFIC:
+                name = behaviour.__name__ + "/" + building + "/" + traffic_level
+                results[name] = run_scenario(behaviour, building, traffic_level, duration, event_driven, repeat)
+                print(name + ": " + format_result(results[name]))
+    return {
+        "settings": {"duration": duration, "seed": SEED, "event_driven": event_driven, "repeat": repeat},
+        "machine": {"python": platform.python_version(), "platform": platform.platform()},
+        "results": results
+    }
+
+
+def format_result(result):
+    return format(result["simulated_seconds_per_second"] or 0, ".0f") + " simulated s/s, " + \
+           format(result["calls_ingested_per_second"] or 0, ".0f") + " calls/s, " + \
+           format(result["peak_memory_bytes"] / 1024, ".0f") + " KiB peak"
+
+
+# compares results against a baseline, returning a list of descriptions of metrics that got worse by more than the
+# given fraction
+def compare_results(baseline, current, threshold=0.1):
+    regressions = []
+    for name, baseline_result in baseline["results"].items():
+        current_result = current["results"].get(name)
+        if current_result is None:
+            continue
+        for metric, baseline_value in baseline_result.items():
+            current_value = current_result.get(metric)
+            if metric not in HIGHER_IS_BETTER and metric != "peak_memory_bytes":
+                continue
+            if not baseline_value or current_value is None:
+                continue
+            if metric in HIGHER_IS_BETTER:
+                change = (baseline_value - current_value) / baseline_value
+            else:
+                change = (current_value - baseline_value) / baseline_value
+            if change > threshold:
+                regressions.append(name + " " + metric + " is " + format(change * 100, ".1f") + "% worse (" +
+                                   format(baseline_value, ".0f") + " -> " + format(current_value, ".0f") + ")")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark simulation throughput and dispatcher latency")
+    parser.add_argument("--duration", type=int, default=3600, help="seconds of calls to generate for each scenario")
+    parser.add_argument("--behaviours", nargs="+", default=[b.__name__ for b in BEHAVIOURS])
+    parser.add_argument("--buildings", nargs="+", default=list(BUILDINGS), choices=list(BUILDINGS))
+    parser.add_argument("--traffic", nargs="+", default=list(TRAFFIC), choices=list(TRAFFIC))
+    parser.add_argument("--event-driven", action="store_true", help="use the event driven simulation engine")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="file to save the results to as JSON")
+    parser.add_argument("--compare", help="baseline JSON file to check the results against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="fraction a metric can get worse by")
+    args = parser.parse_args()
+
+    behaviours = [getattr(elevatorbehaviour, name) for name in args.behaviours]
+    results = run_suite(args.duration, behaviours, args.buildings, args.traffic, args.event_driven, args.repeat)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        regressions = compare_results(baseline, results, args.threshold)
+        for regression in regressions:
+            print("REGRESSION: " + regression)
+        if regressions:
+            raise SystemExit(1)
+        print("No regressions against " + args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import numpy as np
+
+from elevatorcall import ElevatorCall
+
+
+# A set of elevator calls stored as parallel NumPy arrays rather than one ElevatorCall object per call
+# Iterating over a batch yields ElevatorCall objects in time order, so it can be passed straight into simulate_calls
+class CallBatch:
+    def __init__(self, times, call_floors, destination_floors, people):
+        self.times = times
+        self.call_floors = call_floors
+        self.destination_floors = destination_floors
+        self.people = people
+
+    def __len__(self):
+        return len(self.times)
+
+    def __iter__(self):
+        for time, call_floor, destination_floor, people in zip(
+                self.times.tolist(), self.call_floors.tolist(), self.destination_floors.tolist(), self.people.tolist()):
+            yield ElevatorCall(time=time, call_floor=call_floor, destination_floor=destination_floor, people=people)
+
+    def to_calls(self):
+        return list(self)
+
+
+# generates a random set of elevator calls using the same distributions as elevatorcall.generate_calls,
+# but drawing every random number for the whole time range at once
+# 'factor' controls the weighting towards the lobby, as in elevatorcall.random_0_weighted
+def generate_call_batch(start_time, end_time, floors, rng=None, factor=2):
+    if rng is None:
+        rng = np.random.default_rng()
+    timesteps = max(end_time - start_time, 0)
+
+    calls_per_timestep = clamped_log_normal(rng, mean=-2.5, sdev=1, low=0, high=5, size=timesteps)
+    times = np.repeat(np.arange(start_time, start_time + timesteps, dtype=np.int64), calls_per_timestep)
+    call_floors = random_0_weighted(rng, floors, factor, size=len(times))
+    destination_floors = random_0_weighted(rng, floors, factor, size=len(times))
+    people = clamped_log_normal(rng, mean=0, sdev=1, low=1, high=5, size=len(times))
+
+    # people don't make calls where the source and destination floor are the same
+    valid = call_floors != destination_floors
+    return CallBatch(times[valid], call_floors[valid], destination_floors[valid], people[valid])
+
+
+# generates a random list of ElevatorCall objects, see generate_call_batch
+def generate_calls_vectorised(start_time, end_time, floors, rng=None, factor=2):
+    return generate_call_batch(start_time, end_time, floors, rng, factor).to_calls()
+
+
+# array version of elevatorcall.random_0_weighted
+def random_0_weighted(rng, high, factor, size):
+    n = rng.integers(0, high * factor, size=size)
+    n[n >= high] = 0
+    return n
+
+
+# array version of elevatorcall.clamped_log_normal, numpy rounds halves to even in the same way as Python's round
+def clamped_log_normal(rng, mean, sdev, low, high, size):
+    return np.clip(np.rint(rng.lognormal(mean=mean, sigma=sdev, size=size)), low, high).astype(np.int64)
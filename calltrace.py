@@ -0,0 +1,154 @@
+import csv
+import mmap
+import struct
+from bisect import bisect_left
+
+from elevatorcall import ElevatorCall
+
+# a call trace is this header followed by fixed width records of time, call floor, destination floor and people
+TRACE_MAGIC = b"ELEVCALLS\x01\x00\x00\x00\x00\x00\x00"
+RECORD = struct.Struct("<qiii")
+# records read from the file at a time when iterating
+READ_RECORDS = 65536
+
+
+# Calls recorded in a binary call trace file, read straight from a memory map of the file
+# Calls are only turned into ElevatorCall objects as they are used, so a simulation can start on a trace of any size
+# straight away with simulate_calls(trace), or work through it in time ordered slices
+class CallTrace:
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "rb")
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty files can't be mapped
+            self.file.close()
+            raise ValueError(str(path) + " is not a call trace")
+        if self.map[:len(TRACE_MAGIC)] != TRACE_MAGIC or (len(self.map) - len(TRACE_MAGIC)) % RECORD.size != 0:
+            self.close()
+            raise ValueError(str(path) + " is not a call trace")
+        self.view = CallTraceSlice(self, 0, (len(self.map) - len(TRACE_MAGIC)) // RECORD.size)
+
+    def __len__(self):
+        return len(self.view)
+
+    def __getitem__(self, index):
+        return self.view[index]
+
+    def __iter__(self):
+        return iter(self.view)
+
+    # returns the calls with start <= time < end
+    def between(self, start, end):
+        return self.view.between(start, end)
+
+    # returns consecutive slices of calls, each covering 'duration' seconds, from the first call to the last
+    def slices(self, duration):
+        return self.view.slices(duration)
+
+    def time_at(self, index):
+        return RECORD.unpack_from(self.map, len(TRACE_MAGIC) + index * RECORD.size)[0]
+
+    def close(self):
+        if hasattr(self, "map"):
+            self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+# A range of the records in a CallTrace, read lazily like the trace itself
+class CallTraceSlice:
+    def __init__(self, trace, start, stop):
+        self.trace = trace
+        self.start = start
+        self.stop = stop
+
+    def __len__(self):
+        return self.stop - self.start
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("call trace index out of range")
+        return ElevatorCall(*RECORD.unpack_from(self.trace.map, len(TRACE_MAGIC) + (self.start + index) * RECORD.size))
+
+    # each chunk of records is copied out of the map before any are yielded, so the trace can be closed part way through
+    def __iter__(self):
+        for start in range(self.start, self.stop, READ_RECORDS):
+            stop = min(start + READ_RECORDS, self.stop)
+            records = self.trace.map[len(TRACE_MAGIC) + start * RECORD.size:len(TRACE_MAGIC) + stop * RECORD.size]
+            for record in RECORD.iter_unpack(records):
+                yield ElevatorCall(*record)
+
+    # returns the calls in this slice with start <= time < end, found by bisecting the call times
+    def between(self, start, end):
+        times = TraceTimes(self.trace)
+        first = bisect_left(times, start, self.start, self.stop)
+        last = bisect_left(times, end, first, self.stop)
+        return CallTraceSlice(self.trace, first, last)
+
+    def slices(self, duration):
+        if duration <= 0:
+            raise ValueError("Slices must have a positive duration, not " + str(duration))
+        if len(self) == 0:
+            return
+        time = self.trace.time_at(self.start)
+        end = self.trace.time_at(self.stop - 1)
+        while time <= end:
+            yield self.between(time, time + duration)
+            time += duration
+
+
+# The call times of a CallTrace as a sequence, for bisecting
+class TraceTimes:
+    def __init__(self, trace):
+        self.trace = trace
+
+    def __len__(self):
+        return len(self.trace)
+
+    def __getitem__(self, index):
+        return self.trace.time_at(index)
+
+
+# writes calls from any iterable in time order, such as generate_calls or stream_calls, to a call trace file
+# returns the number of calls written
+def write_call_trace(calls, path):
+    count = 0
+    last_time = None
+    with open(path, "wb") as file:
+        file.write(TRACE_MAGIC)
+        chunk = bytearray()
+        for call in calls:
+            if last_time is not None and call.time < last_time:
+                raise ValueError("Calls must be in time order to be written to a call trace, call at time " +
+                                 str(call.time) + " came after time " + str(last_time))
+            last_time = call.time
+            chunk += RECORD.pack(call.time, call.call_floor, call.destination_floor, call.people)
+            count += 1
+            if len(chunk) >= READ_RECORDS * RECORD.size:
+                file.write(chunk)
+                chunk = bytearray()
+        file.write(chunk)
+    return count
+
+
+# reads calls from a CSV file with time, call_floor, destination_floor and people columns, such as one written by
+# exporters.CallWriter
+def read_call_csv(path):
+    with open(path, newline="") as file:
+        for row in csv.DictReader(file):
+            yield ElevatorCall(int(row["time"]), int(row["call_floor"]), int(row["destination_floor"]),
+                               int(row["people"]))
+
+
+# converts a CSV file of calls to a call trace file, returning the number of calls
+def convert_call_csv(csv_path, trace_path):
+    return write_call_trace(read_call_csv(csv_path), trace_path)
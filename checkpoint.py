@@ -0,0 +1,42 @@
+import pickle
+import zlib
+
+# Saving and restoring the complete state of a simulation, including its elevator system, elevators, behaviour,
+# people and statistics, so that several scenarios can carry on from a shared point in time
+# Checkpoints are pickles, so only restore checkpoints from a trusted source
+
+CHECKPOINT_HEADER = b"ELEVATORSIM"
+CHECKPOINT_VERSION = 1
+
+
+# returns the state of the simulation as compressed bytes
+def snapshot(simulation, compression_level=6):
+    state = pickle.dumps(simulation, protocol=pickle.HIGHEST_PROTOCOL)
+    return CHECKPOINT_HEADER + bytes([CHECKPOINT_VERSION]) + zlib.compress(state, compression_level)
+
+
+# recreates a simulation from bytes returned by snapshot
+def restore(data):
+    if data[:len(CHECKPOINT_HEADER)] != CHECKPOINT_HEADER:
+        raise ValueError("Data is not a simulation checkpoint")
+    version = data[len(CHECKPOINT_HEADER)]
+    if version != CHECKPOINT_VERSION:
+        raise ValueError("Unsupported checkpoint version " + str(version))
+    return pickle.loads(zlib.decompress(data[len(CHECKPOINT_HEADER) + 1:]))
+
+
+def save_checkpoint(simulation, path):
+    with open(path, "wb") as file:
+        file.write(snapshot(simulation))
+
+
+def load_checkpoint(path):
+    with open(path, "rb") as file:
+        return restore(file.read())
+
+
+# returns independent copies of the simulation that can each carry on separately, without compressing the state
+# the behaviour or elevators of each copy can be changed before carrying on to compare different scenarios
+def fork(simulation, branches=1):
+    state = pickle.dumps(simulation, protocol=pickle.HIGHEST_PROTOCOL)
+    return [pickle.loads(state) for _ in range(branches)]
@@ -0,0 +1,95 @@
+from collections import deque
+
+
+# The list of floors an elevator is going to visit, in order
+# Adding or removing floors at either end takes constant time, unlike a list where changing the front shifts everything
+# Compares equal to a list containing the same floors, so it can be used anywhere a destination list was used before
+class DestinationQueue(deque):
+
+    def __eq__(self, other):
+        if isinstance(other, (list, deque)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return False
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "DestinationQueue(" + str(list(self)) + ")"
+
+
+# A DestinationQueue that calls 'listener' with no arguments whenever its floors change
+# Used to keep other representations of an elevator's route, such as the next destination in a FleetArrays, up to date
+class ObservedDestinationQueue(DestinationQueue):
+    def __init__(self, floors=(), listener=None):
+        super().__init__(floors)
+        self.listener = listener
+
+    def changed(self):
+        if self.listener is not None:
+            self.listener()
+
+    def append(self, floor):
+        super().append(floor)
+        self.changed()
+
+    def appendleft(self, floor):
+        super().appendleft(floor)
+        self.changed()
+
+    def extend(self, floors):
+        super().extend(floors)
+        self.changed()
+
+    def extendleft(self, floors):
+        super().extendleft(floors)
+        self.changed()
+
+    def insert(self, index, floor):
+        super().insert(index, floor)
+        self.changed()
+
+    def pop(self):
+        floor = super().pop()
+        self.changed()
+        return floor
+
+    def popleft(self):
+        floor = super().popleft()
+        self.changed()
+        return floor
+
+    def remove(self, floor):
+        super().remove(floor)
+        self.changed()
+
+    def clear(self):
+        super().clear()
+        self.changed()
+
+    def reverse(self):
+        super().reverse()
+        self.changed()
+
+    def rotate(self, n=1):
+        super().rotate(n)
+        self.changed()
+
+    def __setitem__(self, index, floor):
+        super().__setitem__(index, floor)
+        self.changed()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self.changed()
+
+    def __iadd__(self, floors):
+        self.extend(floors)
+        return self
+
+    def __imul__(self, n):
+        super().__imul__(n)
+        self.changed()
+        return self
@@ -0,0 +1,285 @@
+import argparse
+import random
+import sys
+
+from elevator import Elevator
+from elevatorbehaviour import (
+    BatchAssignment,
+    ClosestCallPrepend,
+    EarliestArrival,
+    LeastBusyAppend,
+    RoundRobinAppend,
+    StandardElevator
+)
+from elevatorcall import ElevatorCall, generate_calls
+from elevatorsimulation import ElevatorSimulation
+from elevatorsystem import ElevatorSystem
+
+BEHAVIOURS = [RoundRobinAppend, ClosestCallPrepend, LeastBusyAppend, StandardElevator, EarliestArrival, BatchAssignment]
+
+
+# A set of calls to run on a fresh elevator system, with every elevator starting empty at the lobby
+class Workload:
+    def __init__(self, name, floors, elevators, capacity, calls):
+        self.name = name
+        self.floors = floors
+        self.elevators = elevators
+        self.capacity = capacity
+        self.calls = calls
+
+    def with_calls(self, calls):
+        return Workload(self.name, self.floors, self.elevators, self.capacity, calls)
+
+    def __repr__(self):
+        return "name = " + self.name + \
+               ", floors = " + str(self.floors) + \
+               ", elevators = " + str(self.elevators) + \
+               ", capacity = " + str(self.capacity) + \
+               ", calls = " + str(len(self.calls))
+
+
+def build_system(workload, behaviour):
+    elevators = [Elevator(capacity=workload.capacity, current_floor=0) for _ in range(workload.elevators)]
+    return ElevatorSystem(elevators=elevators, behaviour=behaviour(), total_floors=workload.floors)
+
+
+# Engines run a workload's calls with a behaviour and return the actions and statistics of the simulation
+def run_tick(workload, behaviour):
+    simulation = ElevatorSimulation(build_system(workload, behaviour))
+    simulation.simulate_calls(workload.calls, verbose=False)
+    return simulation.actions, simulation.statistics()
+
+
+def run_event_driven(workload, behaviour):
+    simulation = ElevatorSimulation(build_system(workload, behaviour), event_driven=True)
+    simulation.simulate_calls(workload.calls, verbose=False)
+    return simulation.actions, simulation.statistics()
+
+
+def run_skip_idle(workload, behaviour):
+    simulation = ElevatorSimulation(build_system(workload, behaviour), event_driven=True, skip_idle_elevators=True)
+    simulation.simulate_calls(workload.calls, verbose=False)
+    return simulation.actions, simulation.statistics()
+
+
+# the NumPy engines are only imported when they are used, so the rest can run without NumPy
+def run_vectorised(workload, behaviour):
+    from vectorisedsimulation import VectorisedSimulation
+    simulation = VectorisedSimulation(build_system(workload, behaviour))
+    simulation.simulate_calls(workload.calls, verbose=False)
+    return simulation.actions, simulation.statistics()
+
+
+def run_batched(workload, behaviour):
+    from batchedsimulation import BatchedSimulation
+    batched = BatchedSimulation(1, workload.elevators, behaviour, workload.floors, capacity=workload.capacity)
+    statistics = batched.simulate_calls([workload.calls])
+    return batched.simulations[0].actions, statistics[0]
+
+
+# name -> engine, every one of which should give exactly the same results as the reference
+ENGINES = {
+    "tick": run_tick,
+    "event_driven": run_event_driven,
+    "skip_idle": run_skip_idle,
+    "vectorised": run_vectorised,
+    "batched": run_batched
+}
+# the simulation stepping every elevator one time step at a time, which every other engine is checked against
+REFERENCE = "tick"
+
+
+# runs an engine, returning ("ok", actions, statistics), or ("error", exception type, message) if it raised an error,
+# as engines are expected to fail in the same way as the reference as well
+def run_engine(engine, workload, behaviour):
+    try:
+        actions, statistics = engine(workload, behaviour)
+    except Exception as e:
+        return "error", type(e).__name__, str(e)
+    return "ok", [(action.time, action.elevator_number, action.action.name, action.floor) for action in actions], \
+        statistics
+
+
+# returns a description of the first difference between two results from run_engine, or None if they are the same
+def difference(reference, candidate):
+    if reference == candidate:
+        return None
+    if reference[0] == "error" or candidate[0] == "error":
+        return "reference gave " + describe(reference) + " but candidate gave " + describe(candidate)
+    reference_actions, candidate_actions = reference[1], candidate[1]
+    for index, (expected, actual) in enumerate(zip(reference_actions, candidate_actions)):
+        if expected != actual:
+            return "action " + str(index) + " was " + str(actual) + " instead of " + str(expected)
+    if len(reference_actions) != len(candidate_actions):
+        return "candidate recorded " + str(len(candidate_actions)) + " actions instead of " + \
+               str(len(reference_actions))
+    for key, expected in reference[2].items():
+        actual = candidate[2].get(key)
+        if expected != actual:
+            return "statistic " + key + " was " + str(actual) + " instead of " + str(expected)
+    return "candidate statistics have extra keys " + ", ".join(sorted(set(candidate[2]) - set(reference[2])))
+
+
+def describe(result):
+    if result[0] == "error":
+        return result[1] + "(" + result[2] + ")"
+    return str(len(result[1])) + " actions"
+
+
+# A workload that a candidate engine gave different results for than the reference
+class Mismatch:
+    def __init__(self, engine, behaviour, workload, original_calls, difference):
+        self.engine = engine
+        self.behaviour = behaviour
+        self.workload = workload              # the workload with its calls shrunk to a minimal set that still differs
+        self.original_calls = original_calls  # number of calls in the workload before it was shrunk
+        self.difference = difference
+
+    def __repr__(self):
+        return "engine = " + self.engine + \
+               ", behaviour = " + self.behaviour.__name__ + \
+               ", workload = " + self.workload.name + \
+               ", calls = " + str(len(self.workload.calls)) + " (shrunk from " + str(self.original_calls) + ")" + \
+               ", " + self.difference
+
+    # Python that recreates the minimal calls, to paste into a test
+    def reproduction(self):
+        return "[" + ",\n ".join("ElevatorCall(time=" + str(call.time) + ", call_floor=" + str(call.call_floor) +
+                                  ", destination_floor=" + str(call.destination_floor) + ", people=" +
+                                  str(call.people) + ")" for call in self.workload.calls) + "]"
+
+
+# runs a workload through the reference and a candidate engine, returning a Mismatch with the calls shrunk if they
+# differ, otherwise None
+def compare(engine_name, behaviour, workload, reference=REFERENCE):
+    def differs(calls):
+        candidate_workload = workload.with_calls(calls)
+        return difference(run_engine(ENGINES[reference], candidate_workload, behaviour),
+                          run_engine(ENGINES[engine_name], candidate_workload, behaviour))
+
+    if differs(workload.calls) is None:
+        return None
+    calls = shrink(workload.calls, lambda calls: differs(calls) is not None)
+    return Mismatch(engine_name, behaviour, workload.with_calls(calls), len(workload.calls), differs(calls))
+
+
+# returns a smaller list of calls for which 'fails' is still true, by removing runs of calls, halving the length of
+# the runs each time nothing more can be removed, and then simplifying the calls that are left
+# calls stay in time order throughout
+def shrink(calls, fails):
+    calls = list(calls)
+    length = max(1, len(calls) // 2)
+    while True:
+        start = 0
+        while start < len(calls):
+            candidate = calls[:start] + calls[start + length:]
+            if fails(candidate):
+                calls = candidate
+            else:
+                start += length
+        if length == 1:
+            break
+        length //= 2
+
+    simplified = True
+    while simplified:
+        simplified = False
+        for index in range(len(calls)):
+            for call in simpler_calls(calls, index):
+                candidate = calls[:index] + [call] + calls[index + 1:]
+                if fails(candidate):
+                    calls = candidate
+                    simplified = True
+                    break
+    return calls
+
+
+# simpler versions of a call that keep the calls in time order: fewer people, an earlier time, or lower floors
+def simpler_calls(calls, index):
+    call = calls[index]
+    earliest = calls[index - 1].time if index > 0 else 0
+    if call.people > 1:
+        yield ElevatorCall(call.time, call.call_floor, call.destination_floor, 1)
+    if call.time > earliest:
+        yield ElevatorCall(earliest, call.call_floor, call.destination_floor, call.people)
+        if call.time - 1 > earliest:
+            yield ElevatorCall((earliest + call.time) // 2, call.call_floor, call.destination_floor, call.people)
+    if call.call_floor > 0:
+        yield ElevatorCall(call.time, call.call_floor - 1, call.destination_floor, call.people)
+    if call.destination_floor > 0:
+        yield ElevatorCall(call.time, call.call_floor, call.destination_floor - 1, call.people)
+
+
+# a random workload from generate_calls, with the building drawn from the seed too
+def random_workload(seed):
+    rng = random.Random(seed)
+    floors = rng.choice([2, 5, 10, 30])
+    elevators = rng.randint(1, 4)
+    capacity = rng.choice([1, 2, 4, 10])
+    calls = generate_calls(0, rng.randint(50, 600), floors, rng)
+    return Workload("random " + str(seed), floors, elevators, capacity, calls)
+
+
+# workloads aimed at the places engines are most likely to disagree
+def edge_case_workloads():
+    return [
+        # several calls at once, dispatched as one batch
+        Workload("same time calls", 10, 3, 10,
+                 [ElevatorCall(0, floor, 9 - floor, 1) for floor in range(10)] +
+                 [ElevatorCall(40, 0, floor, 2) for floor in range(1, 10)]),
+        # more people than fit, so some are turned away and call again later
+        Workload("full cars", 8, 2, 2,
+                 [ElevatorCall(0, 0, 5, 5), ElevatorCall(0, 0, 7, 3), ElevatorCall(3, 4, 1, 4),
+                  ElevatorCall(60, 0, 6, 5), ElevatorCall(61, 6, 0, 5)]),
+        # calls made while the lobby doors are open, and to the lobby itself
+        Workload("lobby door stops", 6, 2, 4,
+                 [ElevatorCall(time, 0, 1 + time % 5, 1) for time in range(0, 90, 7)] +
+                 [ElevatorCall(95, 3, 0, 2), ElevatorCall(96, 0, 0, 1), ElevatorCall(125, 0, 3, 1)]),
+        # calls to and from the floor the caller is already on
+        Workload("same floor", 5, 2, 4,
+                 [ElevatorCall(0, 0, 0, 1), ElevatorCall(2, 3, 3, 2), ElevatorCall(2, 3, 4, 1),
+                  ElevatorCall(8, 4, 4, 1)]),
+        # a long gap with nothing happening, then one call
+        Workload("long gap", 20, 3, 10,
+                 [ElevatorCall(0, 0, 19, 1), ElevatorCall(10000, 19, 0, 1)]),
+        # no elevators at all, with and without calls
+        Workload("empty fleet", 5, 0, 10, [ElevatorCall(0, 0, 3, 1)]),
+        Workload("empty fleet without calls", 5, 0, 10, []),
+        Workload("no calls", 5, 2, 10, [])
+    ]
+
+
+# checks every candidate engine against the reference for every behaviour, on the edge cases and 'seeds' random
+# workloads, returning a Mismatch for each combination that differs
+def run_differential(engines=None, behaviours=BEHAVIOURS, seeds=range(10), reference=REFERENCE):
+    engines = [name for name in ENGINES if name != reference] if engines is None else engines
+    workloads = edge_case_workloads() + [random_workload(seed) for seed in seeds]
+    mismatches = []
+    for engine_name in engines:
+        for behaviour in behaviours:
+            for workload in workloads:
+                mismatch = compare(engine_name, behaviour, workload, reference)
+                if mismatch is not None:
+                    mismatches.append(mismatch)
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that every simulation engine gives the same results as the "
+                                                 "reference tick by tick engine")
+    parser.add_argument("--engines", nargs="+", choices=sorted(ENGINES), default=None)
+    parser.add_argument("--behaviours", nargs="+", default=[behaviour.__name__ for behaviour in BEHAVIOURS])
+    parser.add_argument("--seeds", type=int, default=10, help="number of random workloads")
+    args = parser.parse_args()
+
+    behaviours = [behaviour for behaviour in BEHAVIOURS if behaviour.__name__ in args.behaviours]
+    mismatches = run_differential(args.engines, behaviours, range(args.seeds))
+    for mismatch in mismatches:
+        print(mismatch)
+        print(mismatch.reproduction())
+    print(str(len(mismatches)) + " mismatches found")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
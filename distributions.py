@@ -0,0 +1,186 @@
+import math
+
+
+# Counts of values in fixed width buckets starting at 0, with one extra bucket for everything beyond the last
+# Uses the same memory however many values are added, and histograms with the same buckets can be merged
+class Histogram:
+    def __init__(self, bucket_width=10, bucket_count=60):
+        if bucket_width <= 0 or bucket_count <= 0:
+            raise ValueError("Histogram needs a positive bucket width and count, not " + str(bucket_width) +
+                             " and " + str(bucket_count))
+        self.bucket_width = bucket_width
+        self.counts = [0] * (bucket_count + 1)  # the last bucket holds everything above the others
+        self.count = 0
+        self.total = 0
+        self.minimum = None
+        self.maximum = None
+
+    # adds a value the given number of times
+    def add(self, value, count=1):
+        if value < 0:
+            raise ValueError("Histogram cannot hold negative value " + str(value))
+        self.counts[min(int(value // self.bucket_width), len(self.counts) - 1)] += count
+        self.count += count
+        self.total += value * count
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+
+    # adds the values of another histogram with the same buckets to this one
+    def merge(self, other):
+        if other.bucket_width != self.bucket_width or len(other.counts) != len(self.counts):
+            raise ValueError("Cannot merge histograms with different buckets")
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.count += other.count
+        self.total += other.total
+        if other.minimum is not None and (self.minimum is None or other.minimum < self.minimum):
+            self.minimum = other.minimum
+        if other.maximum is not None and (self.maximum is None or other.maximum > self.maximum):
+            self.maximum = other.maximum
+
+    def mean(self):
+        return self.total / self.count if self.count else 0
+
+    def __eq__(self, other):
+        if isinstance(other, Histogram):
+            return self.bucket_width == other.bucket_width and self.counts == other.counts and \
+                   self.total == other.total and self.minimum == other.minimum and self.maximum == other.maximum
+        return False
+
+    __hash__ = None
+
+    # returns (low, high, count) for each bucket, where high is None for the last bucket
+    def buckets(self):
+        result = []
+        for index, count in enumerate(self.counts):
+            high = (index + 1) * self.bucket_width if index < len(self.counts) - 1 else None
+            result.append((index * self.bucket_width, high, count))
+        return result
+
+
+# Approximate quantiles of a stream of non-negative values, where every quantile is within 'relative_accuracy' of a
+# value that was added
+# Values are counted in buckets whose size grows with the value, so memory only grows with the logarithm of the
+# largest value, and is capped at 'max_buckets' by combining the lowest buckets. Sketches with the same accuracy can
+# be merged, giving the same result as adding all the values to one sketch.
+class QuantileSketch:
+    def __init__(self, relative_accuracy=0.01, max_buckets=2048):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("Relative accuracy must be between 0 and 1, not " + str(relative_accuracy))
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = {}  # bucket key -> count, bucket k holds values in (gamma^(k-1), gamma^k]
+        self.zero_count = 0
+        self.count = 0
+
+    # adds a value the given number of times
+    def add(self, value, count=1):
+        if value < 0:
+            raise ValueError("Quantile sketch cannot hold negative value " + str(value))
+        if value == 0:
+            self.zero_count += count
+        else:
+            key = math.ceil(math.log(value) / self.log_gamma)
+            self.buckets[key] = self.buckets.get(key, 0) + count
+            if len(self.buckets) > self.max_buckets:
+                self.collapse()
+        self.count += count
+
+    # adds the values of another sketch with the same accuracy to this one
+    def merge(self, other):
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge quantile sketches with different accuracies")
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        if len(self.buckets) > self.max_buckets:
+            self.collapse()
+
+    # combines the lowest buckets until there are no more than max_buckets, losing accuracy for the smallest values
+    def collapse(self):
+        keys = sorted(self.buckets)
+        excess = len(keys) - self.max_buckets
+        target = keys[excess]
+        for key in keys[:excess]:
+            self.buckets[target] += self.buckets.pop(key)
+
+    # returns the value below which the given fraction (0 to 1) of added values fall, or None if nothing was added
+    def quantile(self, fraction):
+        if not 0 <= fraction <= 1:
+            raise ValueError("Quantile must be between 0 and 1, not " + str(fraction))
+        if self.count == 0:
+            return None
+        rank = fraction * (self.count - 1)
+        seen = self.zero_count
+        if seen > rank:
+            return 0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen > rank:
+                # the middle of the bucket, which is within the relative accuracy of every value in it
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+    def __eq__(self, other):
+        if isinstance(other, QuantileSketch):
+            return self.relative_accuracy == other.relative_accuracy and self.buckets == other.buckets and \
+                   self.zero_count == other.zero_count
+        return False
+
+    __hash__ = None
+
+
+# The distribution of a time measured for each person, such as waiting time, kept as a histogram and quantile sketch
+class Distribution:
+    def __init__(self, bucket_width=10, bucket_count=60, relative_accuracy=0.01):
+        self.histogram = Histogram(bucket_width, bucket_count)
+        self.sketch = QuantileSketch(relative_accuracy)
+
+    # adds a value for the given number of people
+    def add(self, value, count=1):
+        self.histogram.add(value, count)
+        self.sketch.add(value, count)
+
+    def merge(self, other):
+        self.histogram.merge(other.histogram)
+        self.sketch.merge(other.sketch)
+
+    @property
+    def count(self):
+        return self.histogram.count
+
+    def mean(self):
+        return self.histogram.mean()
+
+    # returns the given percentile (0 to 100), or None if nothing was added
+    def percentile(self, percent):
+        value = self.sketch.quantile(percent / 100)
+        if value is None:
+            return None
+        # the sketch can only be off by its relative accuracy, but never needs to go beyond the values seen
+        return min(max(value, self.histogram.minimum), self.histogram.maximum)
+
+    def __eq__(self, other):
+        if isinstance(other, Distribution):
+            return self.histogram == other.histogram and self.sketch == other.sketch
+        return False
+
+    __hash__ = None
+
+
+# returns a new distribution holding the values of all the given distributions, such as the waiting times from
+# several runs of a sweep
+def merge_distributions(distributions):
+    distributions = list(distributions)
+    if len(distributions) == 0:
+        return Distribution()
+    merged = Distribution(distributions[0].histogram.bucket_width, len(distributions[0].histogram.counts) - 1,
+                          distributions[0].sketch.relative_accuracy)
+    for distribution in distributions:
+        merged.merge(distribution)
+    return merged
@@ -1,5 +1,6 @@
 from enum import Enum
 
+from destinationqueue import DestinationQueue, ObservedDestinationQueue
 from elevatoraction import Action, ActionTimings
 
 
@@ -13,10 +14,30 @@ class Elevator:
         self.capacity = capacity
         self.current_floor = current_floor
 
-        self.destinations = []
+        self.destinations_listener = None
+        self.destinations = DestinationQueue()
         self.blocked_for = 0
         self.door_state = DoorState.CLOSED
 
+    @property
+    def destinations(self):
+        return self._destinations
+
+    # any sequence of floors can be assigned, it is copied into a DestinationQueue
+    @destinations.setter
+    def destinations(self, floors):
+        if self.destinations_listener is not None:
+            self._destinations = ObservedDestinationQueue(floors, listener=self.destinations_listener)
+            self.destinations_listener()
+        else:
+            self._destinations = floors if isinstance(floors, DestinationQueue) else DestinationQueue(floors)
+
+    # calls 'listener' with no arguments whenever the destinations change from now on, including when new ones are
+    # assigned
+    def observe_destinations(self, listener):
+        self.destinations_listener = listener
+        self.destinations = self.destinations
+
     # iterates the elevator's internal state forward one time step and returns the action taken
     def iterate(self):
         if self.blocked_for > 0:
@@ -30,7 +51,7 @@ class Elevator:
 
         if self.current_floor == self.destinations[0]:
             # we are at our next destination, can open doors
-            self.destinations.pop(0)
+            self.destinations.popleft()
             self.door_state = DoorState.OPEN
             if self.current_floor == 0:
                 self.blocked_for = ActionTimings[Action.OPEN_DOORS_LOBBY]-1
@@ -48,3 +69,26 @@ class Elevator:
             # Moving down
             self.current_floor -= 1
             return Action.MOVE_DOWN
+
+    # number of time steps until the elevator next has to open its doors or become idle
+    # returns None if the elevator has nowhere to go and is not blocked
+    def time_until_next_event(self):
+        if self.blocked_for > 0:
+            return self.blocked_for
+        if len(self.destinations) == 0:
+            return None
+        return abs(self.destinations[0] - self.current_floor)
+
+    # advances the elevator forward a number of time steps in one go, which must not be more than time_until_next_event
+    # returns the movement action taken on each of those steps, or None if the elevator was only blocked
+    def fast_forward(self, steps):
+        if self.blocked_for > 0:
+            self.blocked_for -= steps
+            return None
+        self.door_state = DoorState.CLOSED
+        if self.current_floor < self.destinations[0]:
+            self.current_floor += steps
+            return Action.MOVE_UP
+        else:
+            self.current_floor -= steps
+            return Action.MOVE_DOWN
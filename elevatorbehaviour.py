@@ -1,5 +1,11 @@
 from abc import ABC, abstractmethod
-from enum import Enum
+from enum import IntEnum
+from operator import itemgetter
+
+from arrivaltimes import ArrivalTimes, stop_time, travel_time
+from assignment import min_cost_assignment
+from destinationqueue import DestinationQueue
+from sweeproute import SweepRoute, UP, DOWN
 
 
 # To define a new elevator algorithm, extend this class and implement ingest_call
@@ -12,6 +18,12 @@ class ElevatorBehaviour(ABC):
     def ingest_call(self, elevators, call_floor, destination_floor):
         pass
 
+    # Accepts every call made at the same time as a list of (call floor, destination floor) pairs
+    # Returns the index of the elevator assigned to each call, in the same order
+    # Behaviours that can plan a whole batch at once override this, otherwise the calls are taken one at a time
+    def ingest_calls(self, elevators, calls):
+        return [self.ingest_call(elevators, call_floor, destination_floor) for call_floor, destination_floor in calls]
+
 
 # Picks an elevator through round robin and adds source and destination to the end of it's destination list
 class RoundRobinAppend(ElevatorBehaviour):
@@ -32,8 +44,8 @@ class ClosestCallPrepend(ElevatorBehaviour):
     def ingest_call(self, elevators, call_floor, destination_floor):
         closest = self.closest_elevator_to_floor(elevators, call_floor)
         elevator_to_use = elevators[closest]
-        elevator_to_use.destinations.insert(0, destination_floor)
-        elevator_to_use.destinations.insert(0, call_floor)
+        elevator_to_use.destinations.appendleft(destination_floor)
+        elevator_to_use.destinations.appendleft(call_floor)
         return closest
 
     def closest_elevator_to_floor(self, elevators, floor):
@@ -62,14 +74,144 @@ class LeastBusyAppend(ElevatorBehaviour):
         return least_busy
 
 
+# Picks the elevator that can get to the call floor soonest after finishing its current destinations, and adds source
+# and destination to the end of it's destination list
+# Arrival times are estimated from ActionTimings and kept for each elevator, so only the floors added to an elevator's
+# route need working out on each call
+class EarliestArrival(ElevatorBehaviour):
+    def __init__(self):
+        # estimated arrival times for each elevator's destinations (see arrivaltimes.py), indexed by elevator
+        self.arrival_times = {}
+
+    def ingest_call(self, elevators, call_floor, destination_floor):
+        earliest = self.earliest_elevator_to_floor(elevators, call_floor)
+        arrival_times = self.arrival_times[earliest]
+        if len(arrival_times) == 0 or elevators[earliest].destinations[-1] != call_floor:
+            arrival_times.append(call_floor)
+        arrival_times.append(destination_floor)
+        return earliest
+
+    def earliest_elevator_to_floor(self, elevators, floor):
+        earliest = None
+        earliest_time = None
+        for index, elevator in enumerate(elevators):
+            time = self.arrival_times_for(index, elevator).time_until_added(elevator, floor)
+            if earliest is None or time < earliest_time:
+                earliest = index
+                earliest_time = time
+        return earliest
+
+    # returns the arrival times for an elevator, starting a new table if its destinations have been replaced
+    def arrival_times_for(self, index, elevator):
+        arrival_times = self.arrival_times.get(index)
+        if arrival_times is None or arrival_times.destinations is not elevator.destinations:
+            arrival_times = ArrivalTimes(elevator.destinations)
+            self.arrival_times[index] = arrival_times
+        else:
+            arrival_times.sync()
+        return arrival_times
+
+
+# Plans every call made at the same time together as an assignment problem, and takes single calls the same way as
+# EarliestArrival
+#
+# The cost of giving a call to an elevator is the estimated time until it drops the caller off. Each round gives every
+# elevator at most one of the calls still to be assigned, choosing the combination with the lowest total cost (see
+# assignment.py), until every call has an elevator. Callers from a floor an elevator is already stopping at for this
+# batch are picked up at that stop, so a burst of lobby calls shares pickups rather than sending an elevator back to the
+# lobby for each caller. Identical calls are planned separately, so callers that wouldn't all fit in one elevator are
+# spread over several.
+#
+# Costs are worked out as a column for each elevator, from where and when its route ends and the pickup time of each
+# call floor, so each elevator's route is only looked at once a round. The time each call takes from its pickup to its
+# destination is the same for every elevator, so it's only worked out once for the whole batch.
+class BatchAssignment(EarliestArrival):
+
+    def ingest_calls(self, elevators, calls):
+        if len(calls) <= 1 or len(elevators) == 0:
+            return super().ingest_calls(elevators, calls)
+        arrival_times = [self.arrival_times_for(index, elevator) for index, elevator in enumerate(elevators)]
+        # call floor -> index in the arrival times of the stop picking up callers from that floor, for each elevator
+        pickups = [{} for _ in elevators]
+        assigned = [None] * len(calls)
+
+        # every call is planned on its own, even when the same call is made several times in a batch, as the callers
+        # may not all fit in one elevator
+        waiting = list(range(len(calls)))
+        # time from the doors opening at each call floor to them opening at the destination, which is the same for
+        # every elevator
+        ride_times = {call: stop_time(call[0]) + travel_time(call[0], call[1]) for call in calls}
+        columns = [self.cost_column(elevator, times, stops, calls, ride_times)
+                   for elevator, times, stops in zip(elevators, arrival_times, pickups)]
+        while len(waiting) > len(elevators):
+            # more calls than elevators, so each elevator picks a call
+            chosen_rows = min_cost_assignment(columns)
+            for index, row in sorted(enumerate(chosen_rows), key=itemgetter(1)):
+                self.add_to_route(elevators[index], arrival_times[index], pickups[index], calls[waiting[row]])
+                assigned[waiting[row]] = index
+            chosen = set(chosen_rows)
+            waiting = [call for row, call in enumerate(waiting) if row not in chosen]
+            # every elevator was given a call, so every route has a new end to work the costs out from
+            waiting_calls = [calls[call] for call in waiting]
+            columns = [self.cost_column(elevator, times, stops, waiting_calls, ride_times)
+                       for elevator, times, stops in zip(elevators, arrival_times, pickups)]
+
+        # every call left gets an elevator in this round
+        for row, index in enumerate(min_cost_assignment([list(costs) for costs in zip(*columns)])):
+            self.add_to_route(elevators[index], arrival_times[index], pickups[index], calls[waiting[row]])
+            assigned[waiting[row]] = index
+        return assigned
+
+    # returns the estimated time for an elevator to drop off each call
+    def cost_column(self, elevator, arrival_times, pickups, calls, ride_times):
+        # when the elevator would open its doors at the end of its route, and when it would leave
+        if len(arrival_times) == 0:
+            last_floor = elevator.current_floor
+            arrival = departure = elevator.blocked_for
+        else:
+            last_floor = arrival_times.floors[-1]
+            arrival = arrival_times.time_until(elevator, len(arrival_times) - 1)
+            departure = arrival + stop_time(last_floor)
+        # call floor -> time until the elevator could open its doors there, after the rest of its route
+        pickup_times = {}
+        column = []
+        for call in calls:
+            call_floor, destination_floor = call
+            if call_floor in pickups:
+                # picked up at a stop already planned, then dropped off after the rest of the route
+                if destination_floor == last_floor:
+                    column.append(arrival)
+                else:
+                    column.append(departure + travel_time(last_floor, destination_floor))
+                continue
+            pickup_time = pickup_times.get(call_floor)
+            if pickup_time is None:
+                pickup_time = arrival if call_floor == last_floor else departure + travel_time(last_floor, call_floor)
+                pickup_times[call_floor] = pickup_time
+            column.append(pickup_time + ride_times[call])
+        return column
+
+    def add_to_route(self, elevator, arrival_times, pickups, call):
+        call_floor, destination_floor = call
+        if call_floor not in pickups:
+            if len(arrival_times) == 0 or elevator.destinations[-1] != call_floor:
+                arrival_times.append(call_floor)
+            pickups[call_floor] = len(arrival_times) - 1
+        if len(arrival_times) - 1 == pickups[call_floor] or elevator.destinations[-1] != destination_floor:
+            arrival_times.append(destination_floor)
+
+
 # Pick the elevator through round robin but elevators go all the way in one direction before changing
 class StandardElevator(ElevatorBehaviour):
     def __init__(self):
         self.current_elevator = 0
+        # the route of each elevator stored as sweeps (see sweeproute.py), indexed by elevator
+        self.routes = {}
 
-    class Direction(Enum):
-        UP = 1
-        DOWN = 2
+    # the directions used by sweeproute.py, which compare equal to UP and DOWN
+    class Direction(IntEnum):
+        UP = UP
+        DOWN = DOWN
 
     def ingest_call(self, elevators, call_floor, destination_floor):
         self.current_elevator = (self.current_elevator + 1) % len(elevators)
@@ -77,74 +219,39 @@ class StandardElevator(ElevatorBehaviour):
 
         call_direction = None
         if destination_floor > call_floor:
-            call_direction = self.Direction.UP
+            call_direction = UP
         elif destination_floor < call_floor:
-            call_direction = self.Direction.DOWN
+            call_direction = DOWN
 
-        # adding then later removing current floor from destinations list to reduce edge case checks
-        elevator_to_use.destinations.insert(0, elevator_to_use.current_floor)
-        call_insert_point = self.insert_floor_considering_direction(elevator_to_use.destinations, call_floor, call_direction)
-        self.insert_floor_considering_direction(elevator_to_use.destinations, destination_floor, call_direction, after=call_insert_point)
-        elevator_to_use.destinations.pop(0)
+        # inserting into the elevator's destinations through its route (see sweeproute.py), which finds where each
+        # floor belongs without walking through the whole route
+        route = self.route_for(elevator_to_use)
+        current_floor = elevator_to_use.current_floor
+        call_insert_point = route.insert(current_floor, call_floor, call_direction)
+        route.insert(current_floor, destination_floor, call_direction, after=call_insert_point)
 
         return self.current_elevator
 
+    # returns the route for the current elevator, starting a new one if its destinations have been replaced
+    def route_for(self, elevator):
+        route = self.routes.get(self.current_elevator)
+        if route is None or route.destinations is not elevator.destinations:
+            route = SweepRoute(elevator.destinations)
+            self.routes[self.current_elevator] = route
+        else:
+            route.sync()
+        return route
+
     # Inserts a new floor into a list of destinations, ensuring it is only added when going in the desired direction
-    # Assumes destinations are ordered asc->desc->asc (or equivalent)
+    # Assumes destinations are ordered asc->desc->asc (or equivalent), and treats the first one as the current floor
+    # Goes through a SweepRoute of the list, so the floors are copied each time, unlike the routes used by ingest_call
     def insert_floor_considering_direction(self, destinations, floor_to_insert, call_direction, after=0):
-        previous_direction = None
-        current_direction = None
-
-        for index in range(1, len(destinations)):
-            if destinations[index - 1] < destinations[index]:
-                current_direction = self.Direction.UP
-            if destinations[index - 1] > destinations[index]:
-                current_direction = self.Direction.DOWN
-
-            # don't want to insert anything until given point, but still need to track direction changes
-            if index <= after:
-                previous_direction = current_direction
-                continue
-
-            # if we are moving in the desired direction
-            if current_direction == call_direction or call_direction is None:
-                # already visiting this floor in this direction, do nothing
-                if destinations[index] == floor_to_insert:
-                    return index
-
-                # can insert at current point
-                if (
-                        current_direction == self.Direction.UP and destinations[index] > floor_to_insert > destinations[index-1]
-                ) or (
-                        current_direction == self.Direction.DOWN and destinations[index] < floor_to_insert < destinations[index-1]
-                ):
-                    destinations.insert(index, floor_to_insert)
-                    return index
-
-            # at the top
-            if current_direction == self.Direction.DOWN and previous_direction == self.Direction.UP:
-                # need to add another value above the top
-                if floor_to_insert > destinations[index-1]:
-                    destinations.insert(index, floor_to_insert)
-                    return index
-                # duplicate value at the top
-                if floor_to_insert == destinations[index-1]:
-                    return index - 1
-
-            # at the bottom
-            if current_direction == self.Direction.UP and previous_direction == self.Direction.DOWN:
-                # need to add another value below the bottom
-                if floor_to_insert < destinations[index-1]:
-                    destinations.insert(index, floor_to_insert)
-                    return index
-                # duplicate value at the bottom
-                if floor_to_insert == destinations[index-1]:
-                    return index - 1
-
-            previous_direction = current_direction
-
-        # no suitable place in the middle of the list, we can just insert at the end
-        if len(destinations) == 0 or len(destinations) == 1 or destinations[len(destinations)-1] != floor_to_insert:
+        if len(destinations) == 0:
             destinations.append(floor_to_insert)
-        return len(destinations)-1
-
+            return 0
+        route_destinations = DestinationQueue(list(destinations)[1:])
+        result = SweepRoute(route_destinations).insert(destinations[0], floor_to_insert, call_direction, after)
+        while len(destinations) > 1:
+            destinations.pop()
+        destinations.extend(route_destinations)
+        return result
@@ -24,34 +24,39 @@ class ElevatorCall:
 
 
 # generates a random list of elevator calls
-def generate_calls(start_time, end_time, floors):
-    result = []
+# 'rng' can be a random.Random instance to use instead of the random module's shared state
+def generate_calls(start_time, end_time, floors, rng=random):
+    return list(stream_calls(start_time, end_time, floors, rng))
+
+
+# lazily generates random elevator calls in time order, one time step at a time
+# can be passed straight into ElevatorSimulation.simulate_calls without holding every call in memory
+def stream_calls(start_time, end_time, floors, rng=random):
     for t in range(start_time, end_time):
-        calls_this_timestep = clamped_log_normal(mean=-2.5, sdev=1, low=0, high=5)
+        calls_this_timestep = clamped_log_normal(mean=-2.5, sdev=1, low=0, high=5, rng=rng)
         for i in range(calls_this_timestep):
-            call_floor = random_0_weighted(floors, 2)
-            destination_floor = random_0_weighted(floors, 2)
+            call_floor = random_0_weighted(floors, 2, rng)
+            destination_floor = random_0_weighted(floors, 2, rng)
             if call_floor != destination_floor:
-                result.append(ElevatorCall(
+                yield ElevatorCall(
                     time=t,
                     call_floor=call_floor,
                     destination_floor=destination_floor,
-                    people=clamped_log_normal(mean=0, sdev=1, low=1, high=5)))
-    return result
+                    people=clamped_log_normal(mean=0, sdev=1, low=1, high=5, rng=rng))
 
 
 # returning a random number between 0 and 'high'
 # but weighted towards 0 such that 0 is returned 0 (1-1/factor) of the time
-def random_0_weighted(high, factor):
-    n = random.randrange(0, high*factor)
+def random_0_weighted(high, factor, rng=random):
+    n = rng.randrange(0, high*factor)
     if n >= high:
         n = 0
     return n
 
 
 # rounded and clamped lognormal distribution
-def clamped_log_normal(mean, sdev, low, high):
-    return max(low, min(round(random.lognormvariate(mu=mean, sigma=sdev)), high))
+def clamped_log_normal(mean, sdev, low, high, rng=random):
+    return max(low, min(round(rng.lognormvariate(mu=mean, sigma=sdev)), high))
 
 
 
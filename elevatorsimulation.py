@@ -1,20 +1,49 @@
+from functools import partial
+from itertools import groupby
+from operator import attrgetter
+
+from actionlog import ActionLog
 from elevator import DoorState
-from elevatoraction import ElevatorAction, Action
-from person import Person
+from distributions import Distribution
+from elevatoraction import Action
+from person import PassengerGroup
 
 
 class ElevatorSimulation:
 
-    def __init__(self, elevator_system):
+    # if event_driven is set, stretches of time where elevators are only moving or blocked are skipped over in one go
+    # rather than iterating one time step at a time, producing the same actions and statistics
+    # 'actions' decides where actions are recorded (see actionlog.py), by default they are kept in memory
+    # if keep_calls is not set, processed calls are not stored in 'calls' so long streams of calls use bounded memory
+    # 'calls' decides where processed calls are stored, by default a list, or e.g. a CallWriter (see exporters.py)
+    # if skip_idle_elevators is set, only elevators that are busy are stepped each time step, see active_elevators.
+    # Elevators without observe_destinations (see Elevator) only become busy again when they are assigned a call.
+    # 'metrics' can be a WindowedMetrics (see metrics.py) to keep statistics for each window of time as well
+    def __init__(self, elevator_system, event_driven=False, actions=None, keep_calls=True, calls=None,
+                 skip_idle_elevators=False, metrics=None):
         self.elevator_system = elevator_system
+        self.metrics = metrics
+        self.event_driven = event_driven
+        self.keep_calls = keep_calls
+        self.skip_idle_elevators = skip_idle_elevators
+        # indexes of the elevators that may have something to do, starting with all of them
+        # elevators leave when they go idle, and join again when their destinations change or they are assigned a call
+        self.active_elevators = set(range(len(elevator_system.elevators)))
+        if skip_idle_elevators:
+            for index, elevator in enumerate(elevator_system.elevators):
+                if hasattr(elevator, "observe_destinations"):
+                    elevator.observe_destinations(partial(self.mark_active, index))
 
-        # initialising empty lists of lists
-        self.people_waiting_at_floors = [[] for _ in range(elevator_system.total_floors)]
-        self.people_in_elevators = [[] for _ in elevator_system.elevators]
+        # groups of people waiting at each floor, indexed by the elevator they are waiting for
+        self.people_waiting_at_floors = [{} for _ in range(elevator_system.total_floors)]
+        # groups of people inside each elevator, indexed by the floor they are going to
+        self.people_in_elevators = [{} for _ in elevator_system.elevators]
+        # number of people inside each elevator, kept up to date as people get on and off
+        self.occupants = [0 for _ in elevator_system.elevators]
 
         self.time = 0                       # current time of the simulation
-        self.calls = []                     # list of all the calls processed by the simulation so far
-        self.actions = []                   # list of all the actions taken by the elevators so far
+        self.calls = [] if calls is None else calls  # all the calls processed by the simulation so far
+        self.actions = ActionLog() if actions is None else actions  # all the actions taken by the elevators so far
         self.total_people = 0               # total number of people who entered the system
         self.people_turned_away = 0         # total number of people turned away due to a full car
         self.people_served = 0              # total number of people who made a successful end to end journey
@@ -22,64 +51,223 @@ class ElevatorSimulation:
         self.total_time_in_elevator = 0     # total number of seconds spent in an elevator (for successful journeys)
         self.average_time_waiting = 0       # average number of seconds spent waiting (for successful journeys)
         self.average_time_in_elevator = 0   # average number of seconds spent in an elevator (for successful journeys)
+        self.waiting_times = Distribution()      # distribution of seconds spent waiting (for successful journeys)
+        self.times_in_elevator = Distribution()  # distribution of seconds spent in an elevator (for successful journeys)
 
-    def simulate_calls(self, calls):
-        for call in calls:
-            if call.time < self.time:
-                raise ValueError("Cannot process call at time " + str(call.time) + " - it is further in the past than the current simulation time " + str(self.time))
-            self.calls.append(call)
+    # calls can be any iterable in time order, such as a generator, and are only read once
+    # if finish is not set, the simulation stops at the time of the last call rather than running until the elevators
+    # have completed their actions, so more calls can be simulated later as if they had been part of the same set
+    # verbose=False stops the message printed once every elevator has finished
+    def simulate_calls(self, calls, finish=True, verbose=True):
+        # calls made at the same time are sent to the elevator system together
+        for time, calls_at_time in groupby(calls, key=attrgetter("time")):
+            if time < self.time:
+                raise ValueError("Cannot process call at time " + str(time) + " - it is further in the past than the current simulation time " + str(self.time))
+            calls_at_time = list(calls_at_time)
+            if self.keep_calls:
+                for call in calls_at_time:
+                    self.calls.append(call)
             # iterate simulation until time of next event
-            while self.time < call.time:
-                self.iterate()
+            self.advance_to(time)
 
-            # sending the call to the elevator system
-            assigned_elevator = self.elevator_system.ingest_call(call.call_floor, call.destination_floor)
+            # sending the calls to the elevator system
+            self.add_calls(calls_at_time)
 
-            # adding new people to the floor
-            people_to_add = [Person(self.time, call.destination_floor, assigned_elevator) for _ in range(call.people)]
-            self.people_waiting_at_floors[call.call_floor].extend(people_to_add)
-            self.total_people += len(people_to_add)
+        if not finish:
+            return
 
         # after processing all calls, continue to iterate until all elevators are finished
-        while not self.iterate():
-            pass
+        self.run_until_finished()
+
+        if verbose:
+            print("All elevator actions completed")
+
+    # sends a call to the elevator system and adds its people to the call floor at the current time
+    # returns the index of the elevator assigned to the call
+    def add_call(self, call):
+        assigned_elevator = self.elevator_system.ingest_call(call.call_floor, call.destination_floor)
+        self.add_people(call, assigned_elevator)
+        return assigned_elevator
+
+    # sends calls made at the current time to the elevator system as one batch and adds their people to the call floors
+    # returns the index of the elevator assigned to each call
+    def add_calls(self, calls):
+        if len(calls) == 1:
+            return [self.add_call(calls[0])]
+        assigned_elevators = self.elevator_system.ingest_calls([(call.call_floor, call.destination_floor)
+                                                                for call in calls])
+        for call, assigned_elevator in zip(calls, assigned_elevators):
+            self.add_people(call, assigned_elevator)
+        return assigned_elevators
+
+    # adds the people of a call to its call floor, waiting for the elevator assigned to them
+    def add_people(self, call, assigned_elevator):
+        self.active_elevators.add(assigned_elevator)
+
+        # adding new people to the floor as a single group
+        group = PassengerGroup(self.time, call.destination_floor, assigned_elevator, call.people)
+        self.people_waiting_at_floors[call.call_floor].setdefault(assigned_elevator, []).append(group)
+        self.total_people += group.count
+        if self.metrics is not None:
+            self.metrics.call_ingested(self.time)
+
+    # moves the simulation forward until the given time
+    def advance_to(self, time):
+        while self.time < time:
+            if not (self.event_driven and self.skip_ahead(time)):
+                self.iterate()
+
+    # moves the simulation forward until all elevators have completed their actions
+    def run_until_finished(self):
+        while True:
+            if self.event_driven and self.skip_ahead():
+                continue
+            if self.iterate():
+                return
+
+    # jumps forward to the next time step where something other than movement or waiting happens, but not past 'limit'
+    # returns False without changing anything if the next time step needs to be iterated normally
+    def skip_ahead(self, limit=None):
+        steps = None if limit is None else limit - self.time
+        elevators = self.elevators_to_step()
+        for index, elevator in elevators:
+            if self.has_door_activity(index, elevator):
+                return False
+            elevator_steps = elevator.time_until_next_event()
+            if elevator_steps is not None and (steps is None or elevator_steps < steps):
+                steps = elevator_steps
+        if steps is None or steps <= 0:
+            return False
 
-        print("All elevator actions completed")
+        moving = []
+        for index, elevator in elevators:
+            if elevator.time_until_next_event() is not None:
+                start_floor = elevator.current_floor
+                action = elevator.fast_forward(steps)
+                if action is not None:
+                    moving.append((index, action, start_floor, 1 if action == Action.MOVE_UP else -1))
+                    if self.metrics is not None:
+                        self.metrics.elevator_moved(index, self.time, steps)
+
+        # recording in time then elevator order, the same as iterating one time step at a time
+        for step in range(1, steps + 1):
+            for index, action, start_floor, direction in moving:
+                self.actions.record(self.time + step - 1, index, action, start_floor + step * direction)
+        self.time += steps
+        return True
+
+    # whether people will enter or exit the given elevator if it is stationary with its doors open this time step
+    def has_door_activity(self, index, elevator):
+        if elevator.door_state != DoorState.OPEN:
+            return False
+        if elevator.blocked_for == 0 and len(elevator.destinations) > 0:
+            # the elevator will move away or reopen its doors before anyone gets on or off
+            return False
+        return elevator.current_floor in self.people_in_elevators[index] or \
+            index in self.people_waiting_at_floors[elevator.current_floor]
+
+    # number of people currently inside the given elevator
+    def people_in_elevator(self, index):
+        return self.occupants[index]
+
+    # number of people currently waiting at the given floor
+    def people_waiting_at_floor(self, floor):
+        return sum(group.count for groups in self.people_waiting_at_floors[floor].values() for group in groups)
+
+    # returns (index, elevator) for each elevator that needs stepping, in index order
+    def elevators_to_step(self):
+        elevators = self.elevator_system.elevators
+        if not self.skip_idle_elevators:
+            return list(enumerate(elevators))
+        return [(index, elevators[index]) for index in sorted(self.active_elevators)]
+
+    def mark_active(self, index):
+        self.active_elevators.add(index)
+
+    # whether stepping the given elevator would do nothing until it is assigned another call
+    def is_idle(self, index, elevator):
+        return elevator.blocked_for == 0 and len(elevator.destinations) == 0 and \
+            not self.has_door_activity(index, elevator)
 
     def iterate(self):
         finished = True
-        for index, elevator in enumerate(self.elevator_system.elevators):
+        for index, elevator in self.elevators_to_step():
             action = elevator.iterate()
             if action:
                 # at least one elevator is still performing actions, so we're not finished yet
                 finished = False
                 if action != Action.BLOCKED:
-                    self.actions.append(ElevatorAction(self.time, index, action,elevator.current_floor))
-            if elevator.door_state == DoorState.OPEN :
-
-                # manage people exiting
-                people_to_exit = [person for person in self.people_in_elevators[index] if person.target_floor == elevator.current_floor]
-                for person in people_to_exit:
-                    self.people_served += 1
-                    self.total_waiting_time += person.entrance_time - person.call_time
-                    self.average_time_waiting = self.total_waiting_time / self.people_served
-                    self.total_time_in_elevator += self.time - person.entrance_time
-                    self.average_time_in_elevator = self.total_time_in_elevator / self.people_served
-                self.people_in_elevators[index] = [person for person in self.people_in_elevators[index] if person.target_floor != elevator.current_floor]
-
-                # manage people entering
-                people_waiting = [person for person in self.people_waiting_at_floors[elevator.current_floor] if person.assigned_elevator == index]
-                remaining_capacity = elevator.capacity - len(self.people_in_elevators[index])
-                people_to_enter = people_waiting[:remaining_capacity]
-                self.people_turned_away += len(people_waiting) - len(people_to_enter)
-                for person in people_to_enter:
-                    person.entrance_time = self.time
-                self.people_in_elevators[index].extend(people_to_enter)
-                self.people_waiting_at_floors[elevator.current_floor] = [p for p in self.people_waiting_at_floors[elevator.current_floor] if p.assigned_elevator != index]
+                    self.actions.record(self.time, index, action, elevator.current_floor)
+                    if self.metrics is not None:
+                        self.metrics.action(self.time, index, action)
+            if elevator.door_state == DoorState.OPEN:
+                self.exchange_people(index, elevator)
+            if self.skip_idle_elevators and self.is_idle(index, elevator):
+                self.active_elevators.discard(index)
 
         self.time += 1
         return finished
 
+    # lets people off the given elevator at its current floor, then lets on the people waiting there for it
+    def exchange_people(self, index, elevator):
+        self.let_people_exit(index, elevator)
+        self.let_people_enter(index, elevator)
+
+    # people inside the elevator going to its current floor get off, completing their journeys
+    def let_people_exit(self, index, elevator):
+        groups_to_exit = self.people_in_elevators[index].pop(elevator.current_floor, [])
+        for group in groups_to_exit:
+            self.occupants[index] -= group.count
+            self.people_served += group.count
+            self.total_waiting_time += group.count * (group.entrance_time - group.call_time)
+            self.total_time_in_elevator += group.count * (self.time - group.entrance_time)
+            self.waiting_times.add(group.entrance_time - group.call_time, group.count)
+            self.times_in_elevator.add(self.time - group.entrance_time, group.count)
+            if self.metrics is not None:
+                self.metrics.people_served(self.time, group.count)
+        if groups_to_exit:
+            self.average_time_waiting = self.total_waiting_time / self.people_served
+            self.average_time_in_elevator = self.total_time_in_elevator / self.people_served
+
+    # people waiting at the current floor for the elevator get on, splitting up the first group that doesn't fit and
+    # turning away the rest
+    def let_people_enter(self, index, elevator):
+        groups_waiting = self.people_waiting_at_floors[elevator.current_floor].pop(index, [])
+        remaining_capacity = elevator.capacity - self.occupants[index]
+        for group in groups_waiting:
+            if group.count > remaining_capacity:
+                self.people_turned_away += group.count - remaining_capacity
+                if self.metrics is not None:
+                    self.metrics.people_turned_away(self.time, group.count - remaining_capacity)
+                if remaining_capacity <= 0:
+                    continue
+                group = group.split(remaining_capacity)
+            remaining_capacity -= group.count
+            self.occupants[index] += group.count
+            group.entrance_time = self.time
+            self.people_in_elevators[index].setdefault(group.target_floor, []).append(group)
+            if self.metrics is not None:
+                self.metrics.people_boarded(self.time, group.count, self.time - group.call_time)
+
+    # returns the statistics gathered so far as a dictionary
+    def statistics(self):
+        return {
+            "time": self.time,
+            "total_people": self.total_people,
+            "people_served": self.people_served,
+            "people_turned_away": self.people_turned_away,
+            "total_waiting_time": self.total_waiting_time,
+            "total_time_in_elevator": self.total_time_in_elevator,
+            "average_time_waiting": self.average_time_waiting,
+            "average_time_in_elevator": self.average_time_in_elevator,
+            "waiting_time_p50": self.waiting_times.percentile(50),
+            "waiting_time_p95": self.waiting_times.percentile(95),
+            "waiting_time_p99": self.waiting_times.percentile(99),
+            "time_in_elevator_p50": self.times_in_elevator.percentile(50),
+            "time_in_elevator_p95": self.times_in_elevator.percentile(95),
+            "time_in_elevator_p99": self.times_in_elevator.percentile(99)
+        }
+
     def print_state(self):
         print("Calls:")
         for c in self.calls:
@@ -95,21 +283,32 @@ class ElevatorSimulation:
         print("Total people = " + str(self.total_people))
         print("People served = " + str(self.people_served))
         print("People turned away due to full car = " + str(self.people_turned_away))
-        print("People still waiting = " + str(sum([len(p) for p in self.people_waiting_at_floors])))
-        print("People still in elevators = " + str(sum([len(p) for p in self.people_in_elevators])))
+        print("People still waiting = " + str(sum([self.people_waiting_at_floor(f) for f in range(len(self.people_waiting_at_floors))])))
+        print("People still in elevators = " + str(sum([self.people_in_elevator(i) for i in range(len(self.people_in_elevators))])))
         print("Total wait time = " + str(self.total_waiting_time))
         print("Total time inside elevators = " + str(self.total_time_in_elevator))
         print("Average wait time = " + str(self.average_time_waiting))
         print("Average time inside elevators = " + str(self.average_time_in_elevator))
+        print("95th/99th percentile wait time = " + str(self.waiting_times.percentile(95)) + " / " +
+              str(self.waiting_times.percentile(99)))
+        print("95th/99th percentile time inside elevators = " + str(self.times_in_elevator.percentile(95)) + " / " +
+              str(self.times_in_elevator.percentile(99)))
 
     def reset_state(self):
-        self.people_waiting_at_floors = [[] for _ in range(self.elevator_system.total_floors)]
-        self.people_in_elevators = [[] for _ in self.elevator_system.elevators]
+        self.people_waiting_at_floors = [{} for _ in range(self.elevator_system.total_floors)]
+        self.people_in_elevators = [{} for _ in self.elevator_system.elevators]
+        self.occupants = [0 for _ in self.elevator_system.elevators]
+        self.active_elevators = set(range(len(self.elevator_system.elevators)))
 
         self.time = 0
 
-        self.calls = []
-        self.actions = []
+        # a list of calls is replaced rather than emptied, as it may belong to the caller, while a writer such as a
+        # CallWriter (see exporters.py) starts its file again
+        if isinstance(self.calls, list):
+            self.calls = []
+        else:
+            self.calls.clear()
+        self.actions.clear()
         self.total_people = 0
         self.people_turned_away = 0
         self.people_served = 0
@@ -117,6 +316,10 @@ class ElevatorSimulation:
         self.total_time_in_elevator = 0
         self.average_time_in_elevator = 0
         self.average_time_waiting = 0
+        self.waiting_times = Distribution()
+        self.times_in_elevator = Distribution()
+        if self.metrics is not None:
+            self.metrics.clear()
 
 
 
@@ -5,8 +5,18 @@ class ElevatorSystem:
         self.total_floors = total_floors
 
     def ingest_call(self, call_floor, destination_floor):
+        self.check_floors(call_floor, destination_floor)
+        return self.behaviour.ingest_call(self.elevators, call_floor, destination_floor)
+
+    # sends every call made at the same time to the behaviour together, as a list of (call floor, destination floor)
+    # returns the index of the elevator assigned to each call
+    def ingest_calls(self, calls):
+        for call_floor, destination_floor in calls:
+            self.check_floors(call_floor, destination_floor)
+        return self.behaviour.ingest_calls(self.elevators, calls)
+
+    def check_floors(self, call_floor, destination_floor):
         if call_floor >= self.total_floors or call_floor < 0:
             raise ValueError("Made a call from floor " + str(call_floor) + " which doesn't exist")
         if destination_floor >= self.total_floors or destination_floor < 0:
             raise ValueError("Made a call to floor " + str(destination_floor) + " which doesn't exist")
-        return self.behaviour.ingest_call(self.elevators, call_floor, destination_floor)
\ No newline at end of file
@@ -0,0 +1,251 @@
+import gzip
+import json
+import struct
+import sys
+from array import array
+
+from actionlog import ACTIONS_BY_CODE
+
+FORMATS = ("csv", "jsonl", "binary")
+
+# binary tables start with this, a column count, then the name and array type code of each column
+# the columns follow in chunks, each a row count and then every column's values, like an action file
+TABLE_MAGIC = b"ELEVTABLE\x01"
+COUNT = struct.Struct("<H")
+CHUNK_HEADER = struct.Struct("<I")
+
+ACTION_COLUMNS = (("time", "q"), ("elevator", "i"), ("action", "b"), ("floor", "i"))
+CALL_COLUMNS = (("time", "q"), ("call_floor", "i"), ("destination_floor", "i"), ("people", "i"))
+# the keys of ElevatorSimulation.statistics, with missing percentiles written as NaN in binary tables
+STATISTICS_COLUMNS = (
+    ("time", "q"),
+    ("total_people", "q"),
+    ("people_served", "q"),
+    ("people_turned_away", "q"),
+    ("total_waiting_time", "q"),
+    ("total_time_in_elevator", "q"),
+    ("average_time_waiting", "d"),
+    ("average_time_in_elevator", "d"),
+    ("waiting_time_p50", "d"),
+    ("waiting_time_p95", "d"),
+    ("waiting_time_p99", "d"),
+    ("time_in_elevator_p50", "d"),
+    ("time_in_elevator_p95", "d"),
+    ("time_in_elevator_p99", "d")
+)
+
+
+# opens a file for writing in large blocks, compressed with gzip if asked
+def open_output(path, compress=False):
+    if compress:
+        return gzip.open(path, "wb", compresslevel=6)
+    return open(path, "wb", buffering=1 << 20)
+
+
+# opens a file written by open_output, whether it was compressed or not
+def open_input(path):
+    with open(path, "rb") as file:
+        compressed = file.read(2) == b"\x1f\x8b"
+    return gzip.open(path, "rb") if compressed else open(path, "rb")
+
+
+# Writes rows of numbers to a CSV, JSON Lines or binary columnar file, holding them in columns until a chunk is full
+# and then writing the whole chunk at once
+# 'labels' maps a column name to a {value: text} dictionary, for columns written as text in CSV and JSON Lines, such as
+# action names, but kept as numbers in binary tables
+class TableWriter:
+    def __init__(self, path, columns, format="csv", compress=False, chunk_size=65536, labels=None):
+        if format not in FORMATS:
+            raise ValueError("Unknown output format " + str(format) + ", expected one of " + ", ".join(FORMATS))
+        self.path = path
+        self.columns = columns
+        self.format = format
+        self.compress = compress
+        self.chunk_size = chunk_size
+        self.labels = labels or {}
+        self.rows = 0
+        self.open()
+
+    def open(self):
+        self.file = open_output(self.path, self.compress)
+        self.buffer = [array(type_code) for _, type_code in self.columns]
+        if self.format == "csv":
+            self.file.write((",".join(name for name, _ in self.columns) + "\n").encode())
+        elif self.format == "binary":
+            self.file.write(TABLE_MAGIC + COUNT.pack(len(self.columns)))
+            for name, type_code in self.columns:
+                self.file.write(bytes([len(name)]) + name.encode() + type_code.encode())
+
+    def write_row(self, *values):
+        for column, value in zip(self.buffer, values):
+            column.append(value)
+        self.rows += 1
+        if len(self.buffer[0]) >= self.chunk_size:
+            self.write_chunk()
+
+    # writes whole columns of values at once, a chunk at a time, which is much faster than writing them row by row
+    def write_columns(self, *columns):
+        self.write_chunk()
+        rows = len(columns[0])
+        for start in range(0, rows, self.chunk_size):
+            self.buffer = [array(type_code, column[start:start + self.chunk_size])
+                           for (_, type_code), column in zip(self.columns, columns)]
+            self.rows += len(self.buffer[0])
+            self.write_chunk()
+
+    def write_chunk(self):
+        if len(self.buffer[0]) == 0:
+            return
+        if self.format == "binary":
+            self.file.write(CHUNK_HEADER.pack(len(self.buffer[0])))
+            for column in self.buffer:
+                if sys.byteorder == "big":
+                    column.byteswap()
+                self.file.write(column.tobytes())
+        else:
+            texts = [self.column_text(name, type_code, column)
+                     for (name, type_code), column in zip(self.columns, self.buffer)]
+            if self.format == "csv":
+                line = ",".join(["%s"] * len(self.columns))
+            else:
+                line = "{" + ", ".join('"' + name + '": %s' for name, _ in self.columns) + "}"
+            self.file.write("".join([line % row + "\n" for row in zip(*texts)]).encode())
+        self.buffer = [array(type_code) for _, type_code in self.columns]
+
+    # the values of a column as text, as they appear in CSV or JSON
+    def column_text(self, name, type_code, column):
+        if name in self.labels:
+            labels = self.labels[name]
+            if self.format == "csv":
+                return [labels[value] for value in column]
+            return [json.dumps(labels[value]) for value in column]
+        if type_code == "d":
+            missing = "" if self.format == "csv" else "null"
+            return [repr(value) if value == value else missing for value in column]
+        return list(map(str, column))
+
+    def flush(self):
+        self.write_chunk()
+        self.file.flush()
+
+    def close(self):
+        self.write_chunk()
+        self.file.close()
+
+    # throws away everything written so far and starts the file again
+    def clear(self):
+        self.file.close()
+        self.rows = 0
+        self.open()
+
+    def __len__(self):
+        return self.rows
+
+    # copies would all be writing to the same file
+    def __getstate__(self):
+        raise ValueError("Cannot copy an exporter writing to " + str(self.path))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+# Writes actions to a file as they happen, for use as a simulation's action log
+class ActionWriter(TableWriter):
+    def __init__(self, path, format="csv", compress=False, chunk_size=65536):
+        labels = {"action": {code: action.name for code, action in ACTIONS_BY_CODE.items()}}
+        super().__init__(path, ACTION_COLUMNS, format, compress, chunk_size, labels)
+
+    def record(self, time, elevator_number, action, floor):
+        times, elevator_numbers, action_codes, floors = self.buffer
+        times.append(time)
+        elevator_numbers.append(elevator_number)
+        action_codes.append(action.value)
+        floors.append(floor)
+        self.rows += 1
+        if len(times) >= self.chunk_size:
+            self.write_chunk()
+
+    def append(self, elevator_action):
+        self.record(elevator_action.time, elevator_action.elevator_number, elevator_action.action, elevator_action.floor)
+
+    # records many actions at once, see ActionLog.extend
+    def extend(self, times, elevator_numbers, action_codes, floors):
+        for column, values in zip(self.buffer, (times, elevator_numbers, action_codes, floors)):
+            column.extend(values)
+        self.rows += len(times)
+        if len(self.buffer[0]) >= self.chunk_size:
+            self.write_chunk()
+
+    # actions are not kept in memory
+    def __iter__(self):
+        return iter(())
+
+
+# Writes calls to a file as they are processed, for use as a simulation's 'calls'
+class CallWriter(TableWriter):
+    def __init__(self, path, format="csv", compress=False, chunk_size=65536):
+        super().__init__(path, CALL_COLUMNS, format, compress, chunk_size)
+
+    def append(self, call):
+        self.write_row(call.time, call.call_floor, call.destination_floor, call.people)
+
+    # calls are not kept in memory
+    def __iter__(self):
+        return iter(())
+
+
+# Writes the statistics of a simulation to a file, one row each time they are written, e.g. to follow them over a run
+class StatisticsWriter(TableWriter):
+    def __init__(self, path, format="csv", compress=False):
+        super().__init__(path, STATISTICS_COLUMNS, format, compress, chunk_size=1)
+
+    def write(self, statistics):
+        self.write_row(*[float("nan") if statistics[name] is None else statistics[name]
+                         for name, _ in STATISTICS_COLUMNS])
+
+
+# writes a single set of statistics to a file
+def write_statistics(statistics, path, format="csv", compress=False):
+    with StatisticsWriter(path, format, compress) as writer:
+        writer.write(statistics)
+
+
+# writes the actions of an ActionLog to a file in one go
+def export_actions(actions, path, format="csv", compress=False):
+    with ActionWriter(path, format, compress) as writer:
+        writer.write_columns(actions.times, actions.elevator_numbers, actions.action_codes, actions.floors)
+
+
+# writes calls to a file in one go
+def export_calls(calls, path, format="csv", compress=False):
+    with CallWriter(path, format, compress) as writer:
+        for call in calls:
+            writer.append(call)
+
+
+# reads a binary table back into a dictionary of column name -> array
+def read_table(path):
+    with open_input(path) as file:
+        if file.read(len(TABLE_MAGIC)) != TABLE_MAGIC:
+            raise ValueError(str(path) + " is not a binary table")
+        (column_count,) = COUNT.unpack(file.read(COUNT.size))
+        columns = []
+        for _ in range(column_count):
+            name = file.read(file.read(1)[0]).decode()
+            columns.append((name, file.read(1).decode()))
+        table = {name: array(type_code) for name, type_code in columns}
+        while True:
+            header = file.read(CHUNK_HEADER.size)
+            if not header:
+                break
+            (rows,) = CHUNK_HEADER.unpack(header)
+            for name, _ in columns:
+                chunk = array(table[name].typecode)
+                chunk.frombytes(file.read(rows * chunk.itemsize))
+                if sys.byteorder == "big":
+                    chunk.byteswap()
+                table[name].extend(chunk)
+    return table
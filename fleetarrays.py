@@ -0,0 +1,111 @@
+import numpy as np
+
+from destinationqueue import ObservedDestinationQueue
+from elevator import DoorState, Elevator
+from elevatoraction import Action, ActionTimings
+
+NO_DESTINATION = -1
+NO_ACTION = 0
+
+
+# The state of many elevators held in NumPy arrays, so every elevator can be moved forward a time step in one go
+# Arrays can have any shape, e.g. (elevators,) for one large fleet or (replications, elevators) for many copies of
+# the same fleet. The elevators themselves are ArrayElevator objects that read and write their place in the arrays.
+class FleetArrays:
+    def __init__(self, shape, capacity=10, current_floor=0):
+        self.shape = shape
+        self.current_floor = np.full(shape, current_floor, dtype=np.int64)
+        self.blocked_for = np.zeros(shape, dtype=np.int64)
+        self.door_open = np.zeros(shape, dtype=bool)
+        self.next_destination = np.full(shape, NO_DESTINATION, dtype=np.int64)
+
+        # positions of elevators whose destinations have changed since next_destination was last updated
+        self.changed_destinations = set()
+
+        self.elevators = np.empty(shape, dtype=object)
+        for position in np.ndindex(*self.current_floor.shape):
+            self.elevators[position] = ArrayElevator(self, position, capacity)
+
+    # moves every elevator forward one time step, following the same rules as Elevator.iterate
+    # returns an array of the action value taken by each elevator, or NO_ACTION for elevators with nowhere to go
+    def step(self):
+        self.update_next_destinations()
+
+        blocked = self.blocked_for > 0
+        self.blocked_for[blocked] -= 1
+
+        active = ~blocked & (self.next_destination != NO_DESTINATION)
+        arrived = active & (self.current_floor == self.next_destination)
+        moving_up = active & (self.current_floor < self.next_destination)
+        moving_down = active & (self.current_floor > self.next_destination)
+        lobby = arrived & (self.current_floor == 0)
+
+        self.door_open[arrived] = True
+        self.door_open[moving_up | moving_down] = False
+        self.blocked_for[arrived] = ActionTimings[Action.OPEN_DOORS] - 1
+        self.blocked_for[lobby] = ActionTimings[Action.OPEN_DOORS_LOBBY] - 1
+        self.current_floor += moving_up
+        self.current_floor -= moving_down
+
+        actions = np.full(self.current_floor.shape, NO_ACTION, dtype=np.int8)
+        actions[blocked] = Action.BLOCKED.value
+        actions[moving_up] = Action.MOVE_UP.value
+        actions[moving_down] = Action.MOVE_DOWN.value
+        actions[arrived] = Action.OPEN_DOORS.value
+        actions[lobby] = Action.OPEN_DOORS_LOBBY.value
+
+        # only the elevators that opened their doors need any work done one at a time
+        for position in zip(*np.nonzero(arrived)):
+            self.elevators[position].destinations.popleft()
+        return actions
+
+    # copies the first destination of any elevator whose destinations changed into next_destination
+    def update_next_destinations(self):
+        for position in self.changed_destinations:
+            destinations = self.elevators[position].destinations
+            self.next_destination[position] = destinations[0] if len(destinations) > 0 else NO_DESTINATION
+        self.changed_destinations.clear()
+
+
+# An elevator whose state lives in a FleetArrays, so it can be used by behaviours like any other elevator
+class ArrayElevator(Elevator):
+    def __init__(self, fleet, position, capacity=10):
+        self.fleet = fleet
+        self.position = position
+        super().__init__(capacity=capacity, current_floor=int(fleet.current_floor[position]))
+
+    @property
+    def current_floor(self):
+        return int(self.fleet.current_floor[self.position])
+
+    @current_floor.setter
+    def current_floor(self, floor):
+        self.fleet.current_floor[self.position] = floor
+
+    @property
+    def blocked_for(self):
+        return int(self.fleet.blocked_for[self.position])
+
+    @blocked_for.setter
+    def blocked_for(self, steps):
+        self.fleet.blocked_for[self.position] = steps
+
+    @property
+    def door_state(self):
+        return DoorState.OPEN if self.fleet.door_open[self.position] else DoorState.CLOSED
+
+    @door_state.setter
+    def door_state(self, state):
+        self.fleet.door_open[self.position] = state == DoorState.OPEN
+
+    @property
+    def destinations(self):
+        return self._destinations
+
+    @destinations.setter
+    def destinations(self, floors):
+        self._destinations = ObservedDestinationQueue(floors, listener=self.destinations_changed)
+        self.destinations_changed()
+
+    def destinations_changed(self):
+        self.fleet.changed_destinations.add(self.position)
@@ -0,0 +1,197 @@
+from array import array
+
+from elevatoraction import Action
+from exporters import TableWriter
+
+# name -> array type code of each series kept for the whole system
+SERIES = (
+    ("calls", "q"),               # calls ingested
+    ("people_served", "q"),       # people who got off at their destination
+    ("people_turned_away", "q"),  # people turned away due to a full car
+    ("people_boarded", "q"),      # people who got on, whose waiting times make up the wait series
+    ("total_wait", "q"),          # seconds waited by the people who got on
+    ("max_wait", "q"),            # longest wait of the people who got on
+    ("person_seconds", "q")       # seconds spent inside elevators by everyone, for the occupancy
+)
+# name -> array type code of each series kept for every elevator
+ELEVATOR_SERIES = (
+    ("moves", "q"),
+    ("door_stops", "q")
+)
+MOVE_CODES = (Action.MOVE_UP.value, Action.MOVE_DOWN.value)
+DOOR_STOP_CODES = (Action.OPEN_DOORS.value, Action.OPEN_DOORS_LOBBY.value)
+
+
+# Statistics of a simulation for each window of time, e.g. each minute, so peaks aren't hidden by the totals of a day
+#
+# Only the latest 'windows' windows are kept, in preallocated arrays used as ring buffers, so memory stays the same
+# however long the simulation runs. Pass to ElevatorSimulation as 'metrics' and it is updated as things happen, so the
+# series can be read at any point during the run without going through the actions.
+class WindowedMetrics:
+    def __init__(self, elevators, window=60, windows=1440):
+        if window <= 0 or windows <= 0:
+            raise ValueError("Metrics need a positive window length and count, not " + str(window) + " and " +
+                             str(windows))
+        self.elevators = elevators
+        self.window = window
+        self.windows = windows
+        self.series_arrays = {name: array(type_code, [0]) * windows for name, type_code in SERIES}
+        self.elevator_arrays = {name: array(type_code, [0]) * (windows * elevators)
+                                for name, type_code in ELEVATOR_SERIES}
+        self.slot_windows = array("q", [-1]) * windows  # the window number held in each slot
+        self.latest = -1                                 # the latest window number written to
+
+        self.occupancy = 0                               # people inside elevators right now
+        self.occupancy_time = 0                          # time person_seconds has been added up to
+
+    # forgets every window, e.g. when the simulation is reset
+    def clear(self):
+        self.__init__(self.elevators, self.window, self.windows)
+
+    # returns the slot holding the window that contains 'time', clearing slots for any new windows on the way, or
+    # None if that window is too old to still be kept
+    def slot(self, time):
+        number = time // self.window
+        if number > self.latest:
+            for new_number in range(max(self.latest + 1, number - self.windows + 1), number + 1):
+                self.clear_slot(new_number)
+            self.latest = number
+        elif number <= self.latest - self.windows:
+            return None
+        return number % self.windows
+
+    def clear_slot(self, number):
+        slot = number % self.windows
+        self.slot_windows[slot] = number
+        for values in self.series_arrays.values():
+            values[slot] = 0
+        for values in self.elevator_arrays.values():
+            start = slot * self.elevators
+            values[start:start + self.elevators] = array(values.typecode, [0]) * self.elevators
+
+    def add(self, name, time, amount):
+        slot = self.slot(time)
+        if slot is not None:
+            self.series_arrays[name][slot] += amount
+
+    def call_ingested(self, time):
+        self.add("calls", time, 1)
+
+    def people_boarded(self, time, count, waiting_time):
+        self.occupancy_changed(time, count)
+        slot = self.slot(time)
+        if slot is not None:
+            self.series_arrays["people_boarded"][slot] += count
+            self.series_arrays["total_wait"][slot] += count * waiting_time
+            if waiting_time > self.series_arrays["max_wait"][slot]:
+                self.series_arrays["max_wait"][slot] = waiting_time
+
+    def people_served(self, time, count):
+        self.occupancy_changed(time, -count)
+        self.add("people_served", time, count)
+
+    def people_turned_away(self, time, count):
+        self.add("people_turned_away", time, count)
+
+    # adds up the time spent inside elevators until 'time', then changes the number of people inside
+    def occupancy_changed(self, time, change):
+        self.add_person_seconds(time)
+        self.occupancy += change
+
+    def add_person_seconds(self, time):
+        while self.occupancy_time < time:
+            window_end = min((self.occupancy_time // self.window + 1) * self.window, time)
+            if self.occupancy:
+                self.add("person_seconds", self.occupancy_time, self.occupancy * (window_end - self.occupancy_time))
+            self.occupancy_time = window_end
+
+    def action(self, time, index, action):
+        if action == Action.MOVE_UP or action == Action.MOVE_DOWN:
+            self.elevator_moved(index, time, 1)
+        elif action == Action.OPEN_DOORS or action == Action.OPEN_DOORS_LOBBY:
+            slot = self.slot(time)
+            if slot is not None:
+                self.elevator_arrays["door_stops"][slot * self.elevators + index] += 1
+
+    # counts the actions of several elevators in the same time step, given as elevator indices and action codes
+    def step_actions(self, time, indices, action_codes):
+        slot = self.slot(time)
+        if slot is None:
+            return
+        start = slot * self.elevators
+        moves = self.elevator_arrays["moves"]
+        door_stops = self.elevator_arrays["door_stops"]
+        for index, action_code in zip(indices, action_codes):
+            if action_code in MOVE_CODES:
+                moves[start + index] += 1
+            elif action_code in DOOR_STOP_CODES:
+                door_stops[start + index] += 1
+
+    # counts an elevator moving on every time step from 'time' to time + steps - 1
+    def elevator_moved(self, index, time, steps):
+        end = time + steps
+        while time < end:
+            window_end = min((time // self.window + 1) * self.window, end)
+            slot = self.slot(time)
+            if slot is not None:
+                self.elevator_arrays["moves"][slot * self.elevators + index] += window_end - time
+            time = window_end
+
+    # the window numbers still kept, oldest first
+    def window_numbers(self):
+        return list(range(max(0, self.latest - self.windows + 1), self.latest + 1))
+
+    # moves on to the window containing the current time 'now', so windows without any events yet are included, and
+    # adds up the time spent inside elevators so far
+    def catch_up(self, now):
+        self.slot(now)
+        self.add_person_seconds(now)
+
+    # returns [(window start time, value)] for each window kept, oldest first
+    # as well as the names in SERIES, the series can be "mean_wait" or "mean_occupancy" (the average number of people
+    # inside each elevator), and 'now' can be given during a run to include everything up to the current time
+    def series(self, name, now=None):
+        if now is not None:
+            self.catch_up(now)
+        result = []
+        for number in self.window_numbers():
+            slot = number % self.windows
+            if name == "mean_wait":
+                boarded = self.series_arrays["people_boarded"][slot]
+                value = self.series_arrays["total_wait"][slot] / boarded if boarded else 0
+            elif name == "mean_occupancy":
+                value = self.series_arrays["person_seconds"][slot] / (self.window * self.elevators) \
+                    if self.elevators else 0
+            else:
+                value = self.series_arrays[name][slot]
+            result.append((number * self.window, value))
+        return result
+
+    # returns [(window start time, value)] of one of ELEVATOR_SERIES for the given elevator
+    def elevator_series(self, name, index, now=None):
+        if now is not None:
+            self.catch_up(now)
+        values = self.elevator_arrays[name]
+        return [(number * self.window, values[(number % self.windows) * self.elevators + index])
+                for number in self.window_numbers()]
+
+    # writes every window kept to a CSV, JSON Lines or binary file (see exporters.py)
+    def export(self, path, format="csv", compress=False, now=None):
+        names = ["calls", "people_served", "people_turned_away", "mean_wait", "max_wait", "mean_occupancy"]
+        types = {"mean_wait": "d", "mean_occupancy": "d"}
+        columns = [self.series(name, now) for name in names]
+        with TableWriter(path, [("window_start", "q")] + [(name, types.get(name, "q")) for name in names], format,
+                         compress) as writer:
+            writer.write_columns([start for start, _ in columns[0]], *[[value for _, value in c] for c in columns])
+
+    # writes the moves and door stops of every elevator in every window kept, one row per elevator per window
+    def export_elevators(self, path, format="csv", compress=False, now=None):
+        if now is not None:
+            self.catch_up(now)
+        columns = (("window_start", "q"), ("elevator", "i"), ("moves", "q"), ("door_stops", "q"))
+        with TableWriter(path, columns, format, compress) as writer:
+            for number in self.window_numbers():
+                start = (number % self.windows) * self.elevators
+                writer.write_columns([number * self.window] * self.elevators, range(self.elevators),
+                                     self.elevator_arrays["moves"][start:start + self.elevators],
+                                     self.elevator_arrays["door_stops"][start:start + self.elevators])
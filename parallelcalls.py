@@ -0,0 +1,81 @@
+import hashlib
+import os
+import random
+from collections import deque
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from elevatorcall import ElevatorCall, stream_calls
+
+# chunks generated ahead of the caller for each process
+CHUNKS_AHEAD = 2
+
+
+# returns the seed for one chunk of calls, derived from the root seed by hashing so chunks next to each other get
+# unrelated random streams, and so the seed doesn't depend on the process or on PYTHONHASHSEED
+def chunk_seed(root_seed, chunk_index):
+    digest = hashlib.sha256((str(root_seed) + ":" + str(chunk_index)).encode()).digest()
+    return int.from_bytes(digest, "little")
+
+
+# returns the (start, end) times of each chunk, every chunk 'chunk_duration' seconds long apart from maybe the last
+def chunk_times(start_time, end_time, chunk_duration):
+    if chunk_duration <= 0:
+        raise ValueError("Chunks must have a positive duration, not " + str(chunk_duration))
+    return ((start, min(start + chunk_duration, end_time)) for start in range(start_time, end_time, chunk_duration))
+
+
+# generates the calls of one chunk from its own random.Random, returned as columns of times, call floors, destination
+# floors and people, which are much quicker to send back from a worker process than ElevatorCall objects
+def generate_chunk(start_time, end_time, floors, seed):
+    columns = (array("q"), array("i"), array("i"), array("i"))
+    times, call_floors, destination_floors, people = columns
+    for call in stream_calls(start_time, end_time, floors, random.Random(seed)):
+        times.append(call.time)
+        call_floors.append(call.call_floor)
+        destination_floors.append(call.destination_floor)
+        people.append(call.people)
+    return columns
+
+
+def generate_chunk_arguments(arguments):
+    return generate_chunk(*arguments)
+
+
+# lazily generates random elevator calls in time order, like elevatorcall.stream_calls, with the time range split into
+# chunks of 'chunk_duration' seconds that are generated in parallel across a pool of processes
+# Each chunk has its own random stream seeded from 'seed' and the chunk's index, so the calls only depend on the seed,
+# the times and the chunk duration, never on the number of processes. processes=1 generates everything in the current
+# process.
+def stream_chunked_calls(start_time, end_time, floors, seed, chunk_duration=3600, processes=None):
+    arguments = ((start, end, floors, chunk_seed(seed, index))
+                 for index, (start, end) in enumerate(chunk_times(start_time, end_time, chunk_duration)))
+    if processes == 1:
+        yield from chunk_calls(map(generate_chunk_arguments, arguments))
+        return
+    workers = processes or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from chunk_calls(chunks_in_order(executor, arguments, workers * CHUNKS_AHEAD))
+
+
+# returns the results of each chunk in order, however the processes finish, only keeping 'ahead' chunks in flight so a
+# long time range doesn't fill memory with chunks the caller hasn't got to yet
+def chunks_in_order(executor, arguments, ahead):
+    pending = deque()
+    for argument in arguments:
+        pending.append(executor.submit(generate_chunk, *argument))
+        if len(pending) >= ahead:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def chunk_calls(chunks):
+    for times, call_floors, destination_floors, people in chunks:
+        for call in zip(times, call_floors, destination_floors, people):
+            yield ElevatorCall(*call)
+
+
+# generates a list of random elevator calls in parallel chunks, see stream_chunked_calls
+def generate_chunked_calls(start_time, end_time, floors, seed, chunk_duration=3600, processes=None):
+    return list(stream_chunked_calls(start_time, end_time, floors, seed, chunk_duration, processes))
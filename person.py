@@ -1,4 +1,7 @@
 class Person:
+    # a single person counts as a group of one wherever people are counted in groups
+    count = 1
+
     def __init__(self, call_time, target_floor, assigned_elevator):
         self.call_time = call_time
         self.entrance_time = None
@@ -10,3 +13,30 @@ class Person:
         return "call_time - " + str(self.call_time) + \
                ", target_floor - " + str(self.target_floor) + \
                ", assigned_elevator - " + str(self.assigned_elevator)
+
+
+# A group of people travelling together from the same call, stored as a single object with a head count
+class PassengerGroup:
+    __slots__ = ("call_time", "entrance_time", "target_floor", "assigned_elevator", "count")
+
+    def __init__(self, call_time, target_floor, assigned_elevator, count):
+        self.call_time = call_time
+        self.entrance_time = None
+        self.target_floor = target_floor
+        self.assigned_elevator = assigned_elevator
+        self.count = count
+
+    # takes the given number of people out of this group and returns them as a new group
+    def split(self, count):
+        if count > self.count:
+            raise ValueError("Cannot split " + str(count) + " people from a group of " + str(self.count))
+        self.count -= count
+        group = PassengerGroup(self.call_time, self.target_floor, self.assigned_elevator, count)
+        group.entrance_time = self.entrance_time
+        return group
+
+    def __repr__(self):
+        return "call_time - " + str(self.call_time) + \
+               ", target_floor - " + str(self.target_floor) + \
+               ", assigned_elevator - " + str(self.assigned_elevator) + \
+               ", count - " + str(self.count)
@@ -0,0 +1,200 @@
+import time
+
+from distributions import Histogram
+from elevatoraction import Action
+
+# phase name -> (attribute of the simulation holding the object, method name)
+# the object is the simulation itself when the attribute is None
+PHASES = {
+    "simulate_calls": (None, "simulate_calls"),
+    "advance_to": (None, "advance_to"),
+    "run_until_finished": (None, "run_until_finished"),
+    "skip_ahead": (None, "skip_ahead"),
+    "iterate": (None, "iterate"),
+    "exit": (None, "let_people_exit"),
+    "board": (None, "let_people_enter"),
+    "record_action": ("actions", "record"),
+    "record_actions": ("actions", "extend"),
+    "ingest_call": ("elevator_system", "ingest_call"),
+    "ingest_calls": ("elevator_system", "ingest_calls")
+}
+
+# elevator methods timed as the "elevator_step" phase
+ELEVATOR_METHODS = ("iterate", "fast_forward")
+
+DOOR_OPENING_CODES = (Action.OPEN_DOORS.value, Action.OPEN_DOORS_LOBBY.value)
+
+
+# Counts and times the phases of a simulation: elevator stepping, people exiting and boarding, action logging and
+# dispatching calls to the behaviour
+#
+# Attaching wraps the methods of that one simulation and its elevators, system and action log, and detaching puts the
+# originals back, so simulations that aren't being profiled run exactly the same code as before. Time is also kept for
+# each stack of phases, e.g. "simulate_calls;advance_to;iterate;exit", which can be written out as folded stacks for
+# flame graph tools.
+class Profiler:
+    def __init__(self, clock=time.perf_counter_ns):
+        self.clock = clock
+        self.counts = {}           # phase -> number of times it ran
+        self.times = {}            # phase -> total nanoseconds spent in it, including any phases inside it
+        self.stack_times = {}      # stack of phases -> nanoseconds spent in the innermost phase only
+        self.calls_per_behaviour = {}
+        self.door_openings = 0
+        self.people_processed = 0
+        self.people_per_door_opening = Histogram(bucket_width=1, bucket_count=50)
+
+        self.stack = []            # [phase, start time, time spent in phases inside it] for each running phase
+        self.people_since_opening = {}  # elevator index -> people that got on or off since its doors last opened
+        self.wrapped = []          # (object, method name, whether it had its own attribute, previous attribute)
+
+    # starts profiling the given simulation, which can be detached later
+    def attach(self, simulation):
+        if self.wrapped:
+            raise ValueError("Profiler is already attached to a simulation")
+        self.simulation = simulation
+        for phase, (attribute, method) in PHASES.items():
+            target = simulation if attribute is None else getattr(simulation, attribute)
+            if hasattr(target, method):
+                self.wrap(target, method, phase)
+        for elevator in simulation.elevator_system.elevators:
+            for method in ELEVATOR_METHODS:
+                if hasattr(elevator, method):
+                    self.wrap(elevator, method, "elevator_step")
+        return self
+
+    # puts back the original methods
+    def detach(self):
+        for target, method, had_attribute, previous in reversed(self.wrapped):
+            if had_attribute:
+                setattr(target, method, previous)
+            else:
+                delattr(target, method)
+        self.wrapped = []
+        self.finish_door_openings()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.detach()
+
+    def wrap(self, target, method, phase):
+        original = getattr(target, method)
+        had_attribute = method in vars(target)
+        self.wrapped.append((target, method, had_attribute, vars(target).get(method)))
+
+        if phase == "exit" or phase == "board":
+            def wrapper(*args, **kwargs):
+                before = self.people_count(phase, args[0])
+                self.start(phase)
+                try:
+                    return original(*args, **kwargs)
+                finally:
+                    self.stop()
+                    self.people_moved(args[0], self.people_count(phase, args[0]) - before)
+        elif phase == "record_action":
+            def wrapper(*args, **kwargs):
+                self.start(phase)
+                try:
+                    return original(*args, **kwargs)
+                finally:
+                    self.stop()
+                    if args[2] == Action.OPEN_DOORS or args[2] == Action.OPEN_DOORS_LOBBY:
+                        self.door_opened(args[1])
+        elif phase == "record_actions":
+            # columns of actions, as written by VectorisedSimulation
+            def wrapper(*args, **kwargs):
+                self.start(phase)
+                try:
+                    return original(*args, **kwargs)
+                finally:
+                    self.stop()
+                    for index, action_code in zip(args[1], args[2]):
+                        if action_code in DOOR_OPENING_CODES:
+                            self.door_opened(index)
+        elif phase == "ingest_call" or phase == "ingest_calls":
+            def wrapper(*args, **kwargs):
+                name = type(self.simulation.elevator_system.behaviour).__name__
+                calls = 1 if phase == "ingest_call" else len(args[0])
+                self.calls_per_behaviour[name] = self.calls_per_behaviour.get(name, 0) + calls
+                self.start(phase)
+                try:
+                    return original(*args, **kwargs)
+                finally:
+                    self.stop()
+        else:
+            def wrapper(*args, **kwargs):
+                self.start(phase)
+                try:
+                    return original(*args, **kwargs)
+                finally:
+                    self.stop()
+        setattr(target, method, wrapper)
+
+    def start(self, phase):
+        self.stack.append([phase, self.clock(), 0])
+
+    def stop(self):
+        phase, start, inside = self.stack.pop()
+        elapsed = self.clock() - start
+        self.counts[phase] = self.counts.get(phase, 0) + 1
+        self.times[phase] = self.times.get(phase, 0) + elapsed
+        key = ";".join([entry[0] for entry in self.stack] + [phase])
+        self.stack_times[key] = self.stack_times.get(key, 0) + elapsed - inside
+        if self.stack:
+            self.stack[-1][2] += elapsed
+
+    def door_opened(self, index):
+        if index in self.people_since_opening:
+            self.people_per_door_opening.add(self.people_since_opening[index])
+        self.people_since_opening[index] = 0
+        self.door_openings += 1
+
+    # people that have got off any elevator, or are inside the given elevator, to count how many an exit or board moved
+    def people_count(self, phase, index):
+        if phase == "exit":
+            return self.simulation.people_served
+        return self.simulation.people_in_elevator(index)
+
+    def people_moved(self, index, people):
+        self.people_processed += people
+        if index in self.people_since_opening:
+            self.people_since_opening[index] += people
+
+    # counts the people of door openings that are still going, once the profiler is detached
+    def finish_door_openings(self):
+        for people in self.people_since_opening.values():
+            self.people_per_door_opening.add(people)
+        self.people_since_opening = {}
+
+    # returns a plain text summary of the phases, slowest first
+    def summary(self):
+        lines = ["phase".ljust(20) + "count".rjust(10) + "total ms".rjust(14) + "mean us".rjust(14)]
+        for phase in sorted(self.times, key=self.times.get, reverse=True):
+            count = self.counts[phase]
+            lines.append(phase.ljust(20) + str(count).rjust(10) + format(self.times[phase] / 1e6, ".3f").rjust(14) +
+                         format(self.times[phase] / count / 1e3, ".3f").rjust(14))
+        lines.append("")
+        lines.append("Calls per behaviour:")
+        for name, count in self.calls_per_behaviour.items():
+            lines.append("  " + name + " = " + str(count))
+        lines.append("Door openings = " + str(self.door_openings))
+        lines.append("People processed = " + str(self.people_processed))
+        if self.people_per_door_opening.count:
+            lines.append("Average people per door opening = " + format(self.people_per_door_opening.mean(), ".2f"))
+        return "\n".join(lines)
+
+    # writes the time spent in each stack of phases in microseconds, one "phase;phase;phase time" line per stack, the
+    # folded format read by flame graph tools such as flamegraph.pl and speedscope
+    def write_folded(self, path):
+        with open(path, "w") as file:
+            for stack, nanoseconds in sorted(self.stack_times.items()):
+                file.write(stack + " " + str(nanoseconds // 1000) + "\n")
+
+
+# profiles a simulation for the length of a with block, e.g.
+#   with profile(simulation) as profiler:
+#       simulation.simulate_calls(calls)
+#   print(profiler.summary())
+def profile(simulation, clock=time.perf_counter_ns):
+    return Profiler(clock).attach(simulation)
@@ -0,0 +1,204 @@
+import asyncio
+import json
+import time
+
+from elevatoraction import ElevatorAction
+from elevatorcall import ElevatorCall
+
+
+# Records actions in another action log and also hands each one to 'publish' as an ElevatorAction
+class PublishingActionLog:
+    def __init__(self, actions, publish):
+        self.actions = actions
+        self.publish = publish
+
+    def record(self, time, elevator_number, action, floor):
+        self.actions.record(time, elevator_number, action, floor)
+        self.publish(ElevatorAction(time, elevator_number, action, floor))
+
+    def append(self, elevator_action):
+        self.record(elevator_action.time, elevator_action.elevator_number, elevator_action.action, elevator_action.floor)
+
+    def clear(self):
+        self.actions.clear()
+
+    def __len__(self):
+        return len(self.actions)
+
+    def __iter__(self):
+        return iter(self.actions)
+
+    def __getitem__(self, index):
+        return self.actions[index]
+
+
+# Runs an ElevatorSimulation in step with the wall clock, or 'speed' times faster, taking calls as they happen
+#
+# Calls are submitted from the same event loop with submit, or over a socket with serve_unix/serve_tcp, and are sent to
+# the elevator system at the current simulation time. At most 'max_calls_per_step' calls are dispatched before the loop
+# lets other tasks run, so a burst of calls can't hold up the clock or the sockets for long. A call that can't be
+# dispatched fails its future rather than stopping the simulation.
+# Actions are published to subscriber queues as they are recorded. Each subscriber queue is bounded, and when one is
+# full its oldest action is dropped, so a slow subscriber never holds up the simulation.
+class RealTimeSimulation:
+    def __init__(self, simulation, speed=1.0, max_calls_per_step=256, clock=time.monotonic):
+        if speed <= 0:
+            raise ValueError("Speed must be positive, not " + str(speed))
+        self.simulation = simulation
+        self.speed = speed
+        self.max_calls_per_step = max_calls_per_step
+        self.clock = clock
+
+        self.pending = asyncio.Queue()   # (call floor, destination floor, people, future for the assigned elevator)
+        self.wakeup = asyncio.Event()
+        self.subscribers = []            # (queue, counter of dropped actions)
+        self.running = False
+        simulation.actions = PublishingActionLog(simulation.actions, self.publish)
+
+    # queues a call to be dispatched at the current simulation time
+    # returns a future for the index of the elevator it was assigned to
+    def submit(self, call_floor, destination_floor, people=1):
+        future = asyncio.get_running_loop().create_future()
+        self.pending.put_nowait((call_floor, destination_floor, people, future))
+        self.wakeup.set()
+        return future
+
+    # returns a queue that receives every action recorded from now on, keeping at most max_size of them
+    def subscribe(self, max_size=1000):
+        queue = asyncio.Queue(maxsize=max_size)
+        self.subscribers.append([queue, 0])
+        return queue
+
+    def unsubscribe(self, queue):
+        self.subscribers = [subscriber for subscriber in self.subscribers if subscriber[0] is not queue]
+
+    # number of actions dropped from the given subscriber queue because it was full
+    def dropped(self, queue):
+        for subscriber_queue, dropped in self.subscribers:
+            if subscriber_queue is queue:
+                return dropped
+        return 0
+
+    def publish(self, action):
+        for subscriber in self.subscribers:
+            queue = subscriber[0]
+            if queue.full():
+                queue.get_nowait()
+                subscriber[1] += 1
+            queue.put_nowait(action)
+
+    # runs until stop is called, or the simulation reaches 'until' seconds if given
+    async def run(self, until=None):
+        self.running = True
+        start = self.clock() - self.simulation.time / self.speed
+        while self.running and (until is None or self.simulation.time < until):
+            due = int((self.clock() - start) * self.speed)
+            if until is not None:
+                due = min(due, until)
+            self.simulation.advance_to(due)
+
+            dispatched = self.dispatch_pending()
+            if dispatched == self.max_calls_per_step:
+                # more calls may be waiting, but other tasks get a turn first
+                await asyncio.sleep(0)
+                continue
+
+            # sleeping until the next time step is due or a call comes in
+            self.wakeup.clear()
+            next_step = start + (self.simulation.time + 1) / self.speed
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), max(0, next_step - self.clock()))
+            except asyncio.TimeoutError:
+                pass
+        self.running = False
+
+    def stop(self):
+        self.running = False
+        self.wakeup.set()
+
+    # sends waiting calls to the elevator system, up to max_calls_per_step of them, returning how many were sent
+    # calls made during the same time step are all at the current simulation time, so they are sent as one batch
+    def dispatch_pending(self):
+        calls = []
+        rejected = 0
+        while len(calls) + rejected < self.max_calls_per_step and not self.pending.empty():
+            call_floor, destination_floor, people, future = self.pending.get_nowait()
+            call = ElevatorCall(self.simulation.time, call_floor, destination_floor, people)
+            # calls to floors that don't exist are turned down on their own rather than failing the whole batch
+            try:
+                self.simulation.elevator_system.check_floors(call_floor, destination_floor)
+            except ValueError as e:
+                if not future.done():
+                    future.set_exception(e)
+                rejected += 1
+                continue
+            calls.append((call, future))
+        if not calls:
+            return rejected
+
+        # a batch the elevator system can't take fails every call in it, and the simulation carries on with the next
+        # one, so no caller is left waiting on a future that is never resolved
+        try:
+            elevators = self.simulation.add_calls([call for call, _ in calls])
+        except Exception as e:
+            for _, future in calls:
+                if not future.done():
+                    future.set_exception(e)
+            return len(calls) + rejected
+        for (call, future), elevator in zip(calls, elevators):
+            if self.simulation.keep_calls:
+                self.simulation.calls.append(call)
+            if not future.done():
+                future.set_result(elevator)
+        return len(calls) + rejected
+
+    # accepts calls over a unix socket, see handle_connection
+    async def serve_unix(self, path):
+        return await asyncio.start_unix_server(self.handle_connection, path=path)
+
+    # accepts calls over TCP, see handle_connection
+    async def serve_tcp(self, host="127.0.0.1", port=0):
+        return await asyncio.start_server(self.handle_connection, host=host, port=port)
+
+    # reads one JSON object per line from a connection
+    #   {"call_floor": 0, "destination_floor": 5, "people": 2} dispatches a call and replies {"time": t, "elevator": i}
+    #   {"subscribe": true} streams every action recorded from then on as {"time", "elevator", "action", "floor"}
+    # anything invalid is replied to with {"error": message}
+    async def handle_connection(self, reader, writer):
+        publisher = None
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if request.get("subscribe"):
+                        if publisher is None:
+                            publisher = asyncio.ensure_future(self.send_actions(writer))
+                        continue
+                    elevator = await self.submit(int(request["call_floor"]), int(request["destination_floor"]),
+                                                 int(request.get("people", 1)))
+                    reply = {"time": self.simulation.time, "elevator": elevator}
+                except Exception as e:
+                    # invalid requests, and calls the elevator system failed to dispatch
+                    reply = {"error": str(e)}
+                writer.write((json.dumps(reply) + "\n").encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            if publisher is not None:
+                publisher.cancel()
+            writer.close()
+
+    async def send_actions(self, writer):
+        queue = self.subscribe()
+        try:
+            while True:
+                action = await queue.get()
+                writer.write((json.dumps({"time": action.time, "elevator": action.elevator_number,
+                                          "action": action.action.name, "floor": action.floor}) + "\n").encode())
+                await writer.drain()
+        finally:
+            self.unsubscribe(queue)
@@ -0,0 +1,123 @@
+import heapq
+from concurrent.futures import ProcessPoolExecutor
+
+from actionlog import ActionLog
+from distributions import merge_distributions
+from elevator import Elevator
+from elevatorbehaviour import RoundRobinAppend
+from elevatorsimulation import ElevatorSimulation
+from elevatorsystem import ElevatorSystem
+
+
+# One bank of elevators in a site, serving its own set of floors (usually the lobby and a range of floors above it)
+# Floors keep their site wide numbers inside the bank, so the bank's actions can be read alongside the others
+class Bank:
+    def __init__(self, name, floors, elevators, behaviour=RoundRobinAppend, capacity=10, start_floor=0):
+        self.name = name
+        self.floors = frozenset(floors)
+        self.elevators = elevators
+        self.behaviour = behaviour
+        self.capacity = capacity
+        self.start_floor = start_floor
+
+    def serves(self, call_floor, destination_floor):
+        return call_floor in self.floors and destination_floor in self.floors
+
+    def __repr__(self):
+        return "name = " + self.name + \
+               ", floors = " + str(min(self.floors)) + "-" + str(max(self.floors)) + \
+               ", elevators = " + str(self.elevators)
+
+
+# The combined results of running every bank of a site
+class SiteResult:
+    def __init__(self, banks, bank_statistics, actions, statistics):
+        self.banks = banks
+        self.bank_statistics = bank_statistics  # bank name -> statistics of that bank's simulation
+        self.actions = actions                  # every bank's actions in time order, with elevators numbered site wide
+        self.statistics = statistics            # statistics of the whole site, as if it had been one simulation
+
+
+# returns the index of the first bank that stops at both floors of a call
+def bank_for_call(banks, call):
+    for index, bank in enumerate(banks):
+        if bank.serves(call.call_floor, call.destination_floor):
+            return index
+    raise ValueError("No bank serves calls from floor " + str(call.call_floor) + " to floor " +
+                     str(call.destination_floor))
+
+
+# splits a site wide stream of calls into a list of calls for each bank, keeping them in time order
+def split_calls(calls, banks):
+    bank_calls = [[] for _ in banks]
+    for call in calls:
+        bank_calls[bank_for_call(banks, call)].append(call)
+    return bank_calls
+
+
+# runs the calls of a single bank, returning its statistics, actions and time distributions
+def run_bank(bank, calls):
+    elevators = [Elevator(capacity=bank.capacity, current_floor=bank.start_floor) for _ in range(bank.elevators)]
+    system = ElevatorSystem(elevators=elevators, behaviour=bank.behaviour(), total_floors=max(bank.floors) + 1)
+    simulation = ElevatorSimulation(system, event_driven=True, keep_calls=False)
+    simulation.simulate_calls(calls, verbose=False)
+    return simulation.statistics(), simulation.actions, simulation.waiting_times, simulation.times_in_elevator
+
+
+def run_bank_arguments(arguments):
+    return run_bank(*arguments)
+
+
+# runs every bank of a site on its share of the calls, each in its own process, and combines the results
+# processes=1 runs everything in the current process
+def run_site(banks, calls, processes=None):
+    names = [bank.name for bank in banks]
+    if len(set(names)) != len(names):
+        raise ValueError("Banks in a site need different names, got " + ", ".join(names))
+    arguments = list(zip(banks, split_calls(calls, banks)))
+    if processes == 1 or len(banks) == 0:
+        results = [run_bank_arguments(argument) for argument in arguments]
+    else:
+        with ProcessPoolExecutor(max_workers=processes or len(banks)) as executor:
+            results = list(executor.map(run_bank_arguments, arguments))
+
+    bank_statistics = {bank.name: result[0] for bank, result in zip(banks, results)}
+    actions = merge_actions([result[1] for result in results], [bank.elevators for bank in banks])
+    statistics = combine_statistics([result[0] for result in results],
+                                    merge_distributions(result[2] for result in results),
+                                    merge_distributions(result[3] for result in results))
+    return SiteResult(banks, bank_statistics, actions, statistics)
+
+
+# merges the action logs of several banks in time order, then elevator order, renumbering the elevators of each bank
+# to follow on from the banks before it
+def merge_actions(action_logs, elevator_counts):
+    streams = []
+    offset = 0
+    for log, count in zip(action_logs, elevator_counts):
+        streams.append(zip(log.times, [number + offset for number in log.elevator_numbers], log.action_codes,
+                           log.floors))
+        offset += count
+
+    merged = ActionLog()
+    for time, elevator_number, action_code, floor in heapq.merge(*streams):
+        merged.times.append(time)
+        merged.elevator_numbers.append(elevator_number)
+        merged.action_codes.append(action_code)
+        merged.floors.append(floor)
+    return merged
+
+
+# adds up the statistics of several simulations, working out the averages and percentiles again over all their people
+def combine_statistics(statistics, waiting_times, times_in_elevator):
+    combined = {"time": max([s["time"] for s in statistics], default=0)}
+    for key in ("total_people", "people_served", "people_turned_away", "total_waiting_time", "total_time_in_elevator"):
+        combined[key] = sum(s[key] for s in statistics)
+    served = combined["people_served"]
+    combined["average_time_waiting"] = combined["total_waiting_time"] / served if served else 0
+    combined["average_time_in_elevator"] = combined["total_time_in_elevator"] / served if served else 0
+    for percentile in (50, 95, 99):
+        combined["waiting_time_p" + str(percentile)] = waiting_times.percentile(percentile)
+    for percentile in (50, 95, 99):
+        combined["time_in_elevator_p" + str(percentile)] = times_in_elevator.percentile(percentile)
+    return combined
@@ -0,0 +1,138 @@
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+
+import elevatorbehaviour
+from actionlog import DiscardingActionLog
+from elevator import Elevator
+from distributions import merge_distributions
+from elevatorcall import stream_calls
+from elevatorsimulation import ElevatorSimulation
+from elevatorsystem import ElevatorSystem
+
+
+# One combination of settings to simulate as part of a sweep
+class SweepConfiguration:
+    def __init__(self, behaviour, elevators, capacity, floors, seed, duration):
+        self.behaviour = behaviour
+        self.elevators = elevators
+        self.capacity = capacity
+        self.floors = floors
+        self.seed = seed
+        self.duration = duration
+
+    def __repr__(self):
+        return "behaviour = " + self.behaviour.__name__ + \
+               ", elevators = " + str(self.elevators) + \
+               ", capacity = " + str(self.capacity) + \
+               ", floors = " + str(self.floors) + \
+               ", seed = " + str(self.seed) + \
+               ", duration = " + str(self.duration)
+
+
+# runs a single configuration and returns a row of its settings and statistics
+# each run generates its calls from its own random.Random, seeded from the configuration, so runs never share random
+# state and the same seed and floor count give the same calls whichever process runs it
+def run_configuration(configuration):
+    rng = random.Random(configuration.seed)
+    elevators = [Elevator(capacity=configuration.capacity, current_floor=0) for _ in range(configuration.elevators)]
+    system = ElevatorSystem(elevators=elevators, behaviour=configuration.behaviour(), total_floors=configuration.floors)
+    simulation = ElevatorSimulation(system, event_driven=True, actions=DiscardingActionLog(), keep_calls=False)
+
+    start = time.perf_counter()
+    simulation.simulate_calls(stream_calls(0, configuration.duration, configuration.floors, rng), verbose=False)
+    wall_time = time.perf_counter() - start
+
+    row = {
+        "behaviour": configuration.behaviour.__name__,
+        "elevators": configuration.elevators,
+        "capacity": configuration.capacity,
+        "floors": configuration.floors,
+        "seed": configuration.seed
+    }
+    row.update(simulation.statistics())
+    # kept so the distributions of several runs can be pooled, see pooled_percentiles
+    row["waiting_times"] = simulation.waiting_times
+    row["times_in_elevator"] = simulation.times_in_elevator
+    row["actions"] = len(simulation.actions)
+    row["wall_time"] = wall_time
+    return row
+
+
+# builds every combination of the given settings
+def build_grid(behaviours, elevator_counts, capacities, floor_counts, seeds, duration):
+    return [SweepConfiguration(behaviour, elevators, capacity, floors, seed, duration)
+            for behaviour, elevators, capacity, floors, seed
+            in product(behaviours, elevator_counts, capacities, floor_counts, seeds)]
+
+
+# runs every combination of the given settings across a pool of processes and returns one row per combination,
+# in the same order as build_grid
+# processes=1 runs everything in the current process
+def run_sweep(behaviours, elevator_counts, capacities, floor_counts, seeds, duration=2000, processes=None):
+    grid = build_grid(behaviours, elevator_counts, capacities, floor_counts, seeds, duration)
+    if processes == 1:
+        return [run_configuration(configuration) for configuration in grid]
+    # about four chunks for each worker, which is one per CPU unless 'processes' says otherwise
+    workers = processes or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(run_configuration, grid, chunksize=max(1, len(grid) // (4 * workers))))
+
+
+# pools the waiting time distributions of the sweep rows for each behaviour, as if all their people had been in one run
+# returns behaviour name -> {percentile: waiting time}
+def pooled_percentiles(rows, percentiles=(50, 95, 99), distribution="waiting_times"):
+    pooled = {}
+    for row in rows:
+        pooled.setdefault(row["behaviour"], []).append(row[distribution])
+    result = {}
+    for behaviour, distributions in pooled.items():
+        merged = merge_distributions(distributions)
+        result[behaviour] = {percentile: merged.percentile(percentile) for percentile in percentiles}
+    return result
+
+
+# lays out sweep rows as a plain text table
+def format_table(rows, columns=("behaviour", "elevators", "capacity", "floors", "seed", "people_served",
+                                "people_turned_away", "average_time_waiting", "waiting_time_p95",
+                                "average_time_in_elevator")):
+    cells = [list(columns)] + [[format_cell(row[column]) for column in columns] for row in rows]
+    widths = [max(len(line[i]) for line in cells) for i in range(len(columns))]
+    return "\n".join("  ".join(cell.rjust(width) for cell, width in zip(line, widths)) for line in cells)
+
+
+def format_cell(value):
+    if isinstance(value, float):
+        return format(value, ".2f")
+    return str(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a grid of elevator simulations in parallel")
+    parser.add_argument("--behaviours", nargs="+", default=["RoundRobinAppend", "ClosestCallPrepend",
+                                                            "LeastBusyAppend", "StandardElevator",
+                                                            "EarliestArrival", "BatchAssignment"])
+    parser.add_argument("--elevators", nargs="+", type=int, default=[3])
+    parser.add_argument("--capacities", nargs="+", type=int, default=[10])
+    parser.add_argument("--floors", nargs="+", type=int, default=[100])
+    parser.add_argument("--seeds", nargs="+", type=int, default=[12345])
+    parser.add_argument("--duration", type=int, default=2000)
+    parser.add_argument("--processes", type=int, default=None)
+    args = parser.parse_args()
+
+    behaviours = [getattr(elevatorbehaviour, name) for name in args.behaviours]
+    rows = run_sweep(behaviours, args.elevators, args.capacities, args.floors, args.seeds, args.duration, args.processes)
+    print(format_table(rows))
+
+    print("")
+    print("Pooled waiting times:")
+    pooled = [dict(behaviour=behaviour, **{"p" + str(p): value for p, value in percentiles.items()})
+              for behaviour, percentiles in pooled_percentiles(rows).items()]
+    print(format_table(pooled, columns=("behaviour", "p50", "p95", "p99")))
+
+
+if __name__ == "__main__":
+    main()
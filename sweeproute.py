@@ -0,0 +1,225 @@
+from bisect import bisect_left, bisect_right
+
+UP = 1
+DOWN = -1
+
+# how far the start of a route's floors can move forward before the visited floors are dropped from memory
+# also used for the arrival time tables in arrivaltimes.py, which follow an elevator's destinations the same way
+COMPACT_AFTER = 1024
+
+
+def direction_between(from_floor, to_floor):
+    if to_floor > from_floor:
+        return UP
+    if to_floor < from_floor:
+        return DOWN
+    return None
+
+
+# bisect_left for a list in descending order, returning the first position between 'low' and 'high' whose value is not
+# more than 'value'
+def bisect_left_descending(values, value, low, high):
+    while low < high:
+        middle = (low + high) // 2
+        if values[middle] > value:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+# The destinations of one elevator stored as sweeps, runs of floors going the same way, for StandardElevator
+#
+# The route is the elevator's current floor followed by its destinations, so route index 0 is the current floor and
+# route index i is destination i-1. Step i is the move from route index i-1 to route index i. Rather than working out
+# which way every step goes, the route keeps the steps where a new sweep starts, walks the sweeps only as far as the
+# one a floor belongs in, and finds where it belongs within that sweep by bisection. Floors are inserted at the same
+# places as walking the whole route from the front would put them, see test_sweeproute.py.
+#
+# Finding the place for a floor is logarithmic in the length of a sweep, but putting it there still shifts the floors
+# and sweep starts after it along by one, so an insert is linear in the route length, with a small constant.
+#
+# Every change is also made to the given destination queue, which the elevator keeps visiting as normal. Floors the
+# elevator has visited since the route last looked are dropped from the start of the route. Sweep starts are kept as
+# positions in 'floors' rather than in the route, so dropping floors from the start doesn't move them.
+class SweepRoute:
+    def __init__(self, destinations):
+        self.destinations = destinations
+        self.rebuild()
+
+    # recreates the route from the destination queue
+    def rebuild(self):
+        self.floors = list(self.destinations)
+        self.start = 0
+        # destination steps (between destination k-1 and destination k) where a new sweep starts, and its direction
+        # each step is stored as the position of destination k in 'floors', so destination step k is start + k
+        # flat steps between two equal floors carry on in the direction of the sweep they are in
+        self.sweep_steps = []
+        self.sweep_directions = []
+        previous_direction = None
+        for step in range(1, len(self.floors)):
+            direction = direction_between(self.floors[step - 1], self.floors[step])
+            if direction is not None and direction != previous_direction:
+                self.sweep_steps.append(step)
+                self.sweep_directions.append(direction)
+                previous_direction = direction
+
+    def __len__(self):
+        return len(self.floors) - self.start
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        return self.floors[self.start + index]
+
+    def __iter__(self):
+        return iter(self.floors[self.start:])
+
+    # drops floors the elevator has visited from the start of the route, or rebuilds the route if the destination
+    # queue has been changed in some other way
+    def sync(self):
+        visited = len(self) - len(self.destinations)
+        if visited < 0:
+            self.rebuild()
+            return
+        for _ in range(visited):
+            self.remove_first()
+        if len(self) > 0 and (self[0] != self.destinations[0] or self[-1] != self.destinations[-1]):
+            self.rebuild()
+
+    # inserts a floor into the route if it isn't already being visited in the given direction
+    # 'after' is a route index to insert after. returns the route index the floor is visited at
+    def insert(self, current_floor, floor, call_direction, after=0):
+        length = len(self) + 1
+        start = after + 1
+
+        for run_start, run_end, direction, previous_direction in self.sweeps(current_floor):
+            if run_end < start:
+                continue
+            scan_start = max(run_start, start)
+
+            # where the route turns around, a floor beyond the turning point extends the previous sweep
+            if scan_start == run_start and previous_direction is not None and direction != previous_direction:
+                turning_floor = self.route_floor(current_floor, run_start - 1)
+                if floor == turning_floor:
+                    return run_start - 1
+                if (previous_direction == UP and floor > turning_floor) or \
+                        (previous_direction == DOWN and floor < turning_floor):
+                    self.insert_at(run_start, floor)
+                    return run_start
+
+            if direction is not None and (direction == call_direction or call_direction is None):
+                index = self.find_in_sweep(floor, direction, scan_start, run_end)
+                if index <= run_end:
+                    index_floor = self.route_floor(current_floor, index)
+                    if index_floor == floor:
+                        return index
+                    before_floor = self.route_floor(current_floor, index - 1)
+                    if (direction == UP and before_floor < floor) or (direction == DOWN and before_floor > floor):
+                        self.insert_at(index, floor)
+                        return index
+            elif direction is None and call_direction is None and floor == current_floor:
+                # the route is standing still at the current floor
+                return scan_start
+
+        # no suitable place in the middle of the route, we can just insert at the end
+        if length == 1 or self[-1] != floor:
+            self.insert_at(length, floor)
+            return length
+        return length - 1
+
+    # yields (first route index, last route index, direction, direction of the sweep before) for each sweep, working
+    # out each one only when it is asked for
+    def sweeps(self, current_floor):
+        length = len(self) + 1
+        if length == 1:
+            return
+        # the first step goes from the current floor to the first destination, and decides the direction of any flat
+        # steps after it
+        run_start, direction, previous_direction = 1, direction_between(current_floor, self[0]), None
+        for step, step_direction in zip(self.sweep_steps, self.sweep_directions):
+            if step_direction == direction:
+                continue
+            step -= self.start
+            yield run_start, step, direction, previous_direction
+            run_start, direction, previous_direction = step + 1, step_direction, direction
+        yield run_start, length - 1, direction, previous_direction
+
+    # finds the first route index between 'low' and 'high' whose floor is not before 'floor' going in 'direction'
+    # returns high + 1 if there isn't one
+    def find_in_sweep(self, floor, direction, low, high):
+        if direction == UP:
+            position = bisect_left(self.floors, floor, self.start + low - 1, self.start + high)
+        else:
+            position = bisect_left_descending(self.floors, floor, self.start + low - 1, self.start + high)
+        return position - self.start + 1
+
+    def route_floor(self, current_floor, index):
+        return current_floor if index == 0 else self.floors[self.start + index - 1]
+
+    # inserts a floor at a route index, keeping the sweep starts and destination queue up to date
+    def insert_at(self, index, floor):
+        position = index - 1
+        length = len(self)
+
+        # the step into the new floor replaces the step at this position, and later steps move along one
+        sweep = bisect_left(self.sweep_steps, self.start + position)
+        if position >= 1 and sweep < len(self.sweep_steps) and self.sweep_steps[sweep] == self.start + position:
+            del self.sweep_steps[sweep]
+            del self.sweep_directions[sweep]
+        for i in range(bisect_right(self.sweep_steps, self.start + position), len(self.sweep_steps)):
+            self.sweep_steps[i] += 1
+
+        self.floors.insert(self.start + position, floor)
+        self.destinations.insert(position, floor)
+        self.update_sweeps_after(position, [position, position + 1], length + 1)
+
+    # removes the first floor of the route, once the elevator has visited it
+    def remove_first(self):
+        self.start += 1
+        # the step into the new first destination is now the move from the current floor, which isn't kept
+        if len(self.sweep_steps) > 0 and self.sweep_steps[0] <= self.start:
+            del self.sweep_steps[0]
+            del self.sweep_directions[0]
+
+        if self.start > COMPACT_AFTER and self.start * 2 > len(self.floors):
+            del self.floors[:self.start]
+            self.sweep_steps = [step - self.start for step in self.sweep_steps]
+            self.start = 0
+        self.update_sweeps_after(0, [], len(self))
+
+    # works out which of the given destination steps start a new sweep, along with the first step that changes
+    # direction after them, which may no longer start a new sweep or may now need to
+    def update_sweeps_after(self, position, changed_steps, length):
+        sweep = bisect_left(self.sweep_steps, self.start + position)
+        previous_direction = self.sweep_directions[sweep - 1] if sweep > 0 else None
+
+        for step in changed_steps:
+            if 1 <= step < length:
+                direction = direction_between(self[step - 1], self[step])
+                if direction is not None and direction != previous_direction:
+                    insert_at = bisect_left(self.sweep_steps, self.start + step)
+                    self.sweep_steps.insert(insert_at, self.start + step)
+                    self.sweep_directions.insert(insert_at, direction)
+                    previous_direction = direction
+                elif direction is not None:
+                    previous_direction = direction
+
+        # the steps after these carry on in the direction they had before, up to the next start of a sweep
+        last_changed = changed_steps[-1] if changed_steps else position
+        next_sweep = bisect_right(self.sweep_steps, self.start + last_changed)
+        end = self.sweep_steps[next_sweep] - self.start if next_sweep < len(self.sweep_steps) else length
+        step = last_changed + 1
+        while step < end and self[step - 1] == self[step]:
+            step += 1
+        if step < end:
+            direction = direction_between(self[step - 1], self[step])
+            if direction != previous_direction:
+                self.sweep_steps.insert(next_sweep, self.start + step)
+                self.sweep_directions.insert(next_sweep, direction)
+                next_sweep += 1
+            previous_direction = direction
+
+        if next_sweep < len(self.sweep_steps) and self.sweep_directions[next_sweep] == previous_direction:
+            del self.sweep_steps[next_sweep]
+            del self.sweep_directions[next_sweep]
@@ -0,0 +1,76 @@
+import os
+import tempfile
+import unittest
+
+from actionlog import ActionLog, DiscardingActionLog, StreamingActionLog, read_action_file
+from elevatoraction import Action, ElevatorAction
+
+
+class TestActionLog(unittest.TestCase):
+
+    def test_record_and_view(self):
+        log = ActionLog()
+
+        log.record(3, 1, Action.MOVE_UP, 4)
+        log.append(ElevatorAction(time=5, elevator_number=0, action=Action.OPEN_DOORS_LOBBY, floor=0))
+
+        self.assertEqual(len(log), 2)
+        self.assertEqual(log[0], ElevatorAction(time=3, elevator_number=1, action=Action.MOVE_UP, floor=4))
+        self.assertEqual(log[-1].action, Action.OPEN_DOORS_LOBBY)
+        self.assertEqual(log[0:1], [ElevatorAction(time=3, elevator_number=1, action=Action.MOVE_UP, floor=4)])
+
+    def test_equals_list(self):
+        log = ActionLog()
+        log.record(3, 1, Action.MOVE_DOWN, 2)
+
+        self.assertEqual(log, [ElevatorAction(time=3, elevator_number=1, action=Action.MOVE_DOWN, floor=2)])
+        self.assertNotEqual(log, [ElevatorAction(time=3, elevator_number=1, action=Action.MOVE_UP, floor=2)])
+        self.assertNotEqual(log, [])
+
+    def test_clear(self):
+        log = ActionLog()
+        log.record(3, 1, Action.MOVE_DOWN, 2)
+
+        log.clear()
+
+        self.assertEqual(len(log), 0)
+
+    def test_streaming_round_trip(self):
+        path = os.path.join(tempfile.mkdtemp(), "actions.bin")
+        expected = ActionLog()
+        with StreamingActionLog(path, chunk_size=2) as log:
+            for t in range(5):
+                log.record(t, t % 2, Action.MOVE_UP, t + 1)
+                expected.record(t, t % 2, Action.MOVE_UP, t + 1)
+            self.assertEqual(len(log), 5)
+
+        self.assertEqual(read_action_file(path), expected)
+
+    def test_extend(self):
+        log = ActionLog()
+        expected = ActionLog()
+        expected.record(4, 0, Action.MOVE_UP, 3)
+        expected.record(4, 2, Action.OPEN_DOORS, 7)
+
+        log.extend([4, 4], [0, 2], [Action.MOVE_UP.value, Action.OPEN_DOORS.value], [3, 7])
+
+        self.assertEqual(log, expected)
+
+    def test_streaming_extend(self):
+        path = os.path.join(tempfile.mkdtemp(), "actions.bin")
+        expected = ActionLog()
+        with StreamingActionLog(path, chunk_size=2) as log:
+            for t in range(3):
+                log.extend([t, t], [0, 1], [Action.MOVE_UP.value] * 2, [t, t + 1])
+                expected.extend([t, t], [0, 1], [Action.MOVE_UP.value] * 2, [t, t + 1])
+            self.assertEqual(len(log), 6)
+
+        self.assertEqual(read_action_file(path), expected)
+
+    def test_discarding(self):
+        log = DiscardingActionLog()
+
+        log.record(3, 1, Action.MOVE_DOWN, 2)
+
+        self.assertEqual(len(log), 1)
+        self.assertEqual(list(log), [])
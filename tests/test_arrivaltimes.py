@@ -0,0 +1,60 @@
+import random
+import unittest
+
+from arrivaltimes import ArrivalTimes
+from destinationqueue import DestinationQueue
+from elevator import Action, Elevator
+
+
+class TestArrivalTimes(unittest.TestCase):
+
+    def test_time_until(self):
+        elevator = Elevator(current_floor=3)
+        elevator.destinations = [5, 0, 2]
+        arrival_times = ArrivalTimes(elevator.destinations)
+
+        self.assertEqual(arrival_times.time_until(elevator, 0), 2)
+        self.assertEqual(arrival_times.time_until(elevator, 1), 2 + 5 + 5)
+        self.assertEqual(arrival_times.time_until(elevator, 2), 2 + 5 + 5 + 30 + 2)
+
+    def test_time_until_added(self):
+        elevator = Elevator(current_floor=3)
+        arrival_times = ArrivalTimes(elevator.destinations)
+
+        self.assertEqual(arrival_times.time_until_added(elevator, 1), 2)
+
+        arrival_times.append(5)
+
+        self.assertEqual(arrival_times.time_until_added(elevator, 5), 2)
+        self.assertEqual(arrival_times.time_until_added(elevator, 1), 2 + 5 + 4)
+        self.assertEqual(elevator.destinations, [5])
+
+    def test_sync_rebuilds_after_other_changes(self):
+        destinations = DestinationQueue([4, 8])
+        arrival_times = ArrivalTimes(destinations)
+
+        destinations.appendleft(2)
+        arrival_times.sync()
+
+        self.assertEqual(arrival_times.floors, [2, 4, 8])
+
+    def test_estimates_match_elevator(self):
+        rng = random.Random(0)
+        elevator = Elevator(current_floor=rng.randrange(10))
+        arrival_times = ArrivalTimes(elevator.destinations)
+        expected_openings = []
+        openings = []
+
+        for time in range(2000):
+            if rng.random() < 0.05:
+                arrival_times.sync()
+                floor = rng.randrange(10)
+                expected = time + arrival_times.time_until_added(elevator, floor)
+                if len(elevator.destinations) == 0 or elevator.destinations[-1] != floor:
+                    arrival_times.append(floor)
+                    expected_openings.append(expected)
+            if elevator.iterate() in (Action.OPEN_DOORS, Action.OPEN_DOORS_LOBBY):
+                openings.append(time)
+
+        self.assertEqual(openings, expected_openings[:len(openings)])
+        self.assertGreater(len(openings), 50)
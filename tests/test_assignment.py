@@ -0,0 +1,42 @@
+import itertools
+import random
+import unittest
+
+from assignment import min_cost_assignment
+
+
+class TestAssignment(unittest.TestCase):
+
+    def test_min_cost_assignment(self):
+        costs = [[1, 2, 8],
+                 [1, 9, 9],
+                 [5, 6, 4]]
+
+        # giving the first row its cheapest column would leave the second row with a cost of 9
+        self.assertEqual(min_cost_assignment(costs), [1, 0, 2])
+
+    def test_min_cost_assignment_more_columns(self):
+        costs = [[7, 3, 9, 3],
+                 [8, 1, 9, 6]]
+
+        self.assertEqual(min_cost_assignment(costs), [3, 1])
+
+    def test_min_cost_assignment_empty(self):
+        self.assertEqual(min_cost_assignment([]), [])
+
+    def test_min_cost_assignment_too_many_rows(self):
+        self.assertRaises(ValueError, min_cost_assignment, [[1], [2]])
+
+    def test_min_cost_assignment_matches_brute_force(self):
+        rng = random.Random(3)
+        for _ in range(200):
+            rows = rng.randint(1, 5)
+            columns = rng.randint(rows, 6)
+            costs = [[rng.randint(0, 20) for _ in range(columns)] for _ in range(rows)]
+
+            assignment = min_cost_assignment(costs)
+
+            self.assertEqual(len(set(assignment)), rows)
+            best = min(sum(costs[row][column] for row, column in enumerate(permutation))
+                       for permutation in itertools.permutations(range(columns), rows))
+            self.assertEqual(sum(costs[row][column] for row, column in enumerate(assignment)), best)
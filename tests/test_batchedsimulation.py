@@ -0,0 +1,41 @@
+import random
+import unittest
+
+from batchedsimulation import BatchedSimulation
+from elevator import Elevator
+from elevatorbehaviour import ClosestCallPrepend, LeastBusyAppend, RoundRobinAppend, StandardElevator
+from elevatorcall import ElevatorCall, generate_calls
+from elevatorsimulation import ElevatorSimulation
+from elevatorsystem import ElevatorSystem
+
+
+class TestBatchedSimulation(unittest.TestCase):
+
+    def test_simulate_calls_matches_separate_simulations(self):
+        for behaviour in [RoundRobinAppend, ClosestCallPrepend, LeastBusyAppend, StandardElevator]:
+            calls = [generate_calls(0, 1500, 15, random.Random(seed)) for seed in range(4)]
+            # a call to the same floor, which gets off on the time step after getting on
+            calls[0].append(ElevatorCall(time=1500, call_floor=3, destination_floor=3, people=2))
+            batched = BatchedSimulation(replications=4, elevators=3, behaviour=behaviour, total_floors=15, capacity=3)
+
+            result = batched.simulate_calls(calls)
+
+            for replication in range(4):
+                elevators = [Elevator(capacity=3) for _ in range(3)]
+                simulation = ElevatorSimulation(ElevatorSystem(elevators, behaviour(), 15))
+                simulation.simulate_calls(calls[replication])
+                self.assertEqual(result[replication], simulation.statistics())
+                self.assertEqual(batched.simulations[replication].actions, simulation.actions)
+
+    def test_simulate_calls_no_calls(self):
+        batched = BatchedSimulation(replications=2, elevators=2, behaviour=RoundRobinAppend, total_floors=5)
+
+        result = batched.simulate_calls([[], [ElevatorCall(time=2, call_floor=0, destination_floor=1, people=1)]])
+
+        self.assertEqual(result[0]["time"], 1)
+        self.assertEqual(result[1]["people_served"], 1)
+
+    def test_simulate_calls_wrong_number_of_replications(self):
+        batched = BatchedSimulation(replications=2, elevators=2, behaviour=RoundRobinAppend, total_floors=5)
+
+        self.assertRaises(ValueError, batched.simulate_calls, [[]])
@@ -0,0 +1,41 @@
+import unittest
+
+from benchmarks.batchdispatch import lobby_bursts, time_per_call, time_per_call_simulated
+from benchmarks.suite import compare_results, scenario_calls
+from elevatorbehaviour import BatchAssignment, EarliestArrival
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+
+    def test_scenario_calls_reproducible(self):
+        first = scenario_calls(floors=10, streams=3, duration=500)
+        second = scenario_calls(floors=10, streams=3, duration=500)
+
+        self.assertEqual(first, second)
+        self.assertEqual([call.time for call in first], sorted(call.time for call in first))
+
+    def test_compare_results(self):
+        baseline = {"results": {"a": {"simulated_seconds_per_second": 100, "calls_ingested_per_second": 100,
+                                      "peak_memory_bytes": 100, "calls": 10}}}
+        current = {"results": {"a": {"simulated_seconds_per_second": 80, "calls_ingested_per_second": 95,
+                                     "peak_memory_bytes": 150, "calls": 20}}}
+
+        result = compare_results(baseline, current, threshold=0.1)
+
+        self.assertEqual(len(result), 2)
+        self.assertTrue(result[0].startswith("a simulated_seconds_per_second"))
+        self.assertTrue(result[1].startswith("a peak_memory_bytes"))
+
+    def test_compare_results_no_regressions(self):
+        baseline = {"results": {"a": {"simulated_seconds_per_second": 100, "peak_memory_bytes": 100}}}
+        current = {"results": {"a": {"simulated_seconds_per_second": 120, "peak_memory_bytes": 90}}}
+
+        self.assertEqual(compare_results(baseline, current), [])
+
+    def test_batch_dispatch_timings(self):
+        bursts = lobby_bursts(bursts=3, burst_size=4, floors=10)
+
+        self.assertEqual(bursts, lobby_bursts(bursts=3, burst_size=4, floors=10))
+        for behaviour in [EarliestArrival, BatchAssignment]:
+            self.assertGreater(time_per_call(behaviour, bursts, elevators=2, floors=10), 0)
+            self.assertGreater(time_per_call_simulated(behaviour, bursts, elevators=2, floors=10), 0)
@@ -0,0 +1,52 @@
+import unittest
+
+import numpy as np
+
+from callbatch import CallBatch, clamped_log_normal, generate_call_batch, generate_calls_vectorised, random_0_weighted
+from elevatorcall import ElevatorCall
+
+
+class TestCallBatch(unittest.TestCase):
+
+    def test_iterate_batch(self):
+        batch = CallBatch(np.array([1, 2]), np.array([0, 3]), np.array([4, 0]), np.array([2, 1]))
+
+        result = list(batch)
+
+        self.assertEqual(len(batch), 2)
+        self.assertEqual(result, [ElevatorCall(time=1, call_floor=0, destination_floor=4, people=2),
+                                  ElevatorCall(time=2, call_floor=3, destination_floor=0, people=1)])
+
+    def test_generate_call_batch(self):
+        batch = generate_call_batch(start_time=100, end_time=20000, floors=10, rng=np.random.default_rng(1))
+
+        self.assertTrue(len(batch) > 0)
+        self.assertTrue(np.all(np.diff(batch.times) >= 0))
+        self.assertTrue(np.all(batch.times >= 100) and np.all(batch.times < 20000))
+        self.assertTrue(np.all(batch.call_floors != batch.destination_floors))
+        self.assertTrue(np.all((batch.people >= 1) & (batch.people <= 5)))
+        self.assertTrue(np.all((batch.call_floors >= 0) & (batch.call_floors < 10)))
+
+    def test_generate_call_batch_reproducible(self):
+        first = generate_calls_vectorised(start_time=0, end_time=1000, floors=10, rng=np.random.default_rng(5))
+        second = generate_calls_vectorised(start_time=0, end_time=1000, floors=10, rng=np.random.default_rng(5))
+
+        self.assertEqual(first, second)
+
+    def test_generate_call_batch_no_time(self):
+        batch = generate_call_batch(start_time=0, end_time=0, floors=10, rng=np.random.default_rng(1))
+
+        self.assertEqual(len(batch), 0)
+
+    def test_random_0_weighted(self):
+        result = random_0_weighted(np.random.default_rng(2), high=10, factor=4, size=100000)
+
+        # 0 is returned (1-1/factor) of the time, plus its own share of the uniform part
+        self.assertAlmostEqual(np.mean(result == 0), 0.75 + 0.025, 2)
+        self.assertTrue(np.all(result < 10))
+
+    def test_clamped_log_normal(self):
+        result = clamped_log_normal(np.random.default_rng(3), mean=0, sdev=1, low=1, high=5, size=1000)
+
+        self.assertEqual(result.min(), 1)
+        self.assertEqual(result.max(), 5)
@@ -0,0 +1,94 @@
+import contextlib
+import io
+import os
+import random
+import tempfile
+import unittest
+
+from calltrace import CallTrace, convert_call_csv, write_call_trace
+from elevator import Elevator
+from elevatorbehaviour import RoundRobinAppend
+from elevatorcall import ElevatorCall, generate_calls
+from elevatorsimulation import ElevatorSimulation
+from elevatorsystem import ElevatorSystem
+from exporters import CallWriter
+
+
+def as_tuples(calls):
+    return [(c.time, c.call_floor, c.destination_floor, c.people) for c in calls]
+
+
+class TestCallTrace(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "calls.trace")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        calls = generate_calls(0, 500, 10, rng=random.Random(1))
+
+        self.assertEqual(write_call_trace(calls, self.path), len(calls))
+        with CallTrace(self.path) as trace:
+            self.assertEqual(len(trace), len(calls))
+            self.assertEqual(as_tuples(trace), as_tuples(calls))
+            self.assertEqual(as_tuples([trace[-1]]), as_tuples([calls[-1]]))
+
+    def test_between_and_slices(self):
+        calls = [ElevatorCall(time, 0, 1, 1) for time in [0, 3, 3, 7, 10, 15]]
+        write_call_trace(calls, self.path)
+
+        with CallTrace(self.path) as trace:
+            self.assertEqual([c.time for c in trace.between(3, 10)], [3, 3, 7])
+            self.assertEqual([c.time for c in trace.between(3, 10).between(4, 20)], [7])
+            self.assertEqual([[c.time for c in s] for s in trace.slices(5)], [[0, 3, 3], [7], [10], [15]])
+
+    def test_simulate_calls_from_trace(self):
+        calls = generate_calls(0, 300, 10, rng=random.Random(2))
+        write_call_trace(calls, self.path)
+        expected = ElevatorSimulation(ElevatorSystem([Elevator(), Elevator()], RoundRobinAppend(), 10))
+        simulation = ElevatorSimulation(ElevatorSystem([Elevator(), Elevator()], RoundRobinAppend(), 10))
+
+        with contextlib.redirect_stdout(io.StringIO()), CallTrace(self.path) as trace:
+            expected.simulate_calls(calls)
+            for calls_slice in trace.slices(100):
+                simulation.simulate_calls(calls_slice, finish=False)
+            simulation.simulate_calls([])
+
+        self.assertEqual(simulation.statistics(), expected.statistics())
+        self.assertEqual(simulation.actions, expected.actions)
+
+    def test_convert_csv(self):
+        calls = generate_calls(0, 200, 10, rng=random.Random(3))
+        csv_path = os.path.join(self.directory.name, "calls.csv")
+        with CallWriter(csv_path) as writer:
+            for call in calls:
+                writer.append(call)
+
+        self.assertEqual(convert_call_csv(csv_path, self.path), len(calls))
+        with CallTrace(self.path) as trace:
+            self.assertEqual(as_tuples(trace), as_tuples(calls))
+
+    def test_close_after_partial_iteration(self):
+        calls = generate_calls(0, 500, 10, rng=random.Random(2))
+        write_call_trace(calls, self.path)
+
+        trace = CallTrace(self.path)
+        iterator = iter(trace)
+        first = next(iterator)
+        trace.close()
+
+        self.assertEqual(as_tuples([first]), as_tuples(calls[:1]))
+
+    def test_rejects_out_of_order_calls(self):
+        with self.assertRaises(ValueError):
+            write_call_trace([ElevatorCall(5, 0, 1, 1), ElevatorCall(4, 0, 1, 1)], self.path)
+
+    def test_rejects_other_files(self):
+        with open(self.path, "wb") as file:
+            file.write(b"time,call_floor\n")
+
+        with self.assertRaises(ValueError):
+            CallTrace(self.path)
@@ -0,0 +1,78 @@
+import os
+import random
+import tempfile
+import unittest
+
+from actionlog import StreamingActionLog
+from checkpoint import fork, load_checkpoint, restore, save_checkpoint, snapshot
+from elevator import Elevator
+from elevatorbehaviour import LeastBusyAppend, RoundRobinAppend, StandardElevator
+from elevatorcall import generate_calls
+from elevatorsimulation import ElevatorSimulation
+from elevatorsystem import ElevatorSystem
+
+
+def build_simulation(behaviour):
+    elevators = [Elevator(capacity=3, current_floor=0) for _ in range(3)]
+    return ElevatorSimulation(ElevatorSystem(elevators=elevators, behaviour=behaviour, total_floors=15))
+
+
+class TestCheckpoint(unittest.TestCase):
+
+    def setUp(self):
+        calls = generate_calls(0, 2000, 15, random.Random(99))
+        self.morning = [call for call in calls if call.time < 1000]
+        self.afternoon = [call for call in calls if call.time >= 1000]
+
+    def test_restore_carries_on_the_same(self):
+        uninterrupted = build_simulation(StandardElevator())
+        uninterrupted.simulate_calls(self.morning + self.afternoon)
+
+        simulation = build_simulation(StandardElevator())
+        simulation.simulate_calls(self.morning, finish=False)
+        simulation.advance_to(1000)
+        restored = restore(snapshot(simulation))
+        restored.simulate_calls(self.afternoon)
+
+        self.assertEqual(restored.actions, uninterrupted.actions)
+        self.assertEqual(restored.statistics(), uninterrupted.statistics())
+        self.assertEqual(restored.elevator_system.behaviour.current_elevator,
+                         uninterrupted.elevator_system.behaviour.current_elevator)
+
+    def test_fork_branches_are_independent(self):
+        simulation = build_simulation(RoundRobinAppend())
+        simulation.simulate_calls(self.morning, finish=False)
+
+        same, switched = fork(simulation, branches=2)
+        switched.elevator_system.behaviour = LeastBusyAppend()
+        same.simulate_calls(self.afternoon)
+        switched.simulate_calls(self.afternoon)
+        simulation.simulate_calls(self.afternoon)
+
+        self.assertEqual(same.actions, simulation.actions)
+        self.assertEqual(same.statistics(), simulation.statistics())
+        self.assertNotEqual(switched.actions, simulation.actions)
+
+    def test_save_and_load(self):
+        simulation = build_simulation(RoundRobinAppend())
+        simulation.simulate_calls(self.morning, finish=False)
+        path = os.path.join(tempfile.mkdtemp(), "checkpoint.bin")
+
+        save_checkpoint(simulation, path)
+        result = load_checkpoint(path)
+
+        self.assertEqual(result.time, simulation.time)
+        self.assertEqual(result.actions, simulation.actions)
+        self.assertEqual(result.people_waiting_at_floor(0), simulation.people_waiting_at_floor(0))
+        self.assertEqual([e.destinations for e in result.elevator_system.elevators],
+                         [e.destinations for e in simulation.elevator_system.elevators])
+
+    def test_restore_invalid_data(self):
+        self.assertRaises(ValueError, restore, b"not a checkpoint")
+
+    def test_snapshot_streaming_actions(self):
+        path = os.path.join(tempfile.mkdtemp(), "actions.bin")
+        with StreamingActionLog(path) as actions:
+            simulation = ElevatorSimulation(ElevatorSystem([Elevator()], RoundRobinAppend(), 10), actions=actions)
+
+            self.assertRaises(ValueError, snapshot, simulation)
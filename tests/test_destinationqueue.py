@@ -0,0 +1,60 @@
+import unittest
+
+from collections import deque
+
+from destinationqueue import DestinationQueue, ObservedDestinationQueue
+
+
+class TestDestinationQueue(unittest.TestCase):
+
+    def test_equals_list(self):
+        queue = DestinationQueue([1, 2, 3])
+
+        self.assertEqual(queue, [1, 2, 3])
+        self.assertNotEqual(queue, [1, 2])
+        self.assertNotEqual(queue, [3, 2, 1])
+
+    def test_front_operations(self):
+        queue = DestinationQueue([2, 3])
+
+        queue.appendleft(1)
+        queue.append(4)
+        result = queue.popleft()
+
+        self.assertEqual(result, 1)
+        self.assertEqual(queue, [2, 3, 4])
+        self.assertEqual(queue[0], 2)
+        self.assertEqual(len(queue), 3)
+
+    def test_observed_queue_calls_listener(self):
+        changes = []
+        queue = ObservedDestinationQueue([1, 2], listener=lambda: changes.append(len(queue)))
+
+        queue.append(3)
+        queue.appendleft(0)
+        queue.popleft()
+        queue.insert(1, 5)
+
+        self.assertEqual(changes, [3, 4, 3, 4])
+        self.assertEqual(queue, [1, 5, 2, 3])
+
+    def test_observed_every_change(self):
+        # every deque method that changes the floors in place, with arguments to call it with
+        mutators = {
+            "append": (4,), "appendleft": (0,), "extend": ([4],), "extendleft": ([0],), "insert": (1, 5),
+            "pop": (), "popleft": (), "remove": (2,), "clear": (), "reverse": (), "rotate": (1,),
+            "__setitem__": (0, 5), "__delitem__": (0,), "__iadd__": ([4],), "__imul__": (2,)
+        }
+        read_only = {"copy", "count", "index", "maxlen"}
+        # a new deque method has to be sorted into one of these, so it can't change the floors unnoticed
+        self.assertEqual({name for name in dir(deque) if not name.startswith("_")},
+                         {name for name in mutators if not name.startswith("_")} | read_only)
+
+        for name, args in mutators.items():
+            changes = []
+            queue = ObservedDestinationQueue([1, 2, 3], listener=lambda: changes.append(name))
+
+            self.assertIn(name, vars(ObservedDestinationQueue))
+            getattr(queue, name)(*args)
+
+            self.assertEqual(changes, [name])
@@ -0,0 +1,68 @@
+import unittest
+from unittest.mock import patch
+
+from differential import (
+    ENGINES,
+    Workload,
+    compare,
+    difference,
+    random_workload,
+    run_differential,
+    run_engine,
+    run_tick,
+    shrink
+)
+from elevatorbehaviour import BatchAssignment, RoundRobinAppend
+from elevatorcall import ElevatorCall
+
+
+# a broken engine that loses every call made from floor 3
+def run_losing_calls(workload, behaviour):
+    return run_tick(workload.with_calls([call for call in workload.calls if call.call_floor != 3]), behaviour)
+
+
+class TestDifferential(unittest.TestCase):
+
+    def test_engines_match_reference(self):
+        mismatches = run_differential(behaviours=[RoundRobinAppend, BatchAssignment], seeds=range(2))
+
+        self.assertEqual(mismatches, [])
+
+    def test_same_workload_same_results(self):
+        workload = random_workload(3)
+
+        self.assertEqual(run_engine(run_tick, workload, RoundRobinAppend),
+                         run_engine(run_tick, random_workload(3), RoundRobinAppend))
+
+    def test_errors_compared(self):
+        workload = Workload("empty fleet", 5, 0, 10, [ElevatorCall(0, 0, 3, 1)])
+
+        reference = run_engine(run_tick, workload, RoundRobinAppend)
+
+        self.assertEqual(reference[0], "error")
+        self.assertEqual(reference[1], "ZeroDivisionError")
+        self.assertIsNone(difference(reference, run_engine(ENGINES["event_driven"], workload, RoundRobinAppend)))
+        self.assertEqual(difference(reference, ("ok", [], {})),
+                         "reference gave ZeroDivisionError(integer modulo by zero) but candidate gave 0 actions")
+
+    def test_mismatch_shrunk(self):
+        workload = Workload("broken", 10, 2, 4,
+                            [ElevatorCall(0, 0, 5, 2), ElevatorCall(4, 3, 9, 3), ElevatorCall(9, 2, 1, 1),
+                             ElevatorCall(12, 3, 6, 4), ElevatorCall(20, 7, 0, 1)])
+
+        with patch.dict(ENGINES, {"broken": run_losing_calls}):
+            mismatch = compare("broken", RoundRobinAppend, workload)
+
+        self.assertEqual(mismatch.workload.calls, [ElevatorCall(0, 3, 0, 1)])
+        self.assertEqual(mismatch.original_calls, 5)
+        self.assertEqual(mismatch.reproduction(), "[ElevatorCall(time=0, call_floor=3, destination_floor=0, people=1)]")
+
+    def test_shrink(self):
+        calls = [ElevatorCall(time, time % 4, 3, 1 + time % 3) for time in range(0, 50, 5)]
+
+        # fails whenever at least 4 people call from above floor 1
+        shrunk = shrink(calls, lambda calls: sum(call.people for call in calls if call.call_floor > 1) >= 4)
+
+        self.assertEqual(sum(call.people for call in shrunk), 4)
+        self.assertTrue(all(call.call_floor == 2 and call.destination_floor == 0 for call in shrunk))
+        self.assertEqual([call.time for call in shrunk], sorted(call.time for call in shrunk))
@@ -0,0 +1,70 @@
+import random
+import unittest
+
+from distributions import Distribution, Histogram, QuantileSketch, merge_distributions
+
+
+class TestDistributions(unittest.TestCase):
+
+    def test_histogram_buckets(self):
+        histogram = Histogram(bucket_width=10, bucket_count=3)
+
+        histogram.add(0)
+        histogram.add(15, count=2)
+        histogram.add(45)
+
+        self.assertEqual(histogram.buckets(), [(0, 10, 1), (10, 20, 2), (20, 30, 0), (30, None, 1)])
+        self.assertEqual(histogram.count, 4)
+        self.assertEqual(histogram.mean(), 75 / 4)
+        self.assertEqual((histogram.minimum, histogram.maximum), (0, 45))
+
+    def test_histogram_rejects_different_buckets(self):
+        with self.assertRaises(ValueError):
+            Histogram(bucket_width=10).merge(Histogram(bucket_width=5))
+
+    def test_sketch_within_relative_accuracy(self):
+        rng = random.Random(0)
+        values = sorted(rng.randrange(1, 5000) for _ in range(10001))
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        for value in values:
+            sketch.add(value)
+
+        for fraction in [0, 0.25, 0.5, 0.95, 0.99, 1]:
+            expected = values[int(fraction * (len(values) - 1))]
+            self.assertAlmostEqual(sketch.quantile(fraction), expected, delta=expected * 0.01)
+
+    def test_sketch_memory_is_bounded(self):
+        sketch = QuantileSketch(max_buckets=100)
+        for value in range(1, 100000):
+            sketch.add(value)
+
+        self.assertEqual(len(sketch.buckets), 100)
+        self.assertEqual(sketch.count, 99999)
+
+    def test_merge_same_as_adding_everything(self):
+        rng = random.Random(1)
+        values = [rng.randrange(0, 200) for _ in range(1000)]
+        everything = Distribution()
+        parts = [Distribution(), Distribution(), Distribution()]
+        for index, value in enumerate(values):
+            everything.add(value)
+            parts[index % 3].add(value)
+
+        merged = merge_distributions(parts)
+
+        self.assertEqual(merged, everything)
+        self.assertEqual(merged.percentile(95), everything.percentile(95))
+        self.assertEqual(merged.count, 1000)
+
+    def test_weighted_add(self):
+        grouped = Distribution()
+        grouped.add(12, count=3)
+        separate = Distribution()
+        for _ in range(3):
+            separate.add(12)
+
+        self.assertEqual(grouped, separate)
+
+    def test_percentile_of_nothing(self):
+        self.assertIsNone(Distribution().percentile(95))
+        self.assertEqual(merge_distributions([]).count, 0)
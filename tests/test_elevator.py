@@ -1,5 +1,6 @@
 import unittest
 
+from destinationqueue import DestinationQueue
 from elevator import Elevator, Action, ActionTimings, DoorState
 
 
@@ -67,4 +68,56 @@ class TestElevator(unittest.TestCase):
         self.assertEqual(result, Action.OPEN_DOORS)
         self.assertEqual(e.door_state, DoorState.OPEN)
         self.assertEqual(len(e.destinations), 0)
-        self.assertEqual(e.blocked_for, ActionTimings[Action.OPEN_DOORS]-1)
\ No newline at end of file
+        self.assertEqual(e.blocked_for, ActionTimings[Action.OPEN_DOORS]-1)
+
+    def test_time_until_next_event_idle(self):
+        e = Elevator(current_floor=3)
+
+        self.assertEqual(e.time_until_next_event(), None)
+
+    def test_time_until_next_event_blocked(self):
+        e = Elevator(current_floor=3)
+        e.destinations.append(8)
+        e.blocked_for = 4
+
+        self.assertEqual(e.time_until_next_event(), 4)
+
+    def test_time_until_next_event_moving(self):
+        e = Elevator(current_floor=3)
+        e.destinations.append(8)
+
+        self.assertEqual(e.time_until_next_event(), 5)
+
+    def test_fast_forward_blocked(self):
+        e = Elevator(current_floor=3)
+        e.destinations.append(8)
+        e.blocked_for = 4
+        e.door_state = DoorState.OPEN
+
+        result = e.fast_forward(3)
+
+        self.assertEqual(result, None)
+        self.assertEqual(e.blocked_for, 1)
+        self.assertEqual(e.current_floor, 3)
+        self.assertEqual(e.door_state, DoorState.OPEN)
+
+    def test_fast_forward_down(self):
+        e = Elevator(current_floor=8)
+        e.destinations.append(3)
+        e.door_state = DoorState.OPEN
+
+        result = e.fast_forward(4)
+
+        self.assertEqual(result, Action.MOVE_DOWN)
+        self.assertEqual(e.current_floor, 4)
+        self.assertEqual(e.door_state, DoorState.CLOSED)
+        self.assertEqual(e.destinations, [3])
+
+    def test_destinations_assigned_from_list(self):
+        e = Elevator(current_floor=0)
+        e.destinations = [0, 3]
+
+        e.iterate()
+
+        self.assertIsInstance(e.destinations, DestinationQueue)
+        self.assertEqual(e.destinations, [3])
@@ -1,11 +1,18 @@
+import random
 import unittest
+from unittest.mock import patch
 
+from arrivaltimes import ArrivalTimes
 from elevator import Elevator
 from elevatorbehaviour import (
+    BatchAssignment,
     ClosestCallPrepend,
+    EarliestArrival,
     LeastBusyAppend,
+    RoundRobinAppend,
     StandardElevator
 )
+from tests.test_sweeproute import insert_floor_considering_direction
 
 
 class TestElevatorCall(unittest.TestCase):
@@ -153,5 +160,116 @@ class TestElevatorCall(unittest.TestCase):
         self.assertEqual(result, 1)
         self.assertEqual(destinations, expected)
 
+    def test_insert_floor_considering_direction_same_as_walking_the_list(self):
+        behaviour = StandardElevator()
+        rng = random.Random(2)
+
+        for _ in range(500):
+            destinations = [rng.randrange(10) for _ in range(rng.randrange(1, 10))]
+            expected = list(destinations)
+            floor = rng.randrange(10)
+            direction = rng.choice([behaviour.Direction.UP, behaviour.Direction.DOWN, None])
+            after = rng.randrange(len(destinations))
+
+            result = behaviour.insert_floor_considering_direction(destinations, floor, direction, after=after)
+
+            self.assertEqual(result, insert_floor_considering_direction(expected, floor, direction, after=after))
+            self.assertEqual(destinations, expected)
+
+    def test_earliest_elevator_to_floor(self):
+        behaviour = EarliestArrival()
+        e1 = Elevator(current_floor=2)
+        e1.destinations = [9]
+        e2 = Elevator(current_floor=8)
+        e2.destinations = [1, 5]
+        e3 = Elevator(current_floor=0)
+        e3.blocked_for = 3
+        # 7 + 5 + 2, 7 + 5 + 4 + 5 + 2 and 3 + 7 steps away
+        result = behaviour.earliest_elevator_to_floor([e1, e2, e3], 7)
+
+        self.assertEqual(result, 2)
 
+    def test_earliest_elevator_to_floor_no_elevators(self):
+        behaviour = EarliestArrival()
+        result = behaviour.earliest_elevator_to_floor([], 7)
+
+        self.assertEqual(result, None)
 
+    def test_earliest_arrival_joins_last_stop(self):
+        behaviour = EarliestArrival()
+        elevator = Elevator()
+        elevator.destinations = [4, 6]
+        result = behaviour.ingest_call([elevator], 6, 2)
+
+        self.assertEqual(result, 0)
+        self.assertEqual(elevator.destinations, [4, 6, 2])
+
+    def test_ingest_calls_one_at_a_time_by_default(self):
+        elevators = [Elevator(), Elevator(), Elevator()]
+        expected_elevators = [Elevator(), Elevator(), Elevator()]
+        behaviour = RoundRobinAppend()
+        expected_behaviour = RoundRobinAppend()
+
+        result = behaviour.ingest_calls(elevators, [(0, 5), (0, 3), (2, 4)])
+
+        expected = [expected_behaviour.ingest_call(expected_elevators, 0, 5),
+                    expected_behaviour.ingest_call(expected_elevators, 0, 3),
+                    expected_behaviour.ingest_call(expected_elevators, 2, 4)]
+        self.assertEqual(result, expected)
+        self.assertEqual([list(e.destinations) for e in elevators], [list(e.destinations) for e in expected_elevators])
+
+    def test_batch_assignment_spreads_calls(self):
+        behaviour = BatchAssignment()
+        elevators = [Elevator(), Elevator(), Elevator()]
+
+        result = behaviour.ingest_calls(elevators, [(0, 5), (0, 3), (0, 5)])
+
+        # the repeated call is planned on its own, as its callers may not fit in with the first one
+        self.assertEqual(result, [0, 1, 2])
+        self.assertEqual([list(e.destinations) for e in elevators], [[0, 5], [0, 3], [0, 5]])
+
+    def test_batch_assignment_identical_calls_spread(self):
+        behaviour = BatchAssignment()
+        elevators = [Elevator() for _ in range(3)]
+
+        result = behaviour.ingest_calls(elevators, [(0, 20)] * 5)
+
+        # every elevator takes one call before any takes a second
+        self.assertEqual(sorted(result), [0, 0, 1, 1, 2])
+        self.assertEqual([list(e.destinations) for e in elevators], [[0, 20], [0, 20], [0, 20]])
+
+    def test_batch_assignment_shares_pickups(self):
+        behaviour = BatchAssignment()
+        elevator = Elevator()
+
+        result = behaviour.ingest_calls([elevator], [(0, 5), (0, 3), (2, 4)])
+
+        # 2 -> 4 is dropped off soonest, then both lobby calls are picked up at the same stop
+        self.assertEqual(result, [0, 0, 0])
+        self.assertEqual(elevator.destinations, [2, 4, 0, 3, 5])
+
+    def test_batch_assignment_single_call(self):
+        behaviour = BatchAssignment()
+        expected_behaviour = EarliestArrival()
+        elevators = [Elevator(current_floor=5), Elevator(current_floor=1)]
+        expected_elevators = [Elevator(current_floor=5), Elevator(current_floor=1)]
+
+        self.assertEqual(behaviour.ingest_calls(elevators, [(2, 7)]),
+                         [expected_behaviour.ingest_call(expected_elevators, 2, 7)])
+        self.assertEqual([list(e.destinations) for e in elevators], [list(e.destinations) for e in expected_elevators])
+
+    def test_batch_assignment_looks_up_each_route_once_a_round(self):
+        calls = [(0, floor) for floor in range(1, 13)]
+        lookups = {}
+        for behaviour in [EarliestArrival(), BatchAssignment()]:
+            elevators = [Elevator(current_floor=floor) for floor in range(6)]
+            for elevator in elevators:
+                elevator.destinations.extend([10, 2])
+            with patch.object(ArrivalTimes, "time_until", autospec=True,
+                              side_effect=ArrivalTimes.time_until) as time_until:
+                behaviour.ingest_calls(elevators, calls)
+            lookups[type(behaviour)] = time_until.call_count
+
+        # one at a time looks at every route for every call, while the 12 calls over 6 elevators take 2 rounds
+        self.assertEqual(lookups[EarliestArrival], 12 * 6)
+        self.assertEqual(lookups[BatchAssignment], 2 * 6)
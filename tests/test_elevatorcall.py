@@ -1,7 +1,7 @@
 import unittest
 from unittest.mock import patch
 
-from elevatorcall import generate_calls, random_0_weighted, clamped_log_normal
+from elevatorcall import ElevatorCall, generate_calls, random_0_weighted, clamped_log_normal, stream_calls
 
 
 class TestElevatorCall(unittest.TestCase):
@@ -75,3 +75,14 @@ class TestElevatorCall(unittest.TestCase):
         lognormvariate_mock.side_effect = lognormvariate_behaviour
         result = clamped_log_normal(1,2,5,10)
         self.assertEqual(result, 5)
+
+    @patch('elevatorcall.clamped_log_normal')
+    @patch('elevatorcall.random_0_weighted')
+    def test_stream_calls_is_lazy(self, random_0_weighted_mock, clamped_log_normal_mock):
+        clamped_log_normal_mock.return_value = 1
+        random_0_weighted_mock.side_effect = [0, 1, 2, 3]
+
+        result = stream_calls(start_time=0, end_time=1000000, floors=10)
+
+        self.assertEqual(next(result), ElevatorCall(time=0, call_floor=0, destination_floor=1, people=1))
+        self.assertEqual(next(result), ElevatorCall(time=1, call_floor=2, destination_floor=3, people=1))
@@ -1,13 +1,23 @@
+import contextlib
+import io
+import random
 import unittest
 from unittest.mock import MagicMock
 
 from elevator import Action, DoorState, Elevator
 from elevatoraction import ElevatorAction
-from elevatorbehaviour import RoundRobinAppend
-from elevatorcall import ElevatorCall
+from elevatorbehaviour import (
+    BatchAssignment,
+    ClosestCallPrepend,
+    EarliestArrival,
+    LeastBusyAppend,
+    RoundRobinAppend,
+    StandardElevator
+)
+from elevatorcall import ElevatorCall, generate_calls
 from elevatorsimulation import ElevatorSimulation
 from elevatorsystem import ElevatorSystem
-from person import Person
+from person import PassengerGroup, Person
 
 
 class TestElevatorSimulation(unittest.TestCase):
@@ -39,13 +49,61 @@ class TestElevatorSimulation(unittest.TestCase):
         self.assertEqual(e.calls, calls)
         self.assertEqual(e.iterate.call_count, 4)
         self.assertEqual(e.total_people, 5)
-        self.assertEqual(len(e.people_waiting_at_floors[0]), 5)
-        for person in e.people_waiting_at_floors[0]:
-            self.assertEqual(person.assigned_elevator, 1)
-            self.assertEqual(person.call_time, 3)
-            self.assertEqual(person.target_floor,4)
-            self.assertTrue(person.entrance_time is None)
-            self.assertTrue(person.exit_time is None)
+        self.assertEqual(e.people_waiting_at_floor(0), 5)
+        self.assertEqual(len(e.people_waiting_at_floors[0][1]), 1)
+        group = e.people_waiting_at_floors[0][1][0]
+        self.assertEqual(group.count, 5)
+        self.assertEqual(group.assigned_elevator, 1)
+        self.assertEqual(group.call_time, 3)
+        self.assertEqual(group.target_floor,4)
+        self.assertTrue(group.entrance_time is None)
+
+    def test_simulate_calls_same_time_as_batch(self):
+        system = MagicMock()
+        system.elevators = []
+        system.total_floors = 10
+        e = ElevatorSimulation(elevator_system=system)
+
+        system.ingest_call.return_value = 2
+        system.ingest_calls.return_value = [1, 0]
+
+        calls = [ElevatorCall(time=0, call_floor=0, destination_floor=4, people=2),
+                 ElevatorCall(time=0, call_floor=3, destination_floor=1, people=1),
+                 ElevatorCall(time=2, call_floor=0, destination_floor=6, people=1)]
+
+        e.simulate_calls(calls, finish=False)
+
+        system.ingest_calls.assert_called_once_with([(0, 4), (3, 1)])
+        system.ingest_call.assert_called_once_with(0, 6)
+        self.assertEqual(e.calls, calls)
+        self.assertEqual(e.time, 2)
+        self.assertEqual(e.total_people, 4)
+        self.assertEqual(e.people_waiting_at_floors[0][1][0].count, 2)
+        self.assertEqual(e.people_waiting_at_floors[3][0][0].count, 1)
+        self.assertEqual(e.people_waiting_at_floors[0][2][0].call_time, 2)
+
+    def test_simulate_calls_verbose(self):
+        calls = [ElevatorCall(time=0, call_floor=0, destination_floor=2, people=1)]
+        for verbose, expected in [(True, "All elevator actions completed\n"), (False, "")]:
+            system = ElevatorSystem(elevators=[Elevator()], behaviour=RoundRobinAppend(), total_floors=10)
+            output = io.StringIO()
+
+            with contextlib.redirect_stdout(output):
+                ElevatorSimulation(elevator_system=system).simulate_calls(calls, verbose=verbose)
+
+            self.assertEqual(output.getvalue(), expected)
+
+    def test_simulate_calls_not_keeping_calls(self):
+        system = ElevatorSystem(elevators=[Elevator()], behaviour=RoundRobinAppend(), total_floors=10)
+        e = ElevatorSimulation(elevator_system=system, keep_calls=False)
+
+        calls = (ElevatorCall(time=t, call_floor=0, destination_floor=2, people=1) for t in range(3))
+
+        e.simulate_calls(calls)
+
+        self.assertEqual(len(e.calls), 0)
+        self.assertEqual(e.total_people, 3)
+        self.assertEqual(e.people_served, 3)
 
     def test_iterate_simulation_over(self):
         elevator1 = MagicMock()
@@ -102,13 +160,14 @@ class TestElevatorSimulation(unittest.TestCase):
         person3 = Person(call_time=3, target_floor=2, assigned_elevator=0)
         person3.entrance_time=6
 
-        e.people_in_elevators[0] = [person1, person2, person3]
+        e.people_in_elevators[0] = {2: [person1, person3], 3: [person2]}
+        e.occupants[0] = 3
 
         result = e.iterate()
 
         self.assertFalse(result)
-        self.assertEqual(len(e.people_in_elevators[0]), 1)
-        self.assertEqual(e.people_in_elevators[0][0], person2)
+        self.assertEqual(e.people_in_elevator(0), 1)
+        self.assertEqual(e.people_in_elevators[0][3], [person2])
         self.assertEqual(e.people_served,2)
         self.assertEqual(e.total_waiting_time, 5)
         self.assertEqual(e.average_time_waiting, 2.5)
@@ -131,18 +190,18 @@ class TestElevatorSimulation(unittest.TestCase):
         person2 = Person(call_time=1, target_floor=4, assigned_elevator=0)
         person3 = Person(call_time=2, target_floor=5, assigned_elevator=1)
 
-        e.people_waiting_at_floors[2] = [person1, person2, person3]
+        e.people_waiting_at_floors[2] = {0: [person1, person2], 1: [person3]}
 
         result = e.iterate()
 
         self.assertFalse(result)
-        self.assertEqual(len(e.people_in_elevators[0]), 2)
-        for person in e.people_in_elevators[0]:
+        self.assertEqual(e.people_in_elevator(0), 2)
+        for person in [person1, person2]:
             self.assertEqual(person.entrance_time, 10)
-        self.assertEqual(e.people_in_elevators[0][0], person1)
-        self.assertEqual(e.people_in_elevators[0][1], person2)
-        self.assertEqual(len(e.people_waiting_at_floors[2]),1)
-        self.assertEqual(e.people_waiting_at_floors[2][0], person3)
+        self.assertEqual(e.people_in_elevators[0][3], [person1])
+        self.assertEqual(e.people_in_elevators[0][4], [person2])
+        self.assertEqual(e.people_waiting_at_floor(2), 1)
+        self.assertEqual(e.people_waiting_at_floors[2][1], [person3])
 
     def test_iterate_people_turned_away(self):
         elevator1 = MagicMock()
@@ -160,24 +219,80 @@ class TestElevatorSimulation(unittest.TestCase):
         person2 = Person(call_time=1, target_floor=4, assigned_elevator=0)
         person3 = Person(call_time=2, target_floor=5, assigned_elevator=1)
 
-        e.people_waiting_at_floors[2] = [person1, person2, person3]
+        e.people_waiting_at_floors[2] = {0: [person1, person2], 1: [person3]}
 
         result = e.iterate()
 
         self.assertFalse(result)
-        self.assertEqual(len(e.people_in_elevators[0]), 1)
-        self.assertEqual(e.people_in_elevators[0][0], person1)
-        self.assertEqual(e.people_in_elevators[0][0].entrance_time, 10)
-        self.assertEqual(len(e.people_waiting_at_floors[2]),1)
-        self.assertEqual(e.people_waiting_at_floors[2][0], person3)
+        self.assertEqual(e.people_in_elevator(0), 1)
+        self.assertEqual(e.people_in_elevators[0][3], [person1])
+        self.assertEqual(person1.entrance_time, 10)
+        self.assertEqual(e.people_waiting_at_floor(2), 1)
+        self.assertEqual(e.people_waiting_at_floors[2][1], [person3])
         self.assertEqual(e.people_turned_away, 1)
 
+    def test_iterate_group_split_when_full(self):
+        elevator1 = MagicMock()
+
+        elevator1.iterate.return_value = Action.BLOCKED
+        elevator1.door_state = DoorState.OPEN
+        elevator1.current_floor = 2
+        elevator1.capacity = 5
+
+        system = ElevatorSystem([elevator1], None, 10)
+        e = ElevatorSimulation(system)
+        e.time = 10
+
+        group1 = PassengerGroup(call_time=0, target_floor=3, assigned_elevator=0, count=3)
+        group2 = PassengerGroup(call_time=1, target_floor=4, assigned_elevator=0, count=4)
+        group3 = PassengerGroup(call_time=2, target_floor=5, assigned_elevator=0, count=2)
+
+        e.people_waiting_at_floors[2] = {0: [group1, group2, group3]}
+
+        e.iterate()
+
+        self.assertEqual(e.people_in_elevator(0), 5)
+        self.assertEqual(e.occupants[0], 5)
+        self.assertEqual(e.people_in_elevators[0][3], [group1])
+        self.assertEqual(e.people_in_elevators[0][4][0].count, 2)
+        self.assertEqual(e.people_in_elevators[0][4][0].entrance_time, 10)
+        self.assertEqual(e.people_waiting_at_floor(2), 0)
+        self.assertEqual(e.people_turned_away, 4)
+
+    def test_iterate_group_exit(self):
+        elevator1 = MagicMock()
+
+        elevator1.iterate.return_value = Action.BLOCKED
+        elevator1.door_state = DoorState.OPEN
+        elevator1.current_floor = 2
+
+        system = ElevatorSystem([elevator1], None, 10)
+        e = ElevatorSimulation(system)
+        e.time = 10
+
+        group = PassengerGroup(call_time=1, target_floor=2, assigned_elevator=0, count=4)
+        group.entrance_time = 4
+        e.people_in_elevators[0] = {2: [group]}
+        e.occupants[0] = 4
+
+        e.iterate()
+
+        self.assertEqual(e.people_served, 4)
+        self.assertEqual(e.total_waiting_time, 12)
+        self.assertEqual(e.total_time_in_elevator, 24)
+        self.assertEqual(e.average_time_waiting, 3)
+        self.assertEqual(e.average_time_in_elevator, 6)
+        self.assertEqual(e.waiting_times.count, 4)
+        self.assertEqual(e.waiting_times.percentile(95), 3)
+        self.assertEqual(e.statistics()["time_in_elevator_p99"], 6)
+
     def test_reset_state(self):
         system = ElevatorSystem([Elevator()], None, 10)
         e = ElevatorSimulation(system)
 
-        e.people_waiting_at_floors = [[Person(call_time=1,target_floor=1,assigned_elevator=1)]]
-        e.people_in_elevators = [[Person(call_time=2,target_floor=2,assigned_elevator=2)]]
+        e.people_waiting_at_floors = [{1: [Person(call_time=1,target_floor=1,assigned_elevator=1)]}]
+        e.people_in_elevators = [{2: [Person(call_time=2,target_floor=2,assigned_elevator=2)]}]
+        e.occupants = [1]
 
         e.time = 5
         e.calls = [ElevatorCall(1,2,3,4)]
@@ -189,11 +304,13 @@ class TestElevatorSimulation(unittest.TestCase):
         e.total_time_in_elevator = 9
         e.average_time_waiting = 10
         e.average_time_in_elevator = 11
+        e.waiting_times.add(12)
+        e.times_in_elevator.add(13)
 
         e.reset_state()
 
-        self.assertEqual(len(e.people_waiting_at_floors[0]), 0)
-        self.assertEqual(len(e.people_in_elevators[0]), 0)
+        self.assertEqual(e.people_waiting_at_floor(0), 0)
+        self.assertEqual(e.people_in_elevator(0), 0)
         self.assertEqual(e.time, 0)
         self.assertEqual(len(e.calls), 0)
         self.assertEqual(len(e.actions), 0)
@@ -204,6 +321,17 @@ class TestElevatorSimulation(unittest.TestCase):
         self.assertEqual(e.total_time_in_elevator, 0)
         self.assertEqual(e.average_time_waiting, 0)
         self.assertEqual(e.average_time_in_elevator, 0)
+        self.assertEqual(e.waiting_times.count, 0)
+        self.assertEqual(e.times_in_elevator.count, 0)
+
+    def test_reset_state_leaves_callers_calls(self):
+        calls = [ElevatorCall(1,2,3,4)]
+        e = ElevatorSimulation(ElevatorSystem([Elevator()], None, 10), calls=calls)
+
+        e.reset_state()
+
+        self.assertEqual(len(e.calls), 0)
+        self.assertEqual(len(calls), 1)
 
     # Integration test for a whole example simulation flow
     def test_simulate_calls_end_to_end(self):
@@ -243,8 +371,8 @@ class TestElevatorSimulation(unittest.TestCase):
 
         self.assertEqual(simulation.calls, calls)
         self.assertEqual(simulation.actions, expected_actions)
-        self.assertEqual(len(simulation.people_waiting_at_floors[0]), 0)
-        self.assertEqual(len(simulation.people_in_elevators[0]), 0)
+        self.assertEqual(simulation.people_waiting_at_floor(0), 0)
+        self.assertEqual(simulation.people_in_elevator(0), 0)
         self.assertEqual(simulation.time, 76)
         self.assertEqual(simulation.total_people, 9)
         self.assertEqual(simulation.people_turned_away, 0)
@@ -253,3 +381,110 @@ class TestElevatorSimulation(unittest.TestCase):
         self.assertEqual(simulation.total_time_in_elevator, 108)
         self.assertAlmostEqual(simulation.average_time_waiting, 20.222, 3)
         self.assertEqual(simulation.average_time_in_elevator, 12.0)
+
+    def test_simulate_calls_event_driven_end_to_end(self):
+        elevators = [Elevator(capacity=10, current_floor=0) for _ in range(2)]
+        system = ElevatorSystem(elevators=elevators, behaviour=RoundRobinAppend(), total_floors=10)
+        simulation = ElevatorSimulation(elevator_system=system, event_driven=True)
+
+        calls = [
+            ElevatorCall(time=1, call_floor=0, destination_floor=2, people=2),
+            ElevatorCall(time=2, call_floor=1, destination_floor=3, people=2),
+            ElevatorCall(time=3, call_floor=1, destination_floor=0, people=5)
+        ]
+
+        simulation.simulate_calls(calls)
+
+        self.assertEqual(len(simulation.actions), 13)
+        self.assertEqual(simulation.actions[6], ElevatorAction(time=31, elevator_number=1, action=Action.MOVE_UP, floor=1))
+        self.assertEqual(simulation.time, 76)
+        self.assertEqual(simulation.people_served, 9)
+        self.assertEqual(simulation.total_waiting_time, 182)
+        self.assertEqual(simulation.total_time_in_elevator, 108)
+
+    def test_simulate_calls_event_driven_matches_tick(self):
+        for behaviour in [RoundRobinAppend, ClosestCallPrepend, LeastBusyAppend, StandardElevator]:
+            random.seed(4321)
+            calls = generate_calls(start_time=0, end_time=1500, floors=20)
+            results = []
+            for event_driven in [False, True]:
+                elevators = [Elevator(capacity=4, current_floor=0) for _ in range(3)]
+                system = ElevatorSystem(elevators=elevators, behaviour=behaviour(), total_floors=20)
+                simulation = ElevatorSimulation(elevator_system=system, event_driven=event_driven)
+                simulation.simulate_calls(calls)
+                results.append(simulation)
+
+            tick, event = results
+            self.assertEqual(tick.actions, event.actions)
+            self.assertEqual(tick.time, event.time)
+            self.assertEqual(tick.people_served, event.people_served)
+            self.assertEqual(tick.people_turned_away, event.people_turned_away)
+            self.assertEqual(tick.total_waiting_time, event.total_waiting_time)
+            self.assertEqual(tick.total_time_in_elevator, event.total_time_in_elevator)
+
+    def test_skip_idle_elevators_matches_stepping_all(self):
+        for behaviour in [RoundRobinAppend, ClosestCallPrepend, LeastBusyAppend, StandardElevator]:
+            random.seed(1234)
+            calls = generate_calls(start_time=0, end_time=1500, floors=20)
+            # people going to the floor they called from get on and off without the elevator moving
+            calls.append(ElevatorCall(time=1600, call_floor=5, destination_floor=5, people=3))
+            results = []
+            for skip_idle_elevators in [False, True]:
+                elevators = [Elevator(capacity=4, current_floor=0) for _ in range(6)]
+                system = ElevatorSystem(elevators=elevators, behaviour=behaviour(), total_floors=20)
+                simulation = ElevatorSimulation(elevator_system=system, skip_idle_elevators=skip_idle_elevators)
+                simulation.simulate_calls(calls)
+                results.append(simulation)
+
+            every, active = results
+            self.assertEqual(every.actions, active.actions)
+            self.assertEqual(every.statistics(), active.statistics())
+
+    def test_skip_idle_elevators_active_set(self):
+        system = ElevatorSystem([Elevator(), Elevator(), Elevator()], RoundRobinAppend(), 10)
+        simulation = ElevatorSimulation(system, skip_idle_elevators=True)
+
+        simulation.iterate()
+
+        self.assertEqual(simulation.active_elevators, set())
+
+        simulation.add_call(ElevatorCall(time=1, call_floor=2, destination_floor=4, people=1))
+
+        self.assertEqual(simulation.active_elevators, {1})
+
+        simulation.advance_to(100)
+
+        self.assertEqual(simulation.active_elevators, set())
+        self.assertEqual(simulation.people_served, 1)
+
+    def test_skip_idle_elevators_other_elevator_given_destinations(self):
+        # a behaviour that also sends the next elevator along to the call floor, without assigning it the call
+        class SendsTwo(RoundRobinAppend):
+            def ingest_call(self, elevators, call_floor, destination_floor):
+                index = super().ingest_call(elevators, call_floor, destination_floor)
+                elevators[(index + 1) % len(elevators)].destinations.append(call_floor)
+                return index
+
+        calls = generate_calls(0, 600, 20, random.Random(6))
+        results = []
+        for skip_idle_elevators in [False, True]:
+            system = ElevatorSystem([Elevator(capacity=4) for _ in range(4)], SendsTwo(), 20)
+            simulation = ElevatorSimulation(system, skip_idle_elevators=skip_idle_elevators)
+            simulation.simulate_calls(calls, verbose=False)
+            results.append(simulation)
+
+        every, active = results
+        self.assertEqual(every.actions, active.actions)
+        self.assertEqual(every.statistics(), active.statistics())
+
+    def test_burst_of_identical_calls_over_capacity(self):
+        # more people making the same call at once than one elevator can take
+        calls = [ElevatorCall(time=0, call_floor=0, destination_floor=20, people=5) for _ in range(8)]
+
+        for behaviour in [RoundRobinAppend, EarliestArrival, BatchAssignment]:
+            system = ElevatorSystem([Elevator(capacity=10) for _ in range(6)], behaviour(), 21)
+            simulation = ElevatorSimulation(system)
+            simulation.simulate_calls(calls, verbose=False)
+
+            self.assertEqual(simulation.people_served, 40)
+            self.assertEqual(simulation.people_turned_away, 0)
@@ -25,3 +25,20 @@ class TestElevatorSystem(unittest.TestCase):
 
         self.assertRaises(ValueError, e.ingest_call, 5, 20)
 
+    def test_ingest_calls(self):
+        behaviour = MagicMock()
+        behaviour.ingest_calls.return_value = [1, 0]
+        e = ElevatorSystem(total_floors=10, behaviour=behaviour, elevators=[])
+
+        result = e.ingest_calls([(0, 5), (3, 2)])
+
+        self.assertEqual(result, [1, 0])
+        behaviour.ingest_calls.assert_called_with([], [(0, 5), (3, 2)])
+
+    def test_ingest_calls_invalid_floor(self):
+        behaviour = MagicMock()
+        e = ElevatorSystem(total_floors=10, behaviour=behaviour, elevators=[])
+
+        self.assertRaises(ValueError, e.ingest_calls, [(0, 5), (5, 20)])
+        # none of the calls are sent if any of them are invalid
+        behaviour.ingest_calls.assert_not_called()
@@ -0,0 +1,136 @@
+import contextlib
+import gzip
+import io
+import json
+import math
+import os
+import random
+import tempfile
+import unittest
+
+from elevator import Action, Elevator
+from elevatoraction import ElevatorAction
+from elevatorbehaviour import RoundRobinAppend
+from elevatorcall import ElevatorCall, generate_calls
+from elevatorsimulation import ElevatorSimulation
+from elevatorsystem import ElevatorSystem
+from actionlog import ActionLog
+from exporters import (
+    ActionWriter,
+    CallWriter,
+    STATISTICS_COLUMNS,
+    TableWriter,
+    export_actions,
+    read_table,
+    write_statistics
+)
+
+
+class TestExporters(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_actions_csv(self):
+        with ActionWriter(self.path("actions.csv"), chunk_size=2) as writer:
+            writer.record(0, 1, Action.MOVE_UP, 1)
+            writer.append(ElevatorAction(1, 1, Action.OPEN_DOORS, 1))
+            writer.record(2, 0, Action.OPEN_DOORS_LOBBY, 0)
+
+        with open(self.path("actions.csv")) as file:
+            lines = file.read().splitlines()
+
+        self.assertEqual(lines, ["time,elevator,action,floor", "0,1,MOVE_UP,1", "1,1,OPEN_DOORS,1",
+                                 "2,0,OPEN_DOORS_LOBBY,0"])
+        self.assertEqual(len(writer), 3)
+
+    def test_export_actions_same_as_streaming(self):
+        log = ActionLog()
+        for time in range(10):
+            log.record(time, time % 3, Action.MOVE_DOWN, 10 - time)
+        with ActionWriter(self.path("streamed.csv"), chunk_size=4) as writer:
+            for action in log:
+                writer.append(action)
+
+        export_actions(log, self.path("exported.csv"))
+
+        with open(self.path("streamed.csv")) as streamed, open(self.path("exported.csv")) as exported:
+            self.assertEqual(streamed.read(), exported.read())
+
+    def test_calls_json_lines_compressed(self):
+        with CallWriter(self.path("calls.jsonl.gz"), format="jsonl", compress=True) as writer:
+            writer.append(ElevatorCall(3, 0, 7, 2))
+
+        with gzip.open(self.path("calls.jsonl.gz"), "rt") as file:
+            rows = [json.loads(line) for line in file]
+
+        self.assertEqual(rows, [{"time": 3, "call_floor": 0, "destination_floor": 7, "people": 2}])
+
+    def test_binary_round_trip(self):
+        for compress in [False, True]:
+            path = self.path("table" + str(compress))
+            with TableWriter(path, (("a", "q"), ("b", "d")), format="binary", compress=compress,
+                             chunk_size=3) as writer:
+                for i in range(10):
+                    writer.write_row(i, i / 2)
+
+            table = read_table(path)
+
+            self.assertEqual(list(table["a"]), list(range(10)))
+            self.assertEqual(list(table["b"]), [i / 2 for i in range(10)])
+
+    def test_action_writer_extend(self):
+        expected = ActionLog()
+        with ActionWriter(self.path("actions.bin"), format="binary", chunk_size=3) as writer:
+            for t in range(4):
+                writer.extend([t, t], [0, 1], [Action.MOVE_DOWN.value] * 2, [9 - t, 8 - t])
+                expected.extend([t, t], [0, 1], [Action.MOVE_DOWN.value] * 2, [9 - t, 8 - t])
+            self.assertEqual(len(writer), 8)
+
+        table = read_table(self.path("actions.bin"))
+        self.assertEqual(list(table["time"]), list(expected.times))
+        self.assertEqual(list(table["floor"]), list(expected.floors))
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            TableWriter(self.path("table"), (("a", "q"),), format="xml")
+
+    def test_statistics(self):
+        simulation = ElevatorSimulation(ElevatorSystem([Elevator()], RoundRobinAppend(), 10))
+        statistics = simulation.statistics()
+
+        self.assertEqual(list(statistics), [name for name, _ in STATISTICS_COLUMNS])
+
+        write_statistics(statistics, self.path("statistics.jsonl"), format="jsonl")
+        write_statistics(statistics, self.path("statistics.bin"), format="binary")
+
+        with open(self.path("statistics.jsonl")) as file:
+            self.assertEqual(json.loads(file.read()), statistics)
+        self.assertTrue(math.isnan(read_table(self.path("statistics.bin"))["waiting_time_p95"][0]))
+
+    def test_streams_while_simulating(self):
+        calls = generate_calls(0, 200, 10, rng=random.Random(2))
+        expected = ElevatorSimulation(ElevatorSystem([Elevator(), Elevator()], RoundRobinAppend(), 10))
+        actions = ActionWriter(self.path("actions.bin"), format="binary", chunk_size=16)
+        call_writer = CallWriter(self.path("calls.csv"))
+        simulation = ElevatorSimulation(ElevatorSystem([Elevator(), Elevator()], RoundRobinAppend(), 10),
+                                        actions=actions, calls=call_writer)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            expected.simulate_calls(calls)
+            simulation.simulate_calls(calls)
+        actions.close()
+        call_writer.close()
+
+        table = read_table(self.path("actions.bin"))
+        self.assertEqual(list(table["time"]), list(expected.actions.times))
+        self.assertEqual(list(table["action"]), list(expected.actions.action_codes))
+        with open(self.path("calls.csv")) as file:
+            self.assertEqual(len(file.read().splitlines()), len(calls) + 1)
+        self.assertEqual(simulation.statistics(), expected.statistics())
@@ -0,0 +1,45 @@
+import unittest
+
+from elevator import Action, ActionTimings, DoorState, Elevator
+from fleetarrays import FleetArrays, NO_ACTION
+
+
+class TestFleetArrays(unittest.TestCase):
+
+    def test_step_matches_elevator(self):
+        fleet = FleetArrays((2,), current_floor=1)
+        scalar = Elevator(current_floor=1)
+        for elevator in [fleet.elevators[1], scalar]:
+            elevator.destinations.append(3)
+            elevator.destinations.append(0)
+
+        for _ in range(45):
+            action = scalar.iterate()
+            actions = fleet.step()
+
+            self.assertEqual(actions[0], NO_ACTION)
+            self.assertEqual(actions[1], NO_ACTION if action is None else action.value)
+            self.assertEqual(fleet.elevators[1].current_floor, scalar.current_floor)
+            self.assertEqual(fleet.elevators[1].blocked_for, scalar.blocked_for)
+            self.assertEqual(fleet.elevators[1].door_state, scalar.door_state)
+            self.assertEqual(fleet.elevators[1].destinations, scalar.destinations)
+
+    def test_step_open_doors_lobby(self):
+        fleet = FleetArrays((1, 2))
+        fleet.elevators[0, 1].destinations = [0]
+
+        actions = fleet.step()
+
+        self.assertEqual(actions[0, 1], Action.OPEN_DOORS_LOBBY.value)
+        self.assertEqual(fleet.elevators[0, 1].blocked_for, ActionTimings[Action.OPEN_DOORS_LOBBY] - 1)
+        self.assertEqual(fleet.elevators[0, 1].door_state, DoorState.OPEN)
+        self.assertEqual(len(fleet.elevators[0, 1].destinations), 0)
+
+    def test_elevator_views(self):
+        fleet = FleetArrays((3,))
+
+        fleet.elevators[2].current_floor = 7
+        fleet.elevators[2].door_state = DoorState.OPEN
+
+        self.assertEqual(fleet.current_floor.tolist(), [0, 0, 7])
+        self.assertEqual(fleet.door_open.tolist(), [False, False, True])
@@ -0,0 +1,175 @@
+import contextlib
+import copy
+import io
+import os
+import random
+import tempfile
+import unittest
+
+from elevator import Action, Elevator
+from elevatorbehaviour import RoundRobinAppend, StandardElevator
+from elevatorcall import ElevatorCall, generate_calls
+from elevatorsimulation import ElevatorSimulation
+from elevatorsystem import ElevatorSystem
+from exporters import read_table
+from metrics import ELEVATOR_SERIES, SERIES, WindowedMetrics
+from vectorisedsimulation import VectorisedSimulation
+
+
+class TestMetrics(unittest.TestCase):
+
+    def simulate(self, event_driven, window=60, windows=1440, simulation_type=ElevatorSimulation):
+        random.seed(42)
+        calls = generate_calls(start_time=0, end_time=1800, floors=15)
+        elevators = [Elevator(capacity=4, current_floor=0) for _ in range(3)]
+        system = ElevatorSystem(elevators=elevators, behaviour=StandardElevator(), total_floors=15)
+        metrics = WindowedMetrics(len(elevators), window=window, windows=windows)
+        simulation = simulation_type(system, event_driven=event_driven, metrics=metrics)
+        with contextlib.redirect_stdout(io.StringIO()):
+            simulation.simulate_calls(calls)
+        return simulation, metrics
+
+    def test_invalid_windows(self):
+        with self.assertRaises(ValueError):
+            WindowedMetrics(2, window=0)
+        with self.assertRaises(ValueError):
+            WindowedMetrics(2, windows=0)
+
+    def test_ring_buffer_keeps_latest_windows(self):
+        metrics = WindowedMetrics(1, window=10, windows=3)
+
+        for time in [0, 5, 12, 25, 31, 47]:
+            metrics.call_ingested(time)
+
+        # windows 0 and 1 have been overwritten
+        self.assertEqual(metrics.series("calls"), [(20, 1), (30, 1), (40, 1)])
+
+        # too old to be kept
+        metrics.call_ingested(3)
+
+        self.assertEqual(metrics.series("calls"), [(20, 1), (30, 1), (40, 1)])
+
+        # skipping more windows than are kept clears all of them
+        metrics.call_ingested(100)
+
+        self.assertEqual(metrics.series("calls"), [(80, 0), (90, 0), (100, 1)])
+
+    def test_wait_and_occupancy(self):
+        metrics = WindowedMetrics(2, window=10)
+
+        metrics.people_boarded(2, 3, 2)
+        metrics.people_boarded(4, 1, 6)
+        metrics.people_served(15, 4)
+
+        self.assertEqual(metrics.series("people_boarded"), [(0, 4), (10, 0)])
+        self.assertEqual(metrics.series("mean_wait"), [(0, 3), (10, 0)])
+        self.assertEqual(metrics.series("max_wait"), [(0, 6), (10, 0)])
+        # 3 people from 2 to 4, 4 from 4 to 10 and 4 from 10 to 15, shared over 2 elevators
+        self.assertEqual(metrics.series("person_seconds"), [(0, 30), (10, 20)])
+        self.assertEqual(metrics.series("mean_occupancy"), [(0, 1.5), (10, 1.0)])
+
+    def test_totals_match_simulation(self):
+        for event_driven in [False, True]:
+            simulation, metrics = self.simulate(event_driven)
+
+            self.assertEqual(sum(value for _, value in metrics.series("calls")), len(simulation.calls))
+            self.assertEqual(sum(value for _, value in metrics.series("people_served")), simulation.people_served)
+            self.assertEqual(sum(value for _, value in metrics.series("people_turned_away")),
+                             simulation.people_turned_away)
+            self.assertEqual(sum(value for _, value in metrics.series("total_wait")), simulation.total_waiting_time)
+            self.assertEqual(sum(value for _, value in metrics.series("person_seconds")),
+                             simulation.total_time_in_elevator)
+            for (_, mean_wait), (_, max_wait) in zip(metrics.series("mean_wait"), metrics.series("max_wait")):
+                self.assertLessEqual(mean_wait, max_wait)
+
+    def test_reset_state_clears_metrics(self):
+        simulation, metrics = self.simulate(event_driven=False)
+        simulation.reset_state()
+        # a fresh simulation starting from where the elevators and behaviour were left
+        fresh_metrics = WindowedMetrics(3)
+        fresh = ElevatorSimulation(copy.deepcopy(simulation.elevator_system), metrics=fresh_metrics)
+
+        calls = generate_calls(0, 900, 15, random.Random(7))
+        for run in [simulation, fresh]:
+            run.simulate_calls(calls, verbose=False)
+
+        for name, _ in SERIES:
+            self.assertEqual(metrics.series(name), fresh_metrics.series(name))
+        for name, _ in ELEVATOR_SERIES:
+            for index in range(3):
+                self.assertEqual(metrics.elevator_series(name, index), fresh_metrics.elevator_series(name, index))
+
+    def test_elevator_series_match_actions(self):
+        for event_driven in [False, True]:
+            simulation, metrics = self.simulate(event_driven)
+
+            for index in range(3):
+                moves = [0] * len(metrics.window_numbers())
+                door_stops = [0] * len(metrics.window_numbers())
+                for action in simulation.actions:
+                    if action.elevator_number != index:
+                        continue
+                    if action.action in (Action.MOVE_UP, Action.MOVE_DOWN):
+                        moves[action.time // 60] += 1
+                    elif action.action in (Action.OPEN_DOORS, Action.OPEN_DOORS_LOBBY):
+                        door_stops[action.time // 60] += 1
+
+                self.assertEqual([value for _, value in metrics.elevator_series("moves", index)], moves)
+                self.assertEqual([value for _, value in metrics.elevator_series("door_stops", index)], door_stops)
+
+    def test_event_driven_matches_stepping(self):
+        _, stepped = self.simulate(False, window=45)
+        _, event_driven = self.simulate(True, window=45)
+
+        self.assertEqual(stepped.series_arrays, event_driven.series_arrays)
+        self.assertEqual(stepped.elevator_arrays, event_driven.elevator_arrays)
+
+    def test_vectorised_matches_stepping(self):
+        _, stepped = self.simulate(False, window=45)
+        for event_driven in [False, True]:
+            _, vectorised = self.simulate(event_driven, window=45, simulation_type=VectorisedSimulation)
+
+            self.assertEqual(stepped.series_arrays, vectorised.series_arrays)
+            self.assertEqual(stepped.elevator_arrays, vectorised.elevator_arrays)
+            self.assertTrue(sum(vectorised.elevator_arrays["moves"]) > 0)
+
+    def test_queryable_during_run(self):
+        system = ElevatorSystem([Elevator()], RoundRobinAppend(), 10)
+        metrics = WindowedMetrics(1, window=10)
+        simulation = ElevatorSimulation(system, metrics=metrics)
+
+        simulation.add_call(ElevatorCall(time=0, call_floor=2, destination_floor=6, people=2))
+        simulation.advance_to(8)
+
+        self.assertEqual(metrics.series("calls"), [(0, 1)])
+        self.assertEqual(metrics.elevator_series("moves", 0), [(0, 3)])
+        # both people got on at time 2 and are still inside
+        self.assertEqual(metrics.series("person_seconds", now=simulation.time), [(0, 12)])
+
+        simulation.advance_to(25)
+
+        self.assertEqual(metrics.series("calls", now=simulation.time), [(0, 1), (10, 0), (20, 0)])
+        self.assertEqual(metrics.series("people_served"), [(0, 0), (10, 2), (20, 0)])
+        self.assertEqual(metrics.series("person_seconds"), [(0, 16), (10, 2), (20, 0)])
+        self.assertEqual(metrics.elevator_series("moves", 0), [(0, 5), (10, 1), (20, 0)])
+        self.assertEqual(metrics.elevator_series("door_stops", 0), [(0, 1), (10, 1), (20, 0)])
+
+    def test_export(self):
+        _, metrics = self.simulate(True)
+        with tempfile.TemporaryDirectory() as directory:
+            metrics.export(os.path.join(directory, "metrics.bin"), format="binary")
+            metrics.export(os.path.join(directory, "metrics.csv"))
+            metrics.export_elevators(os.path.join(directory, "elevators.bin"), format="binary")
+
+            table = read_table(os.path.join(directory, "metrics.bin"))
+            with open(os.path.join(directory, "metrics.csv")) as file:
+                lines = file.read().splitlines()
+            elevators = read_table(os.path.join(directory, "elevators.bin"))
+
+        self.assertEqual(list(table["window_start"]), [start for start, _ in metrics.series("calls")])
+        self.assertEqual(list(table["calls"]), [value for _, value in metrics.series("calls")])
+        self.assertEqual(list(table["mean_wait"]), [value for _, value in metrics.series("mean_wait")])
+        self.assertEqual(lines[0], "window_start,calls,people_served,people_turned_away,mean_wait,max_wait,"
+                                   "mean_occupancy")
+        self.assertEqual(len(lines), len(metrics.window_numbers()) + 1)
+        self.assertEqual(list(elevators["moves"][1::3]), [value for _, value in metrics.elevator_series("moves", 1)])
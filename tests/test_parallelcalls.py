@@ -0,0 +1,41 @@
+import random
+import unittest
+
+from elevatorcall import stream_calls
+from parallelcalls import chunk_seed, chunk_times, generate_chunked_calls, stream_chunked_calls
+
+
+class TestParallelCalls(unittest.TestCase):
+
+    def test_same_calls_for_any_process_count(self):
+        serial = generate_chunked_calls(0, 2000, 20, seed=5, chunk_duration=300, processes=1)
+        parallel = generate_chunked_calls(0, 2000, 20, seed=5, chunk_duration=300, processes=2)
+
+        self.assertEqual(serial, parallel)
+        self.assertTrue(len(serial) > 0)
+        self.assertEqual([call.time for call in serial], sorted(call.time for call in serial))
+        self.assertTrue(all(0 <= call.time < 2000 for call in serial))
+
+    def test_chunks_use_their_own_streams(self):
+        calls = generate_chunked_calls(100, 700, 20, seed=5, chunk_duration=250, processes=1)
+
+        expected = []
+        for index, (start, end) in enumerate([(100, 350), (350, 600), (600, 700)]):
+            expected.extend(stream_calls(start, end, 20, random.Random(chunk_seed(5, index))))
+        self.assertEqual(calls, expected)
+
+    def test_different_seeds(self):
+        self.assertNotEqual(generate_chunked_calls(0, 1000, 20, seed=1, processes=1),
+                            generate_chunked_calls(0, 1000, 20, seed=2, processes=1))
+        self.assertNotEqual(chunk_seed(1, 0), chunk_seed(1, 1))
+        self.assertEqual(chunk_seed(1, 3), chunk_seed(1, 3))
+
+    def test_chunk_times(self):
+        self.assertEqual(list(chunk_times(0, 10, 4)), [(0, 4), (4, 8), (8, 10)])
+        self.assertEqual(list(chunk_times(5, 5, 4)), [])
+        self.assertRaises(ValueError, chunk_times, 0, 10, 0)
+
+    def test_stream_is_lazy(self):
+        calls = stream_chunked_calls(0, 10 ** 9, 20, seed=1, chunk_duration=100, processes=1)
+
+        self.assertLess(next(calls).time, 100)
@@ -0,0 +1,22 @@
+import unittest
+
+from person import PassengerGroup
+
+
+class TestPassengerGroup(unittest.TestCase):
+
+    def test_split(self):
+        group = PassengerGroup(call_time=3, target_floor=7, assigned_elevator=1, count=5)
+
+        result = group.split(2)
+
+        self.assertEqual(result.count, 2)
+        self.assertEqual(group.count, 3)
+        self.assertEqual(result.call_time, 3)
+        self.assertEqual(result.target_floor, 7)
+        self.assertEqual(result.assigned_elevator, 1)
+
+    def test_split_too_many(self):
+        group = PassengerGroup(call_time=3, target_floor=7, assigned_elevator=1, count=5)
+
+        self.assertRaises(ValueError, group.split, 6)
@@ -0,0 +1,85 @@
+import contextlib
+import io
+import os
+import random
+import tempfile
+import unittest
+
+from elevator import Elevator
+from elevatorbehaviour import RoundRobinAppend
+from elevatorcall import ElevatorCall, generate_calls
+from elevatorsimulation import ElevatorSimulation
+from elevatorsystem import ElevatorSystem
+from profiling import Profiler, profile
+
+
+def build_simulation():
+    return ElevatorSimulation(ElevatorSystem([Elevator(), Elevator()], RoundRobinAppend(), 10))
+
+
+# a clock that moves forward one nanosecond every time it is read
+class CountingClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        self.now += 1
+        return self.now
+
+
+class TestProfiling(unittest.TestCase):
+
+    def test_same_results_and_methods_restored(self):
+        calls = generate_calls(0, 300, 10, rng=random.Random(1))
+        expected = build_simulation()
+        simulation = build_simulation()
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            expected.simulate_calls(calls)
+            with profile(simulation) as profiler:
+                simulation.simulate_calls(calls)
+
+        self.assertEqual(simulation.statistics(), expected.statistics())
+        self.assertEqual(list(simulation.actions), list(expected.actions))
+        self.assertNotIn("iterate", vars(simulation))
+        self.assertNotIn("ingest_call", vars(simulation.elevator_system))
+        self.assertNotIn("iterate", vars(simulation.elevator_system.elevators[0]))
+        self.assertEqual(profiler.counts["simulate_calls"], 1)
+        self.assertEqual(profiler.counts["iterate"], simulation.time)
+        self.assertEqual(profiler.counts["elevator_step"], 2 * simulation.time)
+        self.assertEqual(profiler.calls_per_behaviour, {"RoundRobinAppend": len(calls)})
+        self.assertEqual(profiler.people_processed, 2 * simulation.people_served)
+
+    def test_people_per_door_opening(self):
+        simulation = build_simulation()
+        profiler = Profiler().attach(simulation)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            simulation.simulate_calls([ElevatorCall(0, 2, 5, 3)])
+        profiler.detach()
+
+        # doors open at floor 2 for three people to get on, then at floor 5 for them to get off
+        self.assertEqual(profiler.door_openings, 2)
+        self.assertEqual(profiler.people_processed, 6)
+        self.assertEqual(profiler.people_per_door_opening.mean(), 3)
+
+    def test_folded_stacks(self):
+        simulation = build_simulation()
+
+        with profile(simulation, clock=CountingClock()) as profiler:
+            simulation.iterate()
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "profile.folded")
+            profiler.write_folded(path)
+            with open(path) as file:
+                lines = file.read().splitlines()
+
+        self.assertEqual([line.split()[0] for line in lines], ["iterate", "iterate;elevator_step"])
+        self.assertIn("iterate", profiler.summary())
+
+    def test_attach_twice(self):
+        profiler = Profiler().attach(build_simulation())
+
+        with self.assertRaises(ValueError):
+            profiler.attach(build_simulation())
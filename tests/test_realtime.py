@@ -0,0 +1,147 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+from elevator import Action, Elevator
+from elevatorbehaviour import RoundRobinAppend
+from elevatorsimulation import ElevatorSimulation
+from elevatorsystem import ElevatorSystem
+from realtime import RealTimeSimulation
+
+
+def build_simulation():
+    return ElevatorSimulation(ElevatorSystem([Elevator(), Elevator()], RoundRobinAppend(), 10))
+
+
+class TestRealTime(unittest.TestCase):
+
+    def test_calls_dispatched_and_actions_published(self):
+        async def scenario():
+            realtime = RealTimeSimulation(build_simulation(), speed=2000)
+            actions = realtime.subscribe()
+            runner = asyncio.ensure_future(realtime.run(until=40))
+            elevator = await realtime.submit(0, 3, people=2)
+            await runner
+            return realtime, elevator, actions
+
+        realtime, elevator, actions = asyncio.run(scenario())
+
+        self.assertEqual(elevator, 1)
+        self.assertEqual(realtime.simulation.time, 40)
+        self.assertEqual(realtime.simulation.people_served, 2)
+        published = [actions.get_nowait() for _ in range(actions.qsize())]
+        self.assertEqual(published, list(realtime.simulation.actions))
+        self.assertIn(Action.OPEN_DOORS, [action.action for action in published])
+
+    def test_invalid_call(self):
+        async def scenario():
+            realtime = RealTimeSimulation(build_simulation(), speed=2000)
+            runner = asyncio.ensure_future(realtime.run(until=5))
+            try:
+                await realtime.submit(0, 30)
+            finally:
+                await runner
+
+        with self.assertRaises(ValueError):
+            asyncio.run(scenario())
+
+    def test_failed_dispatch_resolves_futures(self):
+        async def scenario():
+            simulation = ElevatorSimulation(ElevatorSystem([], RoundRobinAppend(), 10))
+            realtime = RealTimeSimulation(simulation, speed=2000)
+            runner = asyncio.ensure_future(realtime.run(until=5))
+            # a call on its own, then two in the same time step
+            first = await asyncio.wait_for(asyncio.gather(realtime.submit(0, 3), return_exceptions=True), 5)
+            second = await asyncio.wait_for(
+                asyncio.gather(realtime.submit(1, 4), realtime.submit(2, 5), return_exceptions=True), 5)
+            await runner
+            return realtime, first + second
+
+        realtime, results = asyncio.run(scenario())
+
+        self.assertEqual(len(results), 3)
+        for result in results:
+            self.assertIsInstance(result, ZeroDivisionError)
+        self.assertEqual(realtime.simulation.time, 5)
+        self.assertEqual(realtime.simulation.total_people, 0)
+
+    def test_slow_subscriber_drops_oldest(self):
+        async def scenario():
+            realtime = RealTimeSimulation(build_simulation(), speed=5000)
+            actions = realtime.subscribe(max_size=3)
+            runner = asyncio.ensure_future(realtime.run(until=60))
+            await realtime.submit(0, 9)
+            await runner
+            return realtime, actions
+
+        realtime, actions = asyncio.run(scenario())
+
+        self.assertEqual(actions.qsize(), 3)
+        self.assertEqual(realtime.dropped(actions), len(realtime.simulation.actions) - 3)
+        self.assertEqual(actions.get_nowait(), realtime.simulation.actions[-3])
+
+    def test_burst_of_calls(self):
+        async def scenario():
+            realtime = RealTimeSimulation(build_simulation(), speed=1000, max_calls_per_step=10)
+            runner = asyncio.ensure_future(realtime.run(until=20))
+            futures = [realtime.submit(i % 10, (i + 1) % 10) for i in range(100)]
+            assigned = await asyncio.gather(*futures)
+            await runner
+            return realtime, assigned
+
+        realtime, assigned = asyncio.run(scenario())
+
+        self.assertEqual(len(assigned), 100)
+        self.assertEqual(len(realtime.simulation.calls), 100)
+        self.assertEqual(realtime.simulation.total_people, 100)
+
+    def test_same_step_calls_dispatched_as_batch(self):
+        batches = []
+
+        class RecordingBehaviour(RoundRobinAppend):
+            def ingest_calls(self, elevators, calls):
+                batches.append(calls)
+                return super().ingest_calls(elevators, calls)
+
+        async def scenario():
+            simulation = ElevatorSimulation(ElevatorSystem([Elevator(), Elevator()], RecordingBehaviour(), 10))
+            realtime = RealTimeSimulation(simulation)
+            futures = [realtime.submit(0, 3), realtime.submit(2, 30), realtime.submit(5, 1)]
+            dispatched = realtime.dispatch_pending()
+            results = await asyncio.gather(*futures, return_exceptions=True)
+            return dispatched, results
+
+        dispatched, results = asyncio.run(scenario())
+
+        self.assertEqual(dispatched, 3)
+        self.assertEqual(batches, [[(0, 3), (5, 1)]])
+        self.assertEqual(results[0], 1)
+        self.assertIsInstance(results[1], ValueError)
+        self.assertEqual(results[2], 0)
+
+    def test_unix_socket(self):
+        async def scenario(path):
+            realtime = RealTimeSimulation(build_simulation(), speed=1000)
+            server = await realtime.serve_unix(path)
+            runner = asyncio.ensure_future(realtime.run(until=30))
+            reader, writer = await asyncio.open_unix_connection(path)
+            writer.write(b'{"subscribe": true}\n{"call_floor": 0, "destination_floor": 2}\n{"call_floor": 99}\n')
+            lines = []
+            while len([line for line in lines if "action" not in line]) < 2 or len(lines) < 3:
+                lines.append(json.loads(await asyncio.wait_for(reader.readline(), 5)))
+            writer.close()
+            await runner
+            server.close()
+            await server.wait_closed()
+            return lines
+
+        with tempfile.TemporaryDirectory() as directory:
+            lines = asyncio.run(scenario(os.path.join(directory, "calls.sock")))
+
+        replies = [line for line in lines if "action" not in line]
+        self.assertEqual(replies[0]["elevator"], 1)
+        self.assertIn("error", replies[1])
+        self.assertIn(("OPEN_DOORS_LOBBY", 1, 0), [(line.get("action"), line.get("elevator"), line.get("floor"))
+                                                   for line in lines])
@@ -0,0 +1,59 @@
+import random
+import unittest
+
+from elevatorbehaviour import LeastBusyAppend
+from elevatorcall import ElevatorCall, generate_calls
+from sharding import Bank, run_bank, run_site, split_calls
+
+BANKS = [
+    Bank("low", range(0, 11), elevators=2),
+    Bank("high", [0] + list(range(11, 21)), elevators=3, behaviour=LeastBusyAppend)
+]
+
+
+class TestSharding(unittest.TestCase):
+
+    def test_split_calls(self):
+        calls = [ElevatorCall(0, 0, 5, 1), ElevatorCall(1, 15, 0, 1), ElevatorCall(2, 12, 18, 1),
+                 ElevatorCall(3, 0, 0, 1)]
+
+        result = split_calls(calls, BANKS)
+
+        self.assertEqual([[call.time for call in bank_calls] for bank_calls in result], [[0, 3], [1, 2]])
+
+    def test_split_calls_no_bank(self):
+        with self.assertRaises(ValueError):
+            split_calls([ElevatorCall(0, 5, 15, 1)], BANKS)
+
+    def test_run_site_same_as_each_bank(self):
+        rng = random.Random(4)
+        calls = [call for call in generate_calls(0, 1500, 21, rng=rng)
+                 if call.call_floor == 0 or call.destination_floor == 0 or
+                 (call.call_floor <= 10) == (call.destination_floor <= 10)]
+        banks = BANKS
+
+        serial = run_site(banks, calls, processes=1)
+        parallel = run_site(banks, calls, processes=2)
+        alone = [run_bank(bank, bank_calls) for bank, bank_calls in zip(banks, split_calls(calls, banks))]
+
+        self.assertEqual(parallel.statistics, serial.statistics)
+        self.assertEqual(parallel.actions, serial.actions)
+        self.assertEqual(serial.bank_statistics["low"], alone[0][0])
+        self.assertEqual(serial.bank_statistics["high"], alone[1][0])
+        self.assertEqual(serial.statistics["total_people"], alone[0][0]["total_people"] + alone[1][0]["total_people"])
+        self.assertEqual(len(serial.actions), len(alone[0][1]) + len(alone[1][1]))
+        times = list(serial.actions.times)
+        self.assertEqual(times, sorted(times))
+        # the elevators of the second bank follow on from the first
+        self.assertEqual(set(serial.actions.elevator_numbers), {0, 1, 2, 3, 4})
+
+    def test_bank_names_must_differ(self):
+        with self.assertRaises(ValueError):
+            run_site([Bank("a", range(5), 1), Bank("a", range(5), 1)], [], processes=1)
+
+    def test_no_banks(self):
+        result = run_site([], [])
+
+        self.assertEqual(result.bank_statistics, {})
+        self.assertEqual(len(result.actions), 0)
+        self.assertEqual(result.statistics["total_people"], 0)
@@ -0,0 +1,45 @@
+import unittest
+
+from elevatorbehaviour import LeastBusyAppend, RoundRobinAppend
+from sweep import build_grid, format_table, pooled_percentiles, run_sweep
+
+
+class TestSweep(unittest.TestCase):
+
+    def test_build_grid(self):
+        result = build_grid([RoundRobinAppend, LeastBusyAppend], [1, 2, 3], [5], [10, 20], [1, 2], duration=100)
+
+        self.assertEqual(len(result), 24)
+        self.assertEqual(result[0].behaviour, RoundRobinAppend)
+        self.assertEqual(result[-1].behaviour, LeastBusyAppend)
+        self.assertEqual(result[-1].seed, 2)
+
+    def test_run_sweep_same_result_in_parallel(self):
+        arguments = ([RoundRobinAppend, LeastBusyAppend], [2], [5], [10], [1, 2], 300)
+
+        serial = run_sweep(*arguments, processes=1)
+        parallel = run_sweep(*arguments, processes=2)
+
+        self.assertEqual(len(serial), 4)
+        for serial_row, parallel_row in zip(serial, parallel):
+            del serial_row["wall_time"]
+            del parallel_row["wall_time"]
+            self.assertEqual(serial_row, parallel_row)
+        self.assertTrue(serial[0]["total_people"] > 0)
+        # the same seed generates the same calls for each behaviour
+        self.assertEqual(serial[0]["total_people"], serial[2]["total_people"])
+
+    def test_format_table(self):
+        rows = [{"behaviour": "RoundRobinAppend", "people_served": 3, "average_time_waiting": 1.234}]
+
+        result = format_table(rows, columns=("behaviour", "people_served", "average_time_waiting"))
+
+        self.assertEqual(result.splitlines()[1].split(), ["RoundRobinAppend", "3", "1.23"])
+
+    def test_pooled_percentiles(self):
+        rows = run_sweep([RoundRobinAppend], [2], [5], [10], [1, 2], 300, processes=1)
+
+        result = pooled_percentiles(rows, percentiles=(100,))
+
+        self.assertEqual(list(result), ["RoundRobinAppend"])
+        self.assertEqual(result["RoundRobinAppend"][100], max(row["waiting_times"].histogram.maximum for row in rows))
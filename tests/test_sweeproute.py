@@ -0,0 +1,220 @@
+import random
+import unittest
+
+from destinationqueue import DestinationQueue
+from elevator import Elevator
+from elevatorbehaviour import StandardElevator
+from sweeproute import COMPACT_AFTER, SweepRoute, UP, DOWN, bisect_left_descending
+
+
+# The way StandardElevator inserted a floor before it went through a SweepRoute, walking the whole list from the front
+# Kept as the reference SweepRoute is checked against, here and in test_elevatorbehaviour.py, where the first floor of
+# the list is the current floor
+# Assumes destinations are ordered asc->desc->asc (or equivalent)
+def insert_floor_considering_direction(destinations, floor_to_insert, call_direction, after=0):
+    previous_direction = None
+    current_direction = None
+
+    for index in range(1, len(destinations)):
+        if destinations[index - 1] < destinations[index]:
+            current_direction = UP
+        if destinations[index - 1] > destinations[index]:
+            current_direction = DOWN
+
+        # don't want to insert anything until given point, but still need to track direction changes
+        if index <= after:
+            previous_direction = current_direction
+            continue
+
+        # if we are moving in the desired direction
+        if current_direction == call_direction or call_direction is None:
+            # already visiting this floor in this direction, do nothing
+            if destinations[index] == floor_to_insert:
+                return index
+
+            # can insert at current point
+            if (
+                    current_direction == UP and destinations[index] > floor_to_insert > destinations[index-1]
+            ) or (
+                    current_direction == DOWN and destinations[index] < floor_to_insert < destinations[index-1]
+            ):
+                destinations.insert(index, floor_to_insert)
+                return index
+
+        # at the top
+        if current_direction == DOWN and previous_direction == UP:
+            # need to add another value above the top
+            if floor_to_insert > destinations[index-1]:
+                destinations.insert(index, floor_to_insert)
+                return index
+            # duplicate value at the top
+            if floor_to_insert == destinations[index-1]:
+                return index - 1
+
+        # at the bottom
+        if current_direction == UP and previous_direction == DOWN:
+            # need to add another value below the bottom
+            if floor_to_insert < destinations[index-1]:
+                destinations.insert(index, floor_to_insert)
+                return index
+            # duplicate value at the bottom
+            if floor_to_insert == destinations[index-1]:
+                return index - 1
+
+        previous_direction = current_direction
+
+    # no suitable place in the middle of the list, we can just insert at the end
+    if len(destinations) == 0 or len(destinations) == 1 or destinations[len(destinations)-1] != floor_to_insert:
+        destinations.append(floor_to_insert)
+    return len(destinations)-1
+
+
+class TestSweepRoute(unittest.TestCase):
+
+    # the cases from test_elevatorbehaviour.py, where the first floor of each list is the current floor
+    def check_insert(self, floors, floor, direction, after, expected_result, expected_floors):
+        destinations = DestinationQueue(floors[1:])
+        route = SweepRoute(destinations)
+        result = route.insert(floors[0], floor, direction, after)
+
+        self.assertEqual(result, expected_result)
+        self.assertEqual(destinations, expected_floors[1:])
+        self.assertEqual(list(route), expected_floors[1:])
+
+    def test_insert_empty(self):
+        destinations = DestinationQueue()
+        result = SweepRoute(destinations).insert(0, 2, UP)
+
+        self.assertEqual(result, 1)
+        self.assertEqual(destinations, [2])
+
+    def test_insert_going_up(self):
+        self.check_insert([2, 4, 6, 8, 6, 4, 2], 3, UP, 0, 1, [2, 3, 4, 6, 8, 6, 4, 2])
+
+    def test_insert_going_up_2(self):
+        self.check_insert([8, 6, 4, 2, 4, 6, 8], 3, UP, 0, 4, [8, 6, 4, 2, 3, 4, 6, 8])
+
+    def test_insert_going_down(self):
+        self.check_insert([2, 4, 6, 8, 6, 4, 2], 5, DOWN, 0, 5, [2, 4, 6, 8, 6, 5, 4, 2])
+
+    def test_insert_going_down_2(self):
+        self.check_insert([8, 6, 4, 2, 4, 6, 8], 5, DOWN, 0, 2, [8, 6, 5, 4, 2, 4, 6, 8])
+
+    def test_insert_one_already_exists(self):
+        self.check_insert([2, 4, 6, 8, 6, 4, 2], 6, DOWN, 0, 4, [2, 4, 6, 8, 6, 4, 2])
+
+    def test_insert_no_suitable_place(self):
+        self.check_insert([2, 4, 6, 8], 5, DOWN, 0, 4, [2, 4, 6, 8, 5])
+
+    def test_insert_bottom(self):
+        self.check_insert([8, 6, 4, 2, 4], 0, DOWN, 0, 4, [8, 6, 4, 2, 0, 4])
+
+    def test_insert_after_start(self):
+        self.check_insert([4], 0, UP, 0, 1, [4, 0])
+
+    def test_insert_after_given_index(self):
+        self.check_insert([2, 4, 6, 8], 5, UP, 2, 4, [2, 4, 6, 8, 5])
+
+    def test_insert_after_given_index_with_direction_change(self):
+        self.check_insert([5, 0], 10, UP, 1, 2, [5, 0, 10])
+
+    def test_insert_duplicate_on_bottom(self):
+        self.check_insert([2, 0, 2, 4], 0, UP, 0, 1, [2, 0, 2, 4])
+
+    def test_bisect_left_descending(self):
+        floors = [9, 7, 7, 4, 2]
+
+        self.assertEqual([bisect_left_descending(floors, floor, 0, len(floors)) for floor in [10, 9, 8, 7, 3, 1]],
+                         [0, 0, 1, 1, 4, 5])
+        self.assertEqual(bisect_left_descending(floors, 8, 2, 4), 2)
+
+    def test_sync_drops_visited_floors(self):
+        destinations = DestinationQueue([4, 8, 2])
+        route = SweepRoute(destinations)
+
+        destinations.popleft()
+        route.sync()
+
+        self.assertEqual(list(route), [8, 2])
+        self.assertEqual(list(route.sweeps(4)), [(1, 1, UP, None), (2, 2, DOWN, UP)])
+
+    def test_sync_rebuilds_after_other_changes(self):
+        destinations = DestinationQueue([4, 8, 2])
+        route = SweepRoute(destinations)
+
+        destinations.append(6)
+        route.sync()
+
+        self.assertEqual(list(route), [4, 8, 2, 6])
+
+    def test_same_as_insert_floor_considering_direction(self):
+        rng = random.Random(0)
+
+        for _ in range(500):
+            current_floor = rng.randrange(10)
+            destinations = DestinationQueue(rng.randrange(10) for _ in range(rng.randrange(10)))
+            expected = [current_floor] + list(destinations)
+            route = SweepRoute(destinations)
+
+            for _ in range(10):
+                if len(destinations) > 0 and rng.random() < 0.3:
+                    # the elevator visiting its next destination
+                    current_floor = destinations.popleft()
+                    expected = [current_floor] + expected[2:]
+                    route.sync()
+                    continue
+
+                floor = rng.randrange(10)
+                direction = rng.choice([UP, DOWN, None])
+                after = rng.randrange(len(expected))
+                expected_result = insert_floor_considering_direction(expected, floor, direction, after=after)
+
+                self.assertEqual(route.insert(current_floor, floor, direction, after), expected_result)
+                self.assertEqual([current_floor] + list(destinations), expected)
+
+    def test_same_as_insert_floor_considering_direction_after_compacting(self):
+        rng = random.Random(1)
+        current_floor = 0
+        destinations = DestinationQueue()
+        expected = [current_floor]
+        route = SweepRoute(destinations)
+
+        visited = 0
+        while visited <= 2 * COMPACT_AFTER:
+            if len(destinations) > 0 and rng.random() < 0.5:
+                current_floor = destinations.popleft()
+                expected = [current_floor] + expected[2:]
+                route.sync()
+                visited += 1
+                continue
+
+            floor = rng.randrange(10)
+            direction = rng.choice([UP, DOWN, None])
+            after = rng.randrange(len(expected))
+            expected_result = insert_floor_considering_direction(expected, floor, direction, after=after)
+
+            self.assertEqual(route.insert(current_floor, floor, direction, after), expected_result)
+            self.assertEqual([current_floor] + list(destinations), expected)
+
+    def test_standard_elevator_uses_routes(self):
+        behaviour = StandardElevator()
+        elevators = [Elevator(), Elevator()]
+        calls = [(0, 5), (3, 1), (2, 4), (6, 0), (1, 3), (4, 2)]
+
+        expected = [[], []]
+        for call_floor, destination_floor in calls:
+            index = behaviour.ingest_call(elevators, call_floor, destination_floor)
+
+            direction = None
+            if destination_floor > call_floor:
+                direction = UP
+            elif destination_floor < call_floor:
+                direction = DOWN
+            route = [elevators[index].current_floor] + expected[index]
+            call_insert_point = insert_floor_considering_direction(route, call_floor, direction)
+            insert_floor_considering_direction(route, destination_floor, direction, after=call_insert_point)
+            expected[index] = route[1:]
+
+            self.assertEqual(elevators[index].destinations, expected[index])
+            self.assertIs(behaviour.routes[index].destinations, elevators[index].destinations)
+
@@ -0,0 +1,82 @@
+import random
+import unittest
+from unittest.mock import MagicMock
+
+from elevator import DoorState, Elevator
+from elevatoraction import ElevatorAction
+from elevatorbehaviour import ClosestCallPrepend, LeastBusyAppend, RoundRobinAppend, StandardElevator
+from elevatorcall import ElevatorCall, generate_calls
+from elevatorsimulation import ElevatorSimulation
+from elevatorsystem import ElevatorSystem
+from fleetarrays import ArrayElevator
+from profiling import profile
+from vectorisedsimulation import VectorisedSimulation, fleet_from_elevators
+
+
+class TestVectorisedSimulation(unittest.TestCase):
+
+    def test_simulate_calls_matches_elevator_simulation(self):
+        for behaviour in [RoundRobinAppend, ClosestCallPrepend, LeastBusyAppend, StandardElevator]:
+            for event_driven in [False, True]:
+                calls = generate_calls(0, 1500, 15, random.Random(8))
+                calls.append(ElevatorCall(time=1500, call_floor=4, destination_floor=4, people=1))
+                results = []
+                for simulation_type in [ElevatorSimulation, VectorisedSimulation]:
+                    elevators = [Elevator(capacity=3) for _ in range(4)]
+                    simulation = simulation_type(ElevatorSystem(elevators, behaviour(), 15), event_driven=event_driven)
+                    simulation.simulate_calls(calls)
+                    results.append(simulation)
+
+                self.assertEqual(results[0].actions, results[1].actions)
+                self.assertEqual(results[0].statistics(), results[1].statistics())
+
+    def test_action_logs_without_extend(self):
+        calls = generate_calls(0, 500, 15, random.Random(3))
+        expected = VectorisedSimulation(ElevatorSystem([Elevator(capacity=3) for _ in range(4)], RoundRobinAppend(), 15))
+        expected.simulate_calls(calls, verbose=False)
+
+        # an action log that can only record one action at a time
+        recorded = []
+        actions = MagicMock(spec=["record"])
+        actions.record.side_effect = lambda *action: recorded.append(ElevatorAction(*action))
+        simulation = VectorisedSimulation(ElevatorSystem([Elevator(capacity=3) for _ in range(4)], RoundRobinAppend(),
+                                                         15), actions=actions)
+        simulation.simulate_calls(calls, verbose=False)
+
+        self.assertEqual(expected.actions, recorded)
+
+    def test_profiled_door_openings(self):
+        calls = generate_calls(0, 300, 15, random.Random(5))
+        profilers = []
+        for simulation_type in [ElevatorSimulation, VectorisedSimulation]:
+            simulation = simulation_type(ElevatorSystem([Elevator(capacity=3) for _ in range(4)], RoundRobinAppend(), 15))
+            with profile(simulation) as profiler:
+                simulation.simulate_calls(calls, verbose=False)
+            profilers.append(profiler)
+
+        # the vectorised simulation writes its actions a column at a time, and its door openings still count
+        self.assertGreater(profilers[1].counts["record_actions"], 0)
+        self.assertGreater(profilers[1].door_openings, 0)
+        self.assertEqual(profilers[1].door_openings, profilers[0].door_openings)
+        self.assertEqual(profilers[1].people_processed, profilers[0].people_processed)
+        self.assertEqual(profilers[1].people_per_door_opening.count, profilers[0].people_per_door_opening.count)
+        self.assertEqual(profilers[1].people_per_door_opening.mean(), profilers[0].people_per_door_opening.mean())
+
+    def test_elevators_replaced_with_views(self):
+        elevators = [Elevator(capacity=3, current_floor=2), Elevator(capacity=5)]
+        elevators[1].destinations = [4, 1]
+        elevators[1].door_state = DoorState.OPEN
+        system = ElevatorSystem(elevators, RoundRobinAppend(), 10)
+
+        simulation = VectorisedSimulation(system)
+
+        self.assertTrue(all(isinstance(elevator, ArrayElevator) for elevator in system.elevators))
+        self.assertEqual(simulation.fleet.current_floor.tolist(), [2, 0])
+        self.assertEqual(system.elevators[1].capacity, 5)
+        self.assertEqual(system.elevators[1].destinations, [4, 1])
+        self.assertEqual(system.elevators[1].door_state, DoorState.OPEN)
+
+    def test_fleet_from_elevators_reuses_fleet(self):
+        fleet = fleet_from_elevators([Elevator(), Elevator()])
+
+        self.assertIs(fleet_from_elevators(list(fleet.elevators)), fleet)
@@ -0,0 +1,77 @@
+import numpy as np
+
+from actionlog import ACTIONS_BY_CODE
+from elevatoraction import Action
+from elevatorsimulation import ElevatorSimulation
+from fleetarrays import ArrayElevator, FleetArrays, NO_ACTION
+
+
+# An ElevatorSimulation that moves every elevator forward each time step in one go using NumPy arrays, for systems
+# with a very large number of elevators. Only the elevators that open their doors, or that have new people waiting
+# behind open doors, are handled one at a time. Gives the same actions and statistics as ElevatorSimulation.
+#
+# The elevators of the elevator system are replaced with ArrayElevator views of the same state, which behaviours
+# can use in exactly the same way as before.
+class VectorisedSimulation(ElevatorSimulation):
+    def __init__(self, elevator_system, **kwargs):
+        self.fleet = fleet_from_elevators(elevator_system.elevators)
+        elevator_system.elevators = list(self.fleet.elevators)
+        # elevators that had people added at their floor, or left inside at their floor, since they last opened
+        self.people_to_exchange = np.zeros(self.fleet.shape, dtype=bool)
+        super().__init__(elevator_system, **kwargs)
+
+    def add_people(self, call, assigned_elevator):
+        super().add_people(call, assigned_elevator)
+        self.people_to_exchange[assigned_elevator] = True
+
+    def iterate(self):
+        actions = self.fleet.step()
+
+        acting = np.nonzero(actions > Action.BLOCKED.value)[0]
+        if len(acting) > 0:
+            self.record_actions(acting, actions[acting])
+
+        exchanging = self.fleet.door_open & ((actions >= Action.OPEN_DOORS.value) | self.people_to_exchange)
+        self.people_to_exchange[:] = False
+        for index in np.nonzero(exchanging)[0]:
+            elevator = self.fleet.elevators[index]
+            self.exchange_people(int(index), elevator)
+            # anyone who got on at the floor they are going to gets off on the next time step
+            if elevator.current_floor in self.people_in_elevators[index]:
+                self.people_to_exchange[index] = True
+
+        self.time += 1
+        return bool((actions == NO_ACTION).all())
+
+    # records the actions of the given elevators this time step, a whole column at a time for action logs that can
+    # extend their columns (see ActionLog.extend), otherwise one action at a time, and counts them in the metrics
+    def record_actions(self, indices, action_codes):
+        indices = indices.tolist()
+        action_codes = action_codes.tolist()
+        floors = self.fleet.current_floor[indices].tolist()
+        if hasattr(self.actions, "extend"):
+            self.actions.extend([self.time] * len(indices), indices, action_codes, floors)
+        else:
+            for index, action_code, floor in zip(indices, action_codes, floors):
+                self.actions.record(self.time, index, ACTIONS_BY_CODE[action_code], floor)
+        if self.metrics is not None:
+            self.metrics.step_actions(self.time, indices, action_codes)
+
+
+# creates a one dimensional FleetArrays with the same state as the given elevators
+# elevators that are already views of a one dimensional FleetArrays keep using it
+def fleet_from_elevators(elevators):
+    if len(elevators) > 0 and all(isinstance(elevator, ArrayElevator) for elevator in elevators):
+        fleet = elevators[0].fleet
+        if len(fleet.shape) == 1 and list(fleet.elevators) == list(elevators):
+            return fleet
+
+    fleet = FleetArrays((len(elevators),))
+    for index, elevator in enumerate(elevators):
+        view = fleet.elevators[index]
+        view.capacity = elevator.capacity
+        view.current_floor = elevator.current_floor
+        view.blocked_for = elevator.blocked_for
+        view.door_state = elevator.door_state
+        view.destinations = list(elevator.destinations)
+    return fleet